@@ -1,23 +1,58 @@
 from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
+from flask_migrate import Migrate, upgrade
+from sqlalchemy import insert, update
+from sqlalchemy.orm import defer
 from flask_sqlalchemy import SQLAlchemy
+from werkzeug.exceptions import HTTPException
+from urllib.parse import unquote
 import os
-from datetime import datetime, timezone
-from werkzeug.utils import secure_filename
-from models import db, User, StudentProfile, CompanyProfile, Internship, Application
-from auth import token_required, role_required, create_token
+import mimetypes
 import uuid
+from datetime import datetime, timezone
+from models import db, User, StudentProfile, CompanyProfile, Internship, Application, ExportJob
+from auth import token_required, role_required, create_token, create_download_token, download_token_required
+from queries import (
+    internships_with_company, applications_with_internship, applications_with_student,
+    application_counts, admin_user_rows, admin_application_rows, internship_feed_version,
+    internship_version, my_applications_version, can_read_upload, recommended_internships
+)
+from pagination import paginate, list_response, requested_fields
+from streaming import stream_format, stream_response
+from cache import cache
+from profiling import profiler
+from etags import conditional
+from blobstore import store_resume, acquire, release, is_blob_name, blob_directory
+from jobs import enqueue
+from passwords import PasswordHashBusy, needs_rehash, hash_password
+from validation import validate_internship, read_bulk_items, is_row_id
+import search
+import engine_profiles
+import replicas
 
 app = Flask(__name__)
 app.config.from_object('config.Config')
-CORS(app)
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_profiles.engine_options(app.config)
+app.config['SQLALCHEMY_BINDS'] = replicas.binds(app.config)
+CORS(app, expose_headers=['X-Next-Cursor', 'ETag'])
 
 db.init_app(app)
+engine_profiles.init_app(app, db)
+replicas.init_app(app)
+migrate = Migrate(app, db, include_name=search.include_in_migrations)
+cache.init_app(app)
+profiler.init_app(app)
 
 UPLOAD_FOLDER = 'uploads'
 if not os.path.exists(UPLOAD_FOLDER):
     os.makedirs(UPLOAD_FOLDER)
 
+@app.errorhandler(PasswordHashBusy)
+def password_hash_busy(e):
+    response = jsonify({'error': 'Server busy, please retry'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
 @app.route('/register', methods=['POST'])
 def register():
     data = request.json
@@ -60,6 +95,7 @@ def register():
             db.session.add(company_profile)
         
         db.session.commit()
+        cache.invalidate('users')
         
         token = create_token(user.id, user.email, user.role)
         return jsonify({
@@ -91,6 +127,14 @@ def login():
     if not user or not user.check_password(password):
         return jsonify({'error': 'Invalid credentials'}), 401
     
+    if needs_rehash(user.password_hash):
+        try:
+            user.password_hash = hash_password(password)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            app.logger.warning(f"Could not rehash password for user {user.id}: {e}")
+    
     token = create_token(user.id, user.email, user.role)
     
     user_data = {
@@ -132,7 +176,8 @@ def get_profile():
             'university': student.university,
             'major': student.major,
             'year_of_study': student.year_of_study,
-            'phone': student.phone
+            'phone': student.phone,
+            'resume_path': student.resume_path
         })
     elif user.role == 'company' and user.company_profile:
         company = user.company_profile
@@ -171,7 +216,11 @@ def update_profile():
         company.location = data.get('location', company.location)
     
     try:
+        if user.role == 'company' and user.company_profile:
+            db.session.flush()
+            search.index_company(user.company_profile.id)
         db.session.commit()
+        cache.invalidate('internships', 'users', 'applications')
         return jsonify({'message': 'Profile updated successfully'})
     except Exception as e:
         db.session.rollback()
@@ -188,48 +237,19 @@ def create_internship():
     if not user or not user.company_profile:
         return jsonify({'error': 'Company profile not found'}), 404
     
-    required_fields = ['title', 'description', 'last_date']
-    for field in required_fields:
-        if not data.get(field):
-            return jsonify({'error': f'{field} is required'}), 400
-    
     try:
-        last_date_str = data['last_date']
-       
-        if isinstance(last_date_str, str):
-            if 'T' in last_date_str:
-                if 'Z' in last_date_str:
-                    last_date_str = last_date_str.replace('Z', '+00:00')
-                last_date = datetime.fromisoformat(last_date_str)
-            else:
-                last_date = datetime.strptime(last_date_str, '%Y-%m-%d')
-                last_date = last_date.replace(hour=23, minute=59, second=59)
-        else:
-            return jsonify({'error': 'Invalid date format. Expected YYYY-MM-DD or ISO format'}), 400
-
-        if last_date < datetime.utcnow():
-            return jsonify({'error': 'Last date must be in the future'}), 400
-            
+        values = validate_internship(data)
     except ValueError as e:
-        print(f"Date parsing error: {str(e)}")
-        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD format'}), 400
-    except Exception as e:
-        print(f"Unexpected date parsing error: {str(e)}")
-        return jsonify({'error': 'Invalid date format'}), 400
+        return jsonify({'error': str(e)}), 400
     
-    internship = Internship(
-        company_id=user.company_profile.id,
-        title=data['title'],
-        description=data['description'],
-        requirements=data.get('requirements', ''),
-        location=data.get('location', ''),
-        stipend=data.get('stipend'),
-        last_date=last_date
-    )
+    internship = Internship(company_id=user.company_profile.id, **values)
     
     try:
         db.session.add(internship)
+        db.session.flush()
+        search.index_internships([internship.id])
         db.session.commit()
+        cache.invalidate('internships')
         return jsonify({
             'message': 'Internship created successfully',
             'internship': {
@@ -242,27 +262,182 @@ def create_internship():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/internships/bulk', methods=['POST'])
+@token_required
+@role_required('company')
+def bulk_upsert_internships():
+    user_id = request.current_user['user_id']
+    
+    user = db.session.get(User, user_id)
+    if not user or not user.company_profile:
+        return jsonify({'error': 'Company profile not found'}), 404
+    company_id = user.company_profile.id
+    
+    try:
+        items = read_bulk_items(app.config['BULK_MAX_ITEMS'])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if not items:
+        return jsonify({'error': 'No internships given'}), 400
+    
+    # Items with an id update that posting; everything else is created.
+    requested_ids = [
+        item['id'] for item in items
+        if isinstance(item, dict) and is_row_id(item.get('id'))
+    ]
+    owned_ids = {
+        row[0] for row in db.session.query(Internship.id).filter(
+            Internship.id.in_(requested_ids), Internship.company_id == company_id
+        )
+    } if requested_ids else set()
+    
+    now = datetime.utcnow()
+    results = []
+    inserts = []
+    updates = []
+    for index, item in enumerate(items):
+        try:
+            if isinstance(item, dict) and 'id' in item:
+                if not is_row_id(item['id']):
+                    raise ValueError('id must be an integer')
+                if item['id'] not in owned_ids:
+                    raise ValueError('Internship not found')
+                fields = {key: value for key, value in item.items() if key != 'id'}
+                values = validate_internship(fields, now, partial=True)
+                updates.append((index, dict(values, id=item['id'])))
+            else:
+                values = validate_internship(item, now)
+                inserts.append((index, dict(values, company_id=company_id)))
+            results.append({'index': index, 'status': 'valid'})
+        except ValueError as e:
+            results.append({'index': index, 'status': 'error', 'error': str(e)})
+    
+    errors = len(items) - len(inserts) - len(updates)
+    if errors:
+        return jsonify({'created': 0, 'updated': 0, 'errors': errors, 'results': results}), 400
+    
+    batch_size = app.config['BULK_INSERT_BATCH_SIZE']
+    try:
+        # Each batch is one multi-row INSERT, which assigns ids in VALUES
+        # order. Asking SQLAlchemy to sort RETURNING rows instead makes
+        # SQLite fall back to one statement per row.
+        statement = insert(Internship).returning(Internship.id)
+        for start in range(0, len(inserts), batch_size):
+            batch = inserts[start:start + batch_size]
+            ids = sorted(db.session.scalars(statement, [values for _, values in batch]))
+            for (index, _), internship_id in zip(batch, ids):
+                results[index] = {'index': index, 'status': 'created', 'id': internship_id}
+        for start in range(0, len(updates), batch_size):
+            batch = updates[start:start + batch_size]
+            db.session.execute(update(Internship), [values for _, values in batch])
+            for index, values in batch:
+                results[index] = {'index': index, 'status': 'updated', 'id': values['id']}
+        search.index_internships({result['id'] for result in results})
+        db.session.commit()
+        cache.invalidate('internships')
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+    
+    return jsonify({
+        'created': len(inserts),
+        'updated': len(updates),
+        'errors': 0,
+        'results': results
+    }), 201 if inserts else 200
+
+def internship_feed_etag():
+    return internship_feed_version(request.current_user, datetime.utcnow())
+
 @app.route('/api/internships', methods=['GET'])
 @token_required
+@conditional(internship_feed_etag)
+@cache.cached('internships')
 def get_internships():
     user_role = request.current_user['role']
     user_id = request.current_user['user_id']
     
-    query = Internship.query.filter_by(is_active=True)
+    query = internships_with_company().filter(Internship.is_active == True)
     
     if user_role == 'company':
         user = User.query.get(user_id)
         if user and user.company_profile:
-            query = query.filter_by(company_id=user.company_profile.id)
+            query = query.filter(Internship.company_id == user.company_profile.id)
+    
+    fields = requested_fields()
+    with_description = fields is None or 'description' in fields
+    with_requirements = fields is None or 'requirements' in fields
+    if not with_description:
+        query = query.options(defer(Internship.description))
+    if not with_requirements:
+        query = query.options(defer(Internship.requirements))
+    
+    try:
+        internships, next_cursor = paginate(query, Internship.created_at, Internship.id)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    current_time = datetime.utcnow()
+    result = [
+        serialize_feed_internship(internship, current_time, with_description, with_requirements)
+        for internship in internships
+    ]
     
-    internships = query.order_by(Internship.created_at.desc()).all()
+    return list_response(result, next_cursor)
+
+def serialize_feed_internship(internship, current_time, with_description=True, with_requirements=True):
+    company = internship.company
+    is_open = internship.last_date > current_time
+    
+    return {
+        'id': internship.id,
+        'title': internship.title,
+        'description': internship.description if with_description else None,
+        'requirements': internship.requirements if with_requirements else None,
+        'location': internship.location,
+        'stipend': internship.stipend,
+        'last_date': internship.last_date.isoformat(),
+        'created_at': internship.created_at.isoformat(),
+        'company_name': company.company_name if company else 'Unknown',
+        'company_id': internship.company_id,
+        'is_active': is_open,
+        'is_open': is_open
+    }
+
+@app.route('/api/internships/search', methods=['GET'])
+@token_required
+@cache.cached('internships')
+def search_internships():
+    q = request.args.get('q', '').strip()
+    if not q:
+        return jsonify({'error': 'q is required'}), 400
+    
+    location = request.args.get('location', '').strip() or None
+    try:
+        min_stipend = request.args.get('min_stipend', type=float)
+        limit = min(int(request.args.get('limit', app.config['PAGE_SIZE_DEFAULT'])),
+                    app.config['PAGE_SIZE_MAX'])
+        offset = int(request.args.get('offset', 0))
+    except ValueError:
+        return jsonify({'error': 'limit and offset must be integers'}), 400
+    if limit < 1 or offset < 0:
+        return jsonify({'error': 'limit must be positive and offset non-negative'}), 400
+    
+    hits = search.search_internships(q, location, min_stipend, limit, offset)
+    ranks = dict(hits)
+    internships = {
+        internship.id: internship
+        for internship in internships_with_company().filter(Internship.id.in_(ranks))
+    } if hits else {}
     
     result = []
     current_time = datetime.utcnow()
     
-    for internship in internships:
-        company = CompanyProfile.query.get(internship.company_id)
-        
+    for internship_id, rank in hits:
+        internship = internships.get(internship_id)
+        if internship is None:
+            continue
+        company = internship.company
         is_open = internship.last_date > current_time
         
         result.append({
@@ -277,23 +452,34 @@ def get_internships():
             'company_name': company.company_name if company else 'Unknown',
             'company_id': internship.company_id,
             'is_active': is_open,
-            'is_open': is_open    
+            'is_open': is_open,
+            'rank': rank
         })
     
-    return jsonify(result)
+    return list_response(result)
+
+def internship_etag(internship_id):
+    return internship_version(internship_id, datetime.utcnow())
 
 @app.route('/api/internships/<int:internship_id>', methods=['GET'])
 @token_required
+@conditional(internship_etag)
+@cache.cached('internships')
 def get_internship(internship_id):
-    internship = Internship.query.get(internship_id)
+    internship = internships_with_company().filter(
+        Internship.id == internship_id
+    ).first()
     
     if not internship or not internship.is_active:
         return jsonify({'error': 'Internship not found'}), 404
     
-    company = CompanyProfile.query.get(internship.company_id)
-    is_open = internship.last_date > datetime.utcnow()
+    return jsonify(serialize_internship_detail(internship, datetime.utcnow()))
+
+def serialize_internship_detail(internship, current_time):
+    company = internship.company
+    is_open = internship.last_date > current_time
     
-    return jsonify({
+    return {
         'id': internship.id,
         'title': internship.title,
         'description': internship.description,
@@ -304,9 +490,9 @@ def get_internship(internship_id):
         'created_at': internship.created_at.isoformat(),
         'company_name': company.company_name if company else 'Unknown',
         'company_description': company.description if company else '',
-        'is_active': is_open, 
-        'is_open': is_open    
-    })
+        'is_active': is_open,
+        'is_open': is_open
+    }
 
 @app.route('/api/internships/<int:internship_id>', methods=['PUT'])
 @token_required
@@ -326,34 +512,19 @@ def update_internship(internship_id):
     if internship.company_id != user.company_profile.id:
         return jsonify({'error': 'Not authorized'}), 403
     
-    internship.title = data.get('title', internship.title)
-    internship.description = data.get('description', internship.description)
-    internship.requirements = data.get('requirements', internship.requirements)
-    internship.location = data.get('location', internship.location)
-    internship.stipend = data.get('stipend', internship.stipend)
+    try:
+        values = validate_internship(data, partial=True)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    if data.get('last_date'):
-        try:
-            last_date_str = data['last_date']
-            if 'T' in last_date_str:
-                if 'Z' in last_date_str:
-                    last_date_str = last_date_str.replace('Z', '+00:00')
-                last_date = datetime.fromisoformat(last_date_str)
-            else:
-                last_date = datetime.strptime(last_date_str, '%Y-%m-%d')
-                last_date = last_date.replace(hour=23, minute=59, second=59)
-            
-            if last_date < datetime.utcnow():
-                return jsonify({'error': 'Last date must be in the future'}), 400
-                
-            internship.last_date = last_date
-        except ValueError:
-            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD format'}), 400
-        except Exception:
-            return jsonify({'error': 'Invalid date format'}), 400
+    for field, value in values.items():
+        setattr(internship, field, value)
     
     try:
+        db.session.flush()
+        search.index_internships([internship.id])
         db.session.commit()
+        cache.invalidate('internships')
         return jsonify({'message': 'Internship updated successfully'})
     except Exception as e:
         db.session.rollback()
@@ -379,7 +550,10 @@ def delete_internship(internship_id):
     internship.is_active = False
     
     try:
+        db.session.flush()
+        search.index_internships([internship.id])
         db.session.commit()
+        cache.invalidate('internships')
         return jsonify({'message': 'Internship deleted successfully'})
     except Exception as e:
         db.session.rollback()
@@ -419,25 +593,26 @@ def apply_internship(internship_id):
     if existing_application:
         return jsonify({'error': 'Already applied to this internship'}), 400
 
-    if 'resume' not in request.files:
-        return jsonify({'error': 'Resume file is required'}), 400
-
-    file = request.files['resume']
-    if file.filename == '':
-        return jsonify({'error': 'No file selected'}), 400
-
-    allowed_ext = {'pdf', 'doc', 'docx'}
-    ext = file.filename.rsplit('.', 1)[-1].lower()
-    if ext not in allowed_ext:
-        return jsonify({'error': 'Only PDF, DOC, DOCX allowed'}), 400
+    profile_resume = user.student_profile.resume_path
+    use_profile_resume = request.form.get('use_profile_resume') in ('1', 'true')
 
-    filename = secure_filename(file.filename)
-    unique_name = f"{user.student_profile.id}_{internship_id}_{int(datetime.now().timestamp())}_{filename}"
+    if 'resume' in request.files:
+        file = request.files['resume']
+        if file.filename == '':
+            return jsonify({'error': 'No file selected'}), 400
 
-    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-    save_path = os.path.join(UPLOAD_FOLDER, unique_name)
+        allowed_ext = {'pdf', 'doc', 'docx'}
+        ext = file.filename.rsplit('.', 1)[-1].lower()
+        if ext not in allowed_ext:
+            return jsonify({'error': 'Only PDF, DOC, DOCX allowed'}), 400
 
-    file.save(save_path)
+        resume_path, sha256, created = store_resume(file, ext)
+    elif use_profile_resume and profile_resume:
+        resume_path = profile_resume
+        created = False
+        acquire(resume_path)
+    else:
+        return jsonify({'error': 'Resume file is required'}), 400
 
     cover_letter = request.form.get('cover_letter', '')
 
@@ -445,12 +620,17 @@ def apply_internship(internship_id):
         internship_id=internship_id,
         student_id=user.student_profile.id,
         cover_letter=cover_letter,
-        resume_path=save_path
+        resume_path=resume_path
     )
 
     try:
         db.session.add(application)
         db.session.commit()
+        cache.invalidate('internships', 'applications')
+        # A rollback deletes a new blob, so the worker only hears about it
+        # once the row that owns it is committed.
+        if created:
+            enqueue('internport.process_resume', os.path.join(blob_directory(resume_path), resume_path), sha256)
         return jsonify({
             'message': 'Application submitted successfully',
             'application_id': application.id
@@ -460,9 +640,13 @@ def apply_internship(internship_id):
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+def my_applications_etag():
+    return my_applications_version(request.current_user['user_id'], datetime.utcnow())
+
 @app.route('/api/my-applications', methods=['GET'])
 @token_required
 @role_required('student')
+@conditional(my_applications_etag, per_user=True)
 def get_my_applications():
     user_id = request.current_user['user_id']
     
@@ -470,31 +654,75 @@ def get_my_applications():
     if not user or not user.student_profile:
         return jsonify({'error': 'Student profile not found'}), 404
     
-    applications = Application.query.filter_by(
-        student_id=user.student_profile.id
-    ).order_by(Application.applied_at.desc()).all()
+    query = applications_with_internship().filter(Application.student_id == user.student_profile.id)
+    fields = requested_fields()
+    with_cover_letter = fields is None or 'cover_letter' in fields
+    if not with_cover_letter:
+        query = query.options(defer(Application.cover_letter))
+    
+    try:
+        applications, next_cursor = paginate(query, Application.applied_at, Application.id)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     result = []
     current_time = datetime.utcnow()
     
-    for app in applications:
-        internship = Internship.query.get(app.internship_id)
-        company = CompanyProfile.query.get(internship.company_id) if internship else None
+    for application in applications:
+        internship = application.internship
+        company = internship.company if internship else None
+        result.append(serialize_my_application(application, internship, company, current_time, with_cover_letter))
+    
+    return list_response(result, next_cursor)
 
-        is_open = internship.last_date > current_time if internship else False
-        
+def serialize_my_application(application, internship, company, current_time, with_cover_letter=True):
+    is_open = internship.last_date > current_time if internship else False
+    
+    return {
+        'id': application.id,
+        'internship_id': application.internship_id,
+        'internship_title': internship.title if internship else 'Unknown',
+        'company_name': company.company_name if company else 'Unknown',
+        'status': application.status,
+        'applied_at': application.applied_at.isoformat(),
+        'cover_letter': application.cover_letter if with_cover_letter else None,
+        'internship_open': is_open
+    }
+
+@app.route('/api/recommendations', methods=['GET'])
+@token_required
+@role_required('student')
+def get_recommendations():
+    user_id = request.current_user['user_id']
+    
+    user = db.session.get(User, user_id)
+    if not user or not user.student_profile:
+        return jsonify({'error': 'Student profile not found'}), 404
+    
+    try:
+        limit = min(int(request.args.get('limit', 10)), app.config['RECOMMENDATION_TOP_K'])
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    if limit < 1:
+        return jsonify({'error': 'limit must be positive'}), 400
+    
+    result = []
+    for internship, score in recommended_internships(user.student_profile.id, datetime.utcnow(), limit):
+        company = internship.company
         result.append({
-            'id': app.id,
-            'internship_id': app.internship_id,
-            'internship_title': internship.title if internship else 'Unknown',
+            'id': internship.id,
+            'title': internship.title,
+            'requirements': internship.requirements,
+            'location': internship.location,
+            'stipend': internship.stipend,
+            'last_date': internship.last_date.isoformat(),
             'company_name': company.company_name if company else 'Unknown',
-            'status': app.status,
-            'applied_at': app.applied_at.isoformat(),
-            'cover_letter': app.cover_letter,
-            'internship_open': is_open
+            'company_id': internship.company_id,
+            'is_open': True,
+            'score': round(score, 4)
         })
     
-    return jsonify(result)
+    return list_response(result)
 
 @app.route('/api/applications/<int:internship_id>', methods=['GET'])
 @token_required
@@ -513,30 +741,39 @@ def get_internship_applications(internship_id):
     if internship.company_id != user.company_profile.id:
         return jsonify({'error': 'Not authorized'}), 403
     
-    applications = Application.query.filter_by(
-        internship_id=internship_id
-    ).order_by(Application.applied_at.desc()).all()
+    query = applications_with_student().filter(Application.internship_id == internship_id)
+    fields = requested_fields()
+    with_cover_letter = fields is None or 'cover_letter' in fields
+    if not with_cover_letter:
+        query = query.options(defer(Application.cover_letter))
+    
+    try:
+        applications, next_cursor = paginate(query, Application.applied_at, Application.id)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     result = []
     current_time = datetime.utcnow()
     
-    for app in applications:
-        student = StudentProfile.query.get(app.student_id)
+    for application in applications:
+        student = application.student
         
         result.append({
-            'id': app.id,
-            'student_id': app.student_id,
+            'id': application.id,
+            'student_id': application.student_id,
             'student_name': student.full_name if student else 'Unknown',
             'student_university': student.university if student else '',
             'student_major': student.major if student else '',
-            'status': app.status,
-            'applied_at': app.applied_at.isoformat(),
-            'cover_letter': app.cover_letter,
-            'resume_path': app.resume_path,
+            'status': application.status,
+            'applied_at': application.applied_at.isoformat(),
+            'cover_letter': application.cover_letter if with_cover_letter else None,
+            'resume_path': application.resume_path,
             'internship_open': internship.last_date > current_time
         })
     
-    return jsonify(result)
+    return list_response(result, next_cursor)
+
+APPLICATION_STATUSES = ['APPLIED', 'SHORTLISTED', 'REJECTED', 'SELECTED']
 
 @app.route('/api/application/<int:application_id>/status', methods=['PUT'])
 @token_required
@@ -549,8 +786,7 @@ def update_application_status(application_id):
     if not new_status:
         return jsonify({'error': 'Status is required'}), 400
     
-    valid_statuses = ['APPLIED', 'SHORTLISTED', 'REJECTED', 'SELECTED']
-    if new_status not in valid_statuses:
+    if new_status not in APPLICATION_STATUSES:
         return jsonify({'error': 'Invalid status'}), 400
     
     user = User.query.get(user_id)
@@ -569,11 +805,77 @@ def update_application_status(application_id):
     
     try:
         db.session.commit()
+        cache.invalidate('applications')
         return jsonify({'message': 'Application status updated successfully'})
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/applications/status/bulk', methods=['PUT'])
+@token_required
+@role_required('company')
+def bulk_update_application_status():
+    user_id = request.current_user['user_id']
+    data = request.get_json(silent=True) or {}
+    
+    new_status = data.get('status')
+    if not new_status:
+        return jsonify({'error': 'Status is required'}), 400
+    if new_status not in APPLICATION_STATUSES:
+        return jsonify({'error': 'Invalid status'}), 400
+    
+    application_ids = data.get('application_ids')
+    if not isinstance(application_ids, list) or not application_ids or not all(
+        isinstance(application_id, int) and not isinstance(application_id, bool)
+        for application_id in application_ids
+    ):
+        return jsonify({'error': 'application_ids must be a non-empty list of ids'}), 400
+    if len(application_ids) > app.config['BULK_MAX_ITEMS']:
+        return jsonify({'error': f"At most {app.config['BULK_MAX_ITEMS']} applications per request"}), 400
+    application_ids = set(application_ids)
+    
+    user = db.session.get(User, user_id)
+    if not user or not user.company_profile:
+        return jsonify({'error': 'Company profile not found'}), 404
+    
+    # One query finds which of the ids belong to this company's postings.
+    owned = dict(db.session.query(Application.id, Application.status).join(
+        Internship, Application.internship_id == Internship.id
+    ).filter(
+        Application.id.in_(application_ids),
+        Internship.company_id == user.company_profile.id
+    ).all())
+    missing = sorted(application_ids - owned.keys())
+    if missing:
+        return jsonify({
+            'error': 'Applications not found or not authorized',
+            'application_ids': missing
+        }), 403
+    
+    changed = [application_id for application_id, status in owned.items() if status != new_status]
+    if not changed:
+        return jsonify({'updated': 0, 'unchanged': len(owned), 'notifications_queued': False})
+    
+    try:
+        db.session.execute(
+            update(Application)
+            .where(Application.id.in_(changed), Application.status != new_status)
+            .values(status=new_status)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        cache.invalidate('applications')
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+    
+    task_id = enqueue('internport.notify_status_change', sorted(changed), new_status)
+    return jsonify({
+        'updated': len(changed),
+        'unchanged': len(owned) - len(changed),
+        'notifications_queued': task_id is not None
+    })
+
 @app.route('/api/upload-resume', methods=['POST'])
 @token_required
 @role_required('student')
@@ -594,99 +896,280 @@ def upload_resume():
     if not user or not user.student_profile:
         return jsonify({'error': 'Student profile not found'}), 404
     
-    filename = f"resume_{user_id}_{uuid.uuid4().hex}_{file.filename}"
-    filepath = os.path.join(UPLOAD_FOLDER, filename)
+    ext = file.filename.rsplit('.', 1)[-1].lower()
     
     try:
-        file.save(filepath)
+        filename, sha256, created = store_resume(file, ext)
+        release(user.student_profile.resume_path)
         user.student_profile.resume_path = filename
         
         db.session.commit()
+        if created:
+            enqueue('internport.process_resume', os.path.join(blob_directory(filename), filename), sha256)
         return jsonify({
             'message': 'Resume uploaded successfully',
-            'filename': filename
+            'filename': filename,
+            'sha256': sha256
         })
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+DOWNLOAD_ENDPOINTS = ('serve_upload', 'download_resume_export')
+
+@app.route('/api/download-tokens', methods=['POST'])
+@token_required
+def issue_download_token():
+    """A link the browser can open directly for one download URL.
+    Access is still checked when the link is used."""
+    data = request.get_json(silent=True)
+    path = data.get('path') if isinstance(data, dict) else None
+    if not isinstance(path, str):
+        return jsonify({'error': 'path must be a string'}), 400
+    
+    try:
+        endpoint, _ = app.url_map.bind('').match(path, method='GET')
+    except HTTPException:
+        endpoint = None
+    if endpoint not in DOWNLOAD_ENDPOINTS:
+        return jsonify({'error': 'Not a download path'}), 400
+    
+    # request.path is matched decoded when the link is used.
+    token = create_download_token(request.current_user, unquote(path))
+    return jsonify({
+        'url': f'{path}?token={token}',
+        'expires_in': app.config['DOWNLOAD_TOKEN_TTL']
+    })
+
 @app.route('/uploads/<filename>')
+@download_token_required
 def serve_upload(filename):
-    return send_from_directory(UPLOAD_FOLDER, filename)
+    legacy_path = os.path.join(UPLOAD_FOLDER, filename)
+    if not can_read_upload(request.current_user, filename, legacy_path):
+        return jsonify({'error': 'Not authorized'}), 403
+    
+    if is_blob_name(filename):
+        # Blob names are content hashes, so the bytes behind a name never change.
+        return send_stored_file(blob_directory(filename), filename, app.config['UPLOAD_BLOB_MAX_AGE'])
+    return send_stored_file(UPLOAD_FOLDER, filename)
+
+def send_stored_file(directory, filename, max_age=None, download_name=None):
+    """Send a file under UPLOAD_FOLDER, or hand it to the reverse proxy."""
+    if app.config['UPLOAD_OFFLOAD'] == 'x-accel':
+        relative = os.path.relpath(os.path.join(directory, filename), UPLOAD_FOLDER)
+        response = app.response_class()
+        response.headers['X-Accel-Redirect'] = app.config['UPLOAD_ACCEL_PREFIX'] + relative.replace(os.sep, '/')
+        response.mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        if download_name:
+            response.headers.set('Content-Disposition', 'attachment', filename=download_name)
+    else:
+        # send_file handles Range, If-Modified-Since and ETags itself, and
+        # emits X-Sendfile instead of the body when USE_X_SENDFILE is set.
+        response = send_from_directory(
+            directory, filename, max_age=max_age,
+            as_attachment=download_name is not None, download_name=download_name
+        )
+    
+    if max_age:
+        response.cache_control.public = False
+        response.cache_control.private = True
+        response.cache_control.max_age = max_age
+        response.cache_control.immutable = True
+    return response
+
+@app.route('/api/internships/<int:internship_id>/resume-export', methods=['POST'])
+@token_required
+@role_required('company')
+def export_internship_resumes(internship_id):
+    user_id = request.current_user['user_id']
+    
+    user = User.query.get(user_id)
+    if not user or not user.company_profile:
+        return jsonify({'error': 'Company profile not found'}), 404
+    
+    internship = Internship.query.get(internship_id)
+    if not internship:
+        return jsonify({'error': 'Internship not found'}), 404
+    
+    if internship.company_id != user.company_profile.id:
+        return jsonify({'error': 'Not authorized'}), 403
+    
+    job = ExportJob(
+        id=uuid.uuid4().hex,
+        company_id=user.company_profile.id,
+        internship_id=internship_id
+    )
+    
+    try:
+        db.session.add(job)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+    
+    if not enqueue('internport.export_resumes', job.id):
+        job.status = 'FAILED'
+        job.error = 'Task queue unavailable'
+        db.session.commit()
+        return jsonify({'error': 'Export could not be queued, try again later'}), 503
+    
+    return jsonify({
+        'message': 'Resume export started',
+        'job_id': job.id,
+        'status_url': f'/api/resume-exports/{job.id}'
+    }), 202
+
+def get_company_export(job_id):
+    """The export job if it belongs to the requesting company user."""
+    return ExportJob.query.join(
+        CompanyProfile, ExportJob.company_id == CompanyProfile.id
+    ).filter(
+        ExportJob.id == job_id,
+        CompanyProfile.user_id == request.current_user['user_id']
+    ).first()
+
+@app.route('/api/resume-exports/<job_id>', methods=['GET'])
+@token_required
+@role_required('company')
+def get_resume_export(job_id):
+    job = get_company_export(job_id)
+    if not job:
+        return jsonify({'error': 'Export not found'}), 404
+    
+    result = {
+        'job_id': job.id,
+        'internship_id': job.internship_id,
+        'status': job.status,
+        'file_count': job.file_count,
+        'error': job.error,
+        'created_at': job.created_at.isoformat(),
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None
+    }
+    if job.status == 'DONE':
+        path = f'/api/resume-exports/{job.id}/download'
+        result['download_url'] = f'{path}?token={create_download_token(request.current_user, path)}'
+    return jsonify(result)
+
+@app.route('/api/resume-exports/<job_id>/download', methods=['GET'])
+@download_token_required
+def download_resume_export(job_id):
+    job = get_company_export(job_id)
+    if not job or job.status != 'DONE':
+        return jsonify({'error': 'Export not found'}), 404
+    
+    return send_stored_file(
+        os.path.join(UPLOAD_FOLDER, 'exports'), f'{job.id}.zip',
+        download_name=f'internship_{job.internship_id}_resumes.zip'
+    )
 
 @app.route('/api/admin/users', methods=['GET'])
 @token_required
 @role_required('admin')
+@cache.cached('users')
 def get_all_users():
-    users = User.query.all()
-    result = []
+    fmt = stream_format()
+    if fmt:
+        query = admin_user_rows().order_by(User.created_at.desc(), User.id.desc())
+        return stream_response(query, serialize_admin_user, ADMIN_USER_FIELDS, fmt)
     
-    for user in users:
-        user_data = {
-            'id': user.id,
-            'email': user.email,
-            'role': user.role,
-            'is_active': user.is_active,
-            'created_at': user.created_at.isoformat()
-        }
-        
-        if user.role == 'student' and user.student_profile:
-            user_data['full_name'] = user.student_profile.full_name
-        elif user.role == 'company' and user.company_profile:
-            user_data['company_name'] = user.company_profile.company_name
-        
-        result.append(user_data)
+    try:
+        users, next_cursor = paginate(admin_user_rows(), User.created_at, User.id)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    return jsonify(result)
+    return list_response([serialize_admin_user(user) for user in users], next_cursor)
+
+ADMIN_USER_FIELDS = ['id', 'email', 'role', 'is_active', 'created_at', 'full_name', 'company_name']
+
+def serialize_admin_user(user):
+    user_data = {
+        'id': user.id,
+        'email': user.email,
+        'role': user.role,
+        'is_active': user.is_active,
+        'created_at': user.created_at.isoformat()
+    }
+    
+    if user.role == 'student' and user.full_name is not None:
+        user_data['full_name'] = user.full_name
+    elif user.role == 'company' and user.company_name is not None:
+        user_data['company_name'] = user.company_name
+    
+    return user_data
 
 @app.route('/api/admin/internships', methods=['GET'])
 @token_required
 @role_required('admin')
+@cache.cached('internships')
 def get_all_internships():
-    internships = Internship.query.order_by(Internship.created_at.desc()).all()
-    result = []
+    try:
+        internships, next_cursor = paginate(
+            internships_with_company(), Internship.created_at, Internship.id
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    counts = application_counts([internship.id for internship in internships])
     current_time = datetime.utcnow()
+    result = [
+        serialize_admin_internship(internship, counts.get(internship.id, 0), current_time)
+        for internship in internships
+    ]
     
-    for internship in internships:
-        company = CompanyProfile.query.get(internship.company_id)
-        is_open = internship.last_date > current_time
-        
-        result.append({
-            'id': internship.id,
-            'title': internship.title,
-            'company_name': company.company_name if company else 'Unknown',
-            'location': internship.location,
-            'stipend': internship.stipend,
-            'last_date': internship.last_date.isoformat(),
-            'created_at': internship.created_at.isoformat(),
-            'is_active': internship.is_active,
-            'is_open': is_open,
-            'application_count': len(internship.applications)
-        })
+    return list_response(result, next_cursor)
+
+def serialize_admin_internship(internship, application_count, current_time):
+    company = internship.company
+    is_open = internship.last_date > current_time
     
-    return jsonify(result)
+    return {
+        'id': internship.id,
+        'title': internship.title,
+        'company_name': company.company_name if company else 'Unknown',
+        'location': internship.location,
+        'stipend': internship.stipend,
+        'last_date': internship.last_date.isoformat(),
+        'created_at': internship.created_at.isoformat(),
+        'is_active': internship.is_active,
+        'is_open': is_open,
+        'application_count': application_count
+    }
 
 @app.route('/api/admin/applications', methods=['GET'])
 @token_required
 @role_required('admin')
+@cache.cached('applications')
 def get_all_applications():
-    applications = Application.query.order_by(Application.applied_at.desc()).all()
-    result = []
+    fmt = stream_format()
+    if fmt:
+        query = admin_application_rows().order_by(
+            Application.applied_at.desc(), Application.id.desc()
+        )
+        return stream_response(query, serialize_admin_application, ADMIN_APPLICATION_FIELDS, fmt)
     
-    for app in applications:
-        internship = Internship.query.get(app.internship_id)
-        company = CompanyProfile.query.get(internship.company_id) if internship else None
-        student = StudentProfile.query.get(app.student_id)
-        
-        result.append({
-            'id': app.id,
-            'internship_title': internship.title if internship else 'Unknown',
-            'company_name': company.company_name if company else 'Unknown',
-            'student_name': student.full_name if student else 'Unknown',
-            'status': app.status,
-            'applied_at': app.applied_at.isoformat()
-        })
+    try:
+        applications, next_cursor = paginate(
+            admin_application_rows(), Application.applied_at, Application.id
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    return jsonify(result)
+    return list_response(
+        [serialize_admin_application(application) for application in applications],
+        next_cursor
+    )
+
+ADMIN_APPLICATION_FIELDS = ['id', 'internship_title', 'company_name', 'student_name', 'status', 'applied_at']
+
+def serialize_admin_application(application):
+    return {
+        'id': application.id,
+        'internship_title': application.internship_title or 'Unknown',
+        'company_name': application.company_name or 'Unknown',
+        'student_name': application.student_name or 'Unknown',
+        'status': application.status,
+        'applied_at': application.applied_at.isoformat()
+    }
 
 def create_admin_user():
     admin_email = 'admin@internport.com'
@@ -730,6 +1213,7 @@ def create_admin_user():
 
 if __name__ == '__main__':
     with app.app_context():
-        db.create_all()
+        # The migrations own the schema; see README for existing databases.
+        upgrade()
         create_admin_user()
     app.run(debug=True, port=5000)
\ No newline at end of file
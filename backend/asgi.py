@@ -0,0 +1,353 @@
+"""ASGI entry point with async handlers for the read-heavy endpoints.
+
+The internship feed, internship detail, my-applications and the admin
+listings are served here on SQLAlchemy's async engine, so a slow query
+parks a coroutine instead of pinning a worker thread and one process can
+hold many concurrent pollers. Every other route is handed to the Flask
+app on a thread pool, so this is a drop-in replacement for the WSGI
+server:
+
+    uvicorn asgi:application --port 5000
+
+The async handlers check tokens with auth.authenticate(), build queries
+with the same helpers as the Flask views and compute the same ETags, so
+clients cannot tell which path answered. They skip the response cache;
+conditional requests still answer 304 without running the listing.
+Streaming exports (?stream=1, CSV or NDJSON) go to the Flask views.
+With READ_REPLICA_URLS set they read from a replica under the same
+rules as the Flask views (see replicas.py), keyed by the handler name,
+which matches the Flask endpoint name.
+"""
+import random
+import re
+from datetime import datetime
+
+from a2wsgi import WSGIMiddleware
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import defer
+from werkzeug.datastructures import Headers, MultiDict
+from werkzeug.http import parse_etags
+from urllib.parse import parse_qsl
+
+from app import (
+    app, serialize_feed_internship, serialize_internship_detail, serialize_my_application,
+    serialize_admin_internship, serialize_admin_user, serialize_admin_application
+)
+from auth import authenticate
+from etags import etag_for
+from models import db, User, StudentProfile, CompanyProfile, Internship, Application
+from pagination import page_query, page_rows, requested_fields
+from queries import (
+    internships_with_company, applications_with_internship, application_counts_query, admin_user_rows,
+    admin_application_rows, internship_feed_version_query, internship_version_query, my_applications_version_query
+)
+import engine_profiles
+import replicas
+
+STREAM_MIMETYPES = ('application/x-ndjson', 'text/csv')
+
+
+class Request:
+    def __init__(self, scope):
+        self.path = scope['path']
+        self.query_string = scope['query_string'].decode('latin-1')
+        self.args = MultiDict(parse_qsl(self.query_string, keep_blank_values=True))
+        self.headers = Headers([
+            (name.decode('latin-1'), value.decode('latin-1')) for name, value in scope['headers']
+        ])
+        # Matches Flask's request.full_path, which the ETag covers.
+        self.full_path = f'{self.path}?{self.query_string}'
+        self.current_user = None
+
+    def wants_stream(self):
+        accept = self.headers.get('Accept', '')
+        return self.args.get('stream') in ('1', 'true') or any(
+            mimetype in accept for mimetype in STREAM_MIMETYPES
+        )
+
+
+class JSONResponse:
+    def __init__(self, body=None, status=200, headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self.body = b''
+        if body is not None:
+            self.body = (app.json.dumps(body, separators=(',', ':')) + '\n').encode()
+            self.headers['Content-Type'] = 'application/json'
+
+
+def error_response(message, status):
+    return JSONResponse({'error': message}, status)
+
+
+def list_response(request, items, next_cursor=None):
+    fields = requested_fields(request.args)
+    if fields:
+        items = [{key: value for key, value in item.items() if key in fields} for item in items]
+    response = JSONResponse(items)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
+
+
+async def conditional(session, request, statement, handler, per_user=False):
+    """Async counterpart of etags.conditional for a version-stamp query."""
+    row = (await session.execute(statement)).first()
+    if row is None:
+        return await handler()
+    etag = etag_for(tuple(row), request.current_user, request.full_path,
+                    request.headers.get('Accept', ''), per_user)
+    if parse_etags(request.headers.get('If-None-Match')).contains(etag):
+        return JSONResponse(status=304, headers={'ETag': f'"{etag}"'})
+    response = await handler()
+    if response.status == 200:
+        response.headers['ETag'] = f'"{etag}"'
+    return response
+
+
+async def get_internships(session, request):
+    user = request.current_user
+
+    async def listing():
+        query = internships_with_company().filter(Internship.is_active == True)
+        if user['role'] == 'company':
+            company_id = (await session.execute(
+                select(CompanyProfile.id).where(CompanyProfile.user_id == user['user_id'])
+            )).scalar()
+            if company_id is not None:
+                query = query.filter(Internship.company_id == company_id)
+
+        fields = requested_fields(request.args)
+        with_description = fields is None or 'description' in fields
+        with_requirements = fields is None or 'requirements' in fields
+        if not with_description:
+            query = query.options(defer(Internship.description))
+        if not with_requirements:
+            query = query.options(defer(Internship.requirements))
+
+        try:
+            query, limit = page_query(query, Internship.created_at, Internship.id, request.args)
+        except ValueError as e:
+            return error_response(str(e), 400)
+        rows = (await session.execute(query.statement)).scalars().all()
+        internships, next_cursor = page_rows(rows, limit, Internship.created_at, Internship.id)
+
+        current_time = datetime.utcnow()
+        return list_response(request, [
+            serialize_feed_internship(internship, current_time, with_description, with_requirements)
+            for internship in internships
+        ], next_cursor)
+
+    return await conditional(
+        session, request, internship_feed_version_query(user, datetime.utcnow()), listing
+    )
+
+
+async def get_internship(session, request, internship_id):
+    async def detail():
+        internship = (await session.execute(
+            internships_with_company().filter(Internship.id == internship_id).statement
+        )).scalars().first()
+        if not internship or not internship.is_active:
+            return error_response('Internship not found', 404)
+        return JSONResponse(serialize_internship_detail(internship, datetime.utcnow()))
+
+    return await conditional(
+        session, request, internship_version_query(internship_id, datetime.utcnow()), detail
+    )
+
+
+async def get_my_applications(session, request):
+    user_id = request.current_user['user_id']
+
+    async def listing():
+        student_id = (await session.execute(
+            select(StudentProfile.id).where(StudentProfile.user_id == user_id)
+        )).scalar()
+        if student_id is None:
+            return error_response('Student profile not found', 404)
+
+        query = applications_with_internship().filter(Application.student_id == student_id)
+        fields = requested_fields(request.args)
+        with_cover_letter = fields is None or 'cover_letter' in fields
+        if not with_cover_letter:
+            query = query.options(defer(Application.cover_letter))
+
+        try:
+            query, limit = page_query(query, Application.applied_at, Application.id, request.args)
+        except ValueError as e:
+            return error_response(str(e), 400)
+        rows = (await session.execute(query.statement)).scalars().all()
+        applications, next_cursor = page_rows(rows, limit, Application.applied_at, Application.id)
+
+        current_time = datetime.utcnow()
+        result = []
+        for application in applications:
+            internship = application.internship
+            company = internship.company if internship else None
+            result.append(serialize_my_application(
+                application, internship, company, current_time, with_cover_letter
+            ))
+        return list_response(request, result, next_cursor)
+
+    return await conditional(
+        session, request, my_applications_version_query(user_id, datetime.utcnow()), listing,
+        per_user=True
+    )
+
+
+async def get_all_users(session, request):
+    try:
+        query, limit = page_query(admin_user_rows(), User.created_at, User.id, request.args)
+    except ValueError as e:
+        return error_response(str(e), 400)
+    rows = (await session.execute(query.statement)).all()
+    users, next_cursor = page_rows(rows, limit, User.created_at, User.id)
+    return list_response(request, [serialize_admin_user(user) for user in users], next_cursor)
+
+
+async def get_all_internships(session, request):
+    try:
+        query, limit = page_query(
+            internships_with_company(), Internship.created_at, Internship.id, request.args
+        )
+    except ValueError as e:
+        return error_response(str(e), 400)
+    rows = (await session.execute(query.statement)).scalars().all()
+    internships, next_cursor = page_rows(rows, limit, Internship.created_at, Internship.id)
+
+    ids = [internship.id for internship in internships]
+    counts = dict((await session.execute(application_counts_query(ids))).all()) if ids else {}
+    current_time = datetime.utcnow()
+    return list_response(request, [
+        serialize_admin_internship(internship, counts.get(internship.id, 0), current_time)
+        for internship in internships
+    ], next_cursor)
+
+
+async def get_all_applications(session, request):
+    try:
+        query, limit = page_query(
+            admin_application_rows(), Application.applied_at, Application.id, request.args
+        )
+    except ValueError as e:
+        return error_response(str(e), 400)
+    rows = (await session.execute(query.statement)).all()
+    applications, next_cursor = page_rows(rows, limit, Application.applied_at, Application.id)
+    return list_response(request, [
+        serialize_admin_application(application) for application in applications
+    ], next_cursor)
+
+
+# (path pattern, handler, roles allowed or None for any signed-in user,
+# whether streaming requests stay with the Flask view)
+ROUTES = [
+    (re.compile(r'/api/internships'), get_internships, None, False),
+    (re.compile(r'/api/internships/(\d+)'), get_internship, None, False),
+    (re.compile(r'/api/my-applications'), get_my_applications, ('student',), False),
+    (re.compile(r'/api/admin/users'), get_all_users, ('admin',), True),
+    (re.compile(r'/api/admin/internships'), get_all_internships, ('admin',), False),
+    (re.compile(r'/api/admin/applications'), get_all_applications, ('admin',), True),
+]
+
+
+def match(scope):
+    if scope['method'] != 'GET':
+        return None
+    for pattern, handler, roles, streams in ROUTES:
+        matched = pattern.fullmatch(scope['path'])
+        if matched:
+            return handler, roles, streams, [int(value) for value in matched.groups()]
+    return None
+
+
+class AsyncReads:
+    """Serve the ROUTES handlers natively and pass the rest to Flask."""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = WSGIMiddleware(flask_app, workers=flask_app.config['ASGI_WSGI_THREADS'])
+        self.engine = None
+        self.sessions = None
+        self.replica_engines = []
+        self.replica_sessions = []
+
+    def start(self):
+        config = self.flask_app.config
+        with self.flask_app.app_context():
+            url = db.engine.url
+            replica_urls = [
+                engine.url for key, engine in db.engines.items()
+                if key and key.startswith(replicas.REPLICA_BIND_PREFIX)
+            ]
+        self.engine = engine_profiles.create_async(config, url)
+        self.sessions = async_sessionmaker(self.engine, expire_on_commit=False)
+        # ASYNC_DATABASE_URL names the primary; replicas always derive theirs.
+        self.replica_engines = [
+            engine_profiles.create_async(dict(config, ASYNC_DATABASE_URL=None), replica_url)
+            for replica_url in replica_urls
+        ]
+        self.replica_sessions = [
+            async_sessionmaker(engine, expire_on_commit=False) for engine in self.replica_engines
+        ]
+
+    def sessions_for(self, handler, user):
+        if self.replica_sessions and replicas.endpoint_may_use_replica(handler.__name__, user):
+            return random.choice(self.replica_sessions)
+        return self.sessions
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        route = match(scope) if scope['type'] == 'http' else None
+        if route is None:
+            return await self.wsgi(scope, receive, send)
+        handler, roles, streams, params = route
+        request = Request(scope)
+        if streams and request.wants_stream():
+            return await self.wsgi(scope, receive, send)
+        if self.engine is None:
+            self.start()
+
+        # The app context gives the shared helpers config and a place to
+        # build their queries; nothing here runs on the sync session.
+        with self.flask_app.app_context():
+            payload, error = authenticate(request.headers, roles)
+            if error:
+                response = error_response(*error)
+            else:
+                request.current_user = payload
+                async with self.sessions_for(handler, payload)() as session:
+                    response = await handler(session, request, *params)
+        await self.respond(request, response, send)
+
+    async def respond(self, request, response, send):
+        headers = dict(response.headers, **{'Content-Length': str(len(response.body))})
+        if request.headers.get('Origin'):
+            # Same headers flask_cors adds to the Flask responses.
+            headers['Access-Control-Allow-Origin'] = '*'
+            headers['Access-Control-Expose-Headers'] = 'ETag, X-Next-Cursor'
+        await send({
+            'type': 'http.response.start',
+            'status': response.status,
+            'headers': [(name.encode('latin-1'), value.encode('latin-1')) for name, value in headers.items()],
+        })
+        await send({'type': 'http.response.body', 'body': response.body})
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.start()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self.engine is not None:
+                    await self.engine.dispose()
+                for engine in self.replica_engines:
+                    await engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+application = AsyncReads(app)
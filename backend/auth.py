@@ -1,8 +1,15 @@
 from functools import wraps
-from flask import jsonify, request
+from collections import OrderedDict
+from flask import jsonify, request, current_app
 import jwt
+import hashlib
+import threading
+import time
 from datetime import datetime, timedelta
 
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+
 def create_token(user_id, email, role):
     payload = {
         'user_id': user_id,
@@ -10,35 +17,119 @@ def create_token(user_id, email, role):
         'role': role,
         'exp': datetime.utcnow() + timedelta(days=7)
     }
-    from app import app
-    token = jwt.encode(payload, app.config['JWT_SECRET_KEY'], algorithm='HS256')
+    token = jwt.encode(payload, current_app.config['JWT_SECRET_KEY'], algorithm='HS256')
     return token
 
+def create_download_token(user, path):
+    """Short-lived token for one download URL, safe to put in ?token=.
+
+    It only works for that path and never as a session token, so a link
+    that leaks through logs, history or Referer exposes a single file
+    for DOWNLOAD_TOKEN_TTL seconds.
+    """
+    payload = {
+        'user_id': user['user_id'],
+        'email': user['email'],
+        'role': user['role'],
+        'scope': 'download',
+        'path': path,
+        'exp': datetime.utcnow() + timedelta(seconds=current_app.config['DOWNLOAD_TOKEN_TTL'])
+    }
+    return jwt.encode(payload, current_app.config['JWT_SECRET_KEY'], algorithm='HS256')
+
+def _get_cached_payload(key):
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is None:
+            return None
+        payload, expires_at = entry
+        if expires_at <= time.time():
+            del _token_cache[key]
+            return None
+        _token_cache.move_to_end(key)
+        return payload
+
+def _cache_payload(key, payload):
+    max_size = current_app.config['TOKEN_CACHE_SIZE']
+    if max_size <= 0:
+        return
+    # Never keep a payload past the token's own expiry.
+    expires_at = min(payload['exp'], time.time() + current_app.config['TOKEN_CACHE_TTL'])
+    with _token_cache_lock:
+        _token_cache[key] = (payload, expires_at)
+        _token_cache.move_to_end(key)
+        while len(_token_cache) > max_size:
+            _token_cache.popitem(last=False)
+
+def clear_token_cache():
+    with _token_cache_lock:
+        _token_cache.clear()
+
 def verify_token(token):
-    try:
-        from app import app
-        payload = jwt.decode(token, app.config['JWT_SECRET_KEY'], algorithms=['HS256'])
+    key = hashlib.sha256(token.encode()).hexdigest()
+    payload = _get_cached_payload(key)
+    if payload is not None:
         return payload
+    
+    try:
+        payload = jwt.decode(token, current_app.config['JWT_SECRET_KEY'], algorithms=['HS256'])
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
+    
+    _cache_payload(key, payload)
+    return payload
+
+def _bearer_token(headers=None):
+    headers = request.headers if headers is None else headers
+    auth_header = headers.get('Authorization')
+    if auth_header and auth_header.startswith('Bearer '):
+        return auth_header.split(' ')[1]
+    return None
+
+def authenticate(headers, roles=None):
+    """(payload, None) for a valid bearer token in headers, else
+    (None, (error, status)) with the same errors token_required and
+    role_required return. For callers outside a Flask request."""
+    token = _bearer_token(headers)
+    if not token:
+        return None, ('Token is missing', 401)
+    payload = verify_token(token)
+    if not payload or 'scope' in payload:
+        return None, ('Invalid or expired token', 401)
+    if roles and payload['role'] not in roles:
+        return None, ('Unauthorized access', 403)
+    return payload, None
 
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = None
-        if 'Authorization' in request.headers:
-            auth_header = request.headers['Authorization']
-            if auth_header.startswith('Bearer '):
-                token = auth_header.split(' ')[1]
+        payload, error = authenticate(request.headers)
+        if error:
+            message, status = error
+            return jsonify({'error': message}), status
         
-        if not token:
-            return jsonify({'error': 'Token is missing'}), 401
-        
-        payload = verify_token(token)
-        if not payload:
-            return jsonify({'error': 'Invalid or expired token'}), 401
+        request.current_user = payload
+        return f(*args, **kwargs)
+    return decorated
+
+def download_token_required(f):
+    """Like token_required, but also accepts ?token= for links opened
+    directly by the browser, which cannot send an Authorization header.
+    Only a download token issued for this exact path is accepted there."""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        token = request.args.get('token')
+        if _bearer_token() or not token:
+            payload, error = authenticate(request.headers)
+            if error:
+                message, status = error
+                return jsonify({'error': message}), status
+        else:
+            payload = verify_token(token)
+            if not payload or payload.get('scope') != 'download' or payload.get('path') != request.path:
+                return jsonify({'error': 'Invalid or expired token'}), 401
         
         request.current_user = payload
         return f(*args, **kwargs)
@@ -0,0 +1,79 @@
+"""Compare the read endpoints served by the WSGI app and by asgi.py.
+
+Both servers should point at the same seeded database. Each scenario is
+run against one and then the other with many concurrent pollers, and the
+results are printed side by side:
+
+    DATABASE_URL=sqlite:////tmp/load.db python app.py &
+    DATABASE_URL=sqlite:////tmp/load.db uvicorn asgi:application --port 8000 &
+    python -m benchmarks.async_reads --wsgi-url http://localhost:5000 \\
+        --asgi-url http://localhost:8000 --concurrency 64
+
+The Flask views answer the feed, internship and admin listings from the
+response cache when they can, while the async handlers always query, so
+compare my_applications for raw query paths.
+"""
+import argparse
+import random
+
+from benchmarks.loadtest import Client, run_scenario
+
+
+def read_scenarios(client, tokens, internship_ids):
+    def get(path, role):
+        def step(rng):
+            return client.request('GET', path(rng), token=rng.choice(tokens[role]))[0], 200
+        return step
+
+    return {
+        'feed': get(lambda rng: '/api/internships?limit=50', 'student'),
+        'internship': get(lambda rng: f'/api/internships/{rng.choice(internship_ids)}', 'student'),
+        'my_applications': get(lambda rng: '/api/my-applications?limit=50', 'student'),
+        'admin_users': get(lambda rng: '/api/admin/users?limit=50', 'admin'),
+        'admin_internships': get(lambda rng: '/api/admin/internships?limit=50', 'admin'),
+        'admin_applications': get(lambda rng: '/api/admin/applications?limit=50', 'admin'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark WSGI and ASGI read endpoints side by side')
+    parser.add_argument('--wsgi-url', default='http://localhost:5000')
+    parser.add_argument('--asgi-url', default='http://localhost:8000')
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--scenarios', help='comma-separated subset to run')
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--students', type=int, default=100000, help='students in the seeded data')
+    parser.add_argument('--admin-email', default='admin@internport.com')
+    parser.add_argument('--admin-password', default='admin123')
+    args = parser.parse_args()
+
+    setup = Client(args.wsgi_url)
+    rng = random.Random(1)
+    tokens = {
+        'student': [setup.login(f'student{rng.randint(1, args.students)}@seed.internport.com')
+                    for _ in range(args.users)],
+        'admin': [setup.login(args.admin_email, args.admin_password)],
+    }
+    feed = setup.json('GET', '/api/internships?limit=200&fields=id', token=tokens['student'][0])
+    internship_ids = [item['id'] for item in feed]
+    if not internship_ids:
+        raise RuntimeError('No internships found; seed the database first')
+
+    servers = {'wsgi': Client(args.wsgi_url), 'asgi': Client(args.asgi_url)}
+    steps = {name: read_scenarios(client, tokens, internship_ids) for name, client in servers.items()}
+    names = list(steps['wsgi'])
+    if args.scenarios:
+        names = args.scenarios.split(',')
+
+    print(f'{args.concurrency} concurrent pollers, {args.duration:g}s per scenario and server')
+    print(f"{'scenario':20} {'server':6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name in names:
+        for server in servers:
+            result = run_scenario(steps[server][name], args.concurrency, args.duration)
+            print(f"{name:20} {server:6} {result['rps']:8.1f} {result['p50']:8.2f} "
+                  f"{result['p95']:8.2f} {result['p99']:8.2f} {result['errors']:7}")
+
+
+if __name__ == '__main__':
+    main()
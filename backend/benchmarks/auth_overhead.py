@@ -0,0 +1,50 @@
+"""Measure the per-request cost of token_required with and without the
+verified-token cache.
+
+    python -m benchmarks.auth_overhead --iterations 20000
+"""
+import argparse
+import time
+
+from flask import jsonify
+
+from auth import token_required, create_token, clear_token_cache
+
+
+def run(app, token, iterations, cache_size):
+    app.config['TOKEN_CACHE_SIZE'] = cache_size
+    clear_token_cache()
+
+    @token_required
+    def view():
+        return jsonify({})
+
+    headers = {'Authorization': f'Bearer {token}'}
+    with app.test_request_context('/', headers=headers):
+        view()
+        started = time.perf_counter()
+        for _ in range(iterations):
+            view()
+        elapsed = time.perf_counter() - started
+    return elapsed / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark token_required overhead')
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    from app import app
+    cache_size = app.config['TOKEN_CACHE_SIZE']
+    with app.app_context():
+        token = create_token(1, 'bench@internport.com', 'student')
+
+    uncached = run(app, token, args.iterations, 0)
+    cached = run(app, token, args.iterations, cache_size)
+    print(f'token_required without cache: {uncached:8.2f} us/request')
+    print(f'token_required with cache:    {cached:8.2f} us/request')
+    print(f'speedup: {uncached / cached:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Compare the per-company daily summary loop with the grouped query.
+
+Seeds 50k companies into an empty database, then times both ways of
+computing (owner email, new application count):
+
+    DATABASE_URL=sqlite:////tmp/summary.db python -m benchmarks.daily_summary
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from models import db, User, CompanyProfile, Internship, Application
+from benchmarks.seed import seed
+
+
+def per_company(since):
+    counts = []
+    for company in CompanyProfile.query.all():
+        new_applications = Application.query.join(Internship).filter(
+            Internship.company_id == company.id,
+            Application.applied_at >= since
+        ).count()
+        if new_applications > 0:
+            user = db.session.get(User, company.user_id)
+            if user:
+                counts.append((user.email, new_applications))
+    return counts
+
+
+def grouped(since):
+    from celery_worker import daily_summary_rows
+    return list(daily_summary_rows(since).execution_options(yield_per=1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the daily summary query')
+    parser.add_argument('--companies', type=int, default=50000)
+    parser.add_argument('--applications', type=int, default=500000)
+    args = parser.parse_args()
+
+    from app import app
+    with app.app_context():
+        db.create_all()
+        if not db.session.query(CompanyProfile.id).first():
+            print(f'Seeding {args.companies} companies...')
+            seed(50000, args.companies, args.companies * 2, args.applications)
+
+        since = datetime.utcnow() - timedelta(days=1)
+        for name, compute in (('grouped query', grouped), ('per-company loop', per_company)):
+            db.session.expunge_all()
+            started = time.perf_counter()
+            rows = compute(since)
+            elapsed = time.perf_counter() - started
+            print(f'{name:18} {len(rows):6} companies notified in {elapsed:8.2f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Print the query plan of every hot endpoint query.
+
+Seeds the target database first when it is empty, so a fresh run shows
+the plans against realistic volumes:
+
+    DATABASE_URL=sqlite:////tmp/bench.db python -m benchmarks.explain_plans
+"""
+import argparse
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_, text
+
+from models import db, User, Internship, Application
+from queries import (
+    internships_with_company, applications_with_internship, admin_user_rows, admin_application_rows
+)
+from benchmarks.seed import seed
+
+PAGE = 51
+
+
+def endpoint_queries():
+    now = datetime.utcnow()
+    feed = internships_with_company().filter(Internship.is_active == True)
+    newest = (Internship.created_at.desc(), Internship.id.desc())
+    applied = (Application.applied_at.desc(), Application.id.desc())
+    return {
+        'GET /api/internships (student)': feed.order_by(*newest).limit(PAGE),
+        'GET /api/internships (student, next page)': feed.filter(or_(
+            Internship.created_at < now - timedelta(days=30),
+            and_(Internship.created_at == now - timedelta(days=30), Internship.id < 1000)
+        )).order_by(*newest).limit(PAGE),
+        'GET /api/internships (company)': feed.filter(
+            Internship.company_id == 1
+        ).order_by(*newest).limit(PAGE),
+        'GET /api/internships/<id>': internships_with_company().filter(Internship.id == 1),
+        'GET /api/admin/internships': internships_with_company().order_by(*newest).limit(PAGE),
+        'GET /api/my-applications': applications_with_internship().filter(
+            Application.student_id == 1
+        ).order_by(*applied).limit(PAGE),
+        'GET /api/applications/<internship_id>': Application.query.filter(
+            Application.internship_id == 1
+        ).order_by(*applied).limit(PAGE),
+        'GET /api/admin/applications': admin_application_rows().order_by(*applied).limit(PAGE),
+        'GET /api/admin/users': admin_user_rows().order_by(User.created_at.desc(), User.id.desc()).limit(PAGE),
+        'send_deadline_reminders': Internship.query.filter(
+            Internship.is_active == True,
+            Internship.last_date > now,
+            Internship.last_date <= now + timedelta(days=1)
+        ),
+    }
+
+
+def explain(query):
+    compiled = query.statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+    if db.engine.dialect.name == 'sqlite':
+        rows = db.session.execute(text(f'EXPLAIN QUERY PLAN {compiled}'))
+        return [row[-1] for row in rows]
+    rows = db.session.execute(text(f'EXPLAIN {compiled}'))
+    return [row[0] for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Print EXPLAIN plans for endpoint queries')
+    parser.add_argument('--applications', type=int, default=1000000)
+    args = parser.parse_args()
+
+    from app import app
+    with app.app_context():
+        db.create_all()
+        if not db.session.query(Application.id).first():
+            print(f'Seeding {args.applications} applications...')
+            seed(100000, 5000, 50000, args.applications)
+        for name, query in endpoint_queries().items():
+            print(f'\n== {name}')
+            for line in explain(query):
+                print(f'   {line}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,279 @@
+"""Drive every main route of a running server and check for regressions.
+
+Each scenario runs for --duration seconds with --concurrency threads and
+reports throughput and p50/p95/p99 latency. Start from a seeded database:
+
+    DATABASE_URL=sqlite:////tmp/load.db python -m benchmarks.seed
+    DATABASE_URL=sqlite:////tmp/load.db python app.py &
+    python -m benchmarks.loadtest --save-baseline   # once, on the reference machine
+    python -m benchmarks.loadtest                   # exits 1 if anything regressed
+
+The baseline is only meaningful on the machine and data set it was
+recorded with.
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+from benchmarks.seed import SEED_PASSWORD
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+RESUME = b'%PDF-1.4\n% load test resume\n' + b'0' * 20000
+
+
+class Client:
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, path, token=None, json_body=None, body=None, content_type=None):
+        headers = {}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            content_type = 'application/json'
+        if content_type:
+            headers['Content-Type'] = content_type
+        request = urllib.request.Request(self.base_url + path, data=body, headers=headers, method=method)
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+    def json(self, method, path, expected=200, **kwargs):
+        status, payload = self.request(method, path, **kwargs)
+        if status != expected:
+            raise RuntimeError(f'{method} {path} returned {status}: {payload[:200]!r}')
+        return json.loads(payload)
+
+    def login(self, email, password=SEED_PASSWORD):
+        return self.json('POST', '/login', json_body={'email': email, 'password': password})['token']
+
+
+def multipart(fields, files):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, (filename, content) in files.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; '
+                     f'filename="{filename}"\r\nContent-Type: application/pdf\r\n\r\n'.encode())
+        parts.append(content + b'\r\n')
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+class Fixture:
+    """Tokens and ids the scenarios need, gathered before timing starts."""
+
+    def __init__(self, client, users, students, companies):
+        rng = random.Random(1)
+        self.student_emails = [f'student{rng.randint(1, students)}@seed.internport.com' for _ in range(users)]
+        self.student_tokens = [client.login(email) for email in self.student_emails]
+
+        self.company_tokens = []
+        self.review_targets = []
+        for number in rng.sample(range(1, companies + 1), min(users, companies)):
+            token = client.login(f'company{number}@seed.internport.com')
+            postings = client.json('GET', '/api/internships?limit=5&fields=id', token=token)
+            for posting in postings:
+                applications = client.json(
+                    'GET', f"/api/applications/{posting['id']}?limit=5&fields=id", token=token
+                )
+                self.review_targets += [
+                    (token, posting['id'], application['id']) for application in applications
+                ]
+            self.company_tokens.append(token)
+        if not self.review_targets:
+            raise RuntimeError('No applications found for the sampled companies; seed the database first')
+
+        feed = client.json('GET', '/api/internships?limit=200&fields=id,is_open', token=self.student_tokens[0])
+        self.open_internships = [item['id'] for item in feed if item['is_open']]
+        if not self.open_internships:
+            raise RuntimeError('No open internships; seed the database first')
+
+        # Fresh students, so every apply is a first application.
+        run = uuid.uuid4().hex[:8]
+        self.applicant_tokens = []
+        for index in range(users):
+            response = client.json('POST', '/register', expected=201, json_body={
+                'email': f'load-{run}-{index}@bench.internport.com', 'password': SEED_PASSWORD,
+                'role': 'student', 'full_name': f'Load Student {index}'
+            })
+            self.applicant_tokens.append(response['token'])
+        self.applications = itertools.product(range(users), self.open_internships)
+        self.lock = threading.Lock()
+
+    def next_application(self):
+        with self.lock:
+            applicant, internship_id = next(self.applications)
+        return self.applicant_tokens[applicant], internship_id
+
+
+def scenarios(client, fixture):
+    def login(rng):
+        email = rng.choice(fixture.student_emails)
+        return client.request('POST', '/login', json_body={'email': email, 'password': SEED_PASSWORD})[0], 200
+
+    def feed(rng):
+        return client.request('GET', '/api/internships?limit=50', token=rng.choice(fixture.student_tokens))[0], 200
+
+    def internship(rng):
+        path = f'/api/internships/{rng.choice(fixture.open_internships)}'
+        return client.request('GET', path, token=rng.choice(fixture.student_tokens))[0], 200
+
+    def search(rng):
+        query = rng.choice(['developer', 'data analyst', 'engineer', 'design'])
+        path = f'/api/internships/search?q={urllib.request.quote(query)}&limit=20'
+        return client.request('GET', path, token=rng.choice(fixture.student_tokens))[0], 200
+
+    def my_applications(rng):
+        path = '/api/my-applications?limit=50'
+        return client.request('GET', path, token=rng.choice(fixture.student_tokens))[0], 200
+
+    def apply(rng):
+        token, internship_id = fixture.next_application()
+        body, content_type = multipart({'cover_letter': 'Load test application'},
+                                       {'resume': ('resume.pdf', RESUME)})
+        return client.request('POST', f'/api/apply/{internship_id}', token=token,
+                              body=body, content_type=content_type)[0], 201
+
+    def review(rng):
+        token, internship_id, _ = rng.choice(fixture.review_targets)
+        path = f'/api/applications/{internship_id}?limit=50'
+        return client.request('GET', path, token=token)[0], 200
+
+    def review_status(rng):
+        token, _, application_id = rng.choice(fixture.review_targets)
+        status = rng.choice(['SHORTLISTED', 'REJECTED', 'APPLIED'])
+        return client.request('PUT', f'/api/application/{application_id}/status', token=token,
+                              json_body={'status': status})[0], 200
+
+    return {
+        'login': login, 'feed': feed, 'internship': internship, 'search': search,
+        'my_applications': my_applications, 'apply': apply, 'review': review,
+        'review_status': review_status,
+    }
+
+
+def percentile(sorted_samples, pct):
+    index = max(0, math.ceil(pct / 100 * len(sorted_samples)) - 1)
+    return sorted_samples[index]
+
+
+def run_scenario(step, concurrency, duration):
+    deadline = time.perf_counter() + duration
+    latencies = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+
+    def worker(slot):
+        rng = random.Random(slot)
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                status, expected = step(rng)
+            except StopIteration:
+                return
+            except Exception:
+                status, expected = None, 'a response'
+            latencies[slot].append((time.perf_counter() - started) * 1000)
+            if status != expected:
+                errors[slot] += 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(slot,)) for slot in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    samples = sorted(itertools.chain.from_iterable(latencies))
+    if not samples:
+        return {'requests': 0, 'rps': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'errors': sum(errors)}
+    return {
+        'requests': len(samples),
+        'rps': round(len(samples) / elapsed, 1),
+        'p50': round(percentile(samples, 50), 2),
+        'p95': round(percentile(samples, 95), 2),
+        'p99': round(percentile(samples, 99), 2),
+        'errors': sum(errors),
+    }
+
+
+def regressions(results, baseline, tolerance):
+    found = []
+    for name, result in results.items():
+        if result['errors']:
+            found.append(f"{name}: {result['errors']} failed requests")
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        for metric in ('p50', 'p95', 'p99'):
+            if result[metric] > reference[metric] * (1 + tolerance):
+                found.append(f"{name}: {metric} {result[metric]}ms vs baseline {reference[metric]}ms")
+        if result['rps'] < reference['rps'] * (1 - tolerance):
+            found.append(f"{name}: {result['rps']} req/s vs baseline {reference['rps']} req/s")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test a running InternPort server')
+    parser.add_argument('--base-url', default='http://localhost:5000')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--scenarios', help='comma-separated subset to run')
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--students', type=int, default=100000, help='students in the seeded data')
+    parser.add_argument('--companies', type=int, default=5000, help='companies in the seeded data')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='allowed fractional slowdown before failing')
+    args = parser.parse_args()
+
+    client = Client(args.base_url)
+    fixture = Fixture(client, args.users, args.students, args.companies)
+    steps = scenarios(client, fixture)
+    if args.scenarios:
+        steps = {name: steps[name] for name in args.scenarios.split(',')}
+
+    results = {}
+    print(f"{'scenario':16} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name, step in steps.items():
+        result = run_scenario(step, args.concurrency, args.duration)
+        results[name] = result
+        print(f"{name:16} {result['requests']:9} {result['rps']:8.1f} {result['p50']:8.2f} "
+              f"{result['p95']:8.2f} {result['p99']:8.2f} {result['errors']:7}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f'Baseline saved to {args.baseline}')
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f'No baseline at {args.baseline}; run with --save-baseline first')
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    found = regressions(results, baseline, args.tolerance)
+    for line in found:
+        print(f'REGRESSION {line}')
+    if found:
+        sys.exit(1)
+    print(f'No regressions against {args.baseline}')
+
+
+if __name__ == '__main__':
+    main()
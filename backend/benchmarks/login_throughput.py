@@ -0,0 +1,84 @@
+"""Measure /login throughput with inline and pooled password hashing.
+
+Creates benchmark users under the configured hashing policy, then drives
+/login from several threads for a fixed time in each mode:
+
+    DATABASE_URL=sqlite:////tmp/login.db python -m benchmarks.login_throughput --seconds 10
+"""
+import argparse
+import os
+import random
+import threading
+import time
+
+from models import db, User
+import passwords
+
+PASSWORD = 'password123'
+
+
+def create_users(count):
+    existing = db.session.query(User.id).filter(User.email.like('login%@bench.internport.com')).count()
+    if existing >= count:
+        return
+    password_hash = passwords.hash_password(PASSWORD)
+    db.session.execute(User.__table__.insert(), [
+        {'email': f'login{i}@bench.internport.com', 'password_hash': password_hash,
+         'role': 'student', 'is_active': True}
+        for i in range(existing, count)
+    ])
+    db.session.commit()
+
+
+def drive(app, users, threads, seconds):
+    deadline = time.perf_counter() + seconds
+    counts = [0] * threads
+    failures = [0] * threads
+
+    def worker(slot):
+        client = app.test_client()
+        rng = random.Random(slot)
+        while time.perf_counter() < deadline:
+            email = f'login{rng.randrange(users)}@bench.internport.com'
+            response = client.post('/login', json={'email': email, 'password': PASSWORD})
+            if response.status_code == 200:
+                counts[slot] += 1
+            else:
+                failures[slot] += 1
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(slot,)) for slot in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return sum(counts) / (time.perf_counter() - started), sum(failures)
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description='Benchmark login throughput')
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--threads', type=int, default=cores * 2)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--workers', type=int, default=cores)
+    parser.add_argument('--cost', type=int, help='override PASSWORD_HASH_COST')
+    args = parser.parse_args()
+
+    from app import app
+    if args.cost:
+        app.config['PASSWORD_HASH_COST'] = args.cost
+    with app.app_context():
+        db.create_all()
+        create_users(args.users)
+    print(f'policy {passwords.policy_method(app.config)}, {args.threads} threads, {cores} cores')
+
+    for name, workers in (('inline', 0), (f'pool of {args.workers}', args.workers)):
+        app.config['PASSWORD_HASH_WORKERS'] = workers
+        rate, failures = drive(app, args.users, args.threads, args.seconds)
+        passwords.shutdown()
+        print(f'{name:12} {rate:8.1f} logins/s  {rate / cores:8.1f} per core  {failures} failed')
+
+
+if __name__ == '__main__':
+    main()
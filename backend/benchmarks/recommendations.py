@@ -0,0 +1,53 @@
+"""Time the batch recommendation run and the per-request lookup.
+
+Seeds an empty database, runs recommender.compute_all() once and then
+reports p50/p95 for serving one student's top 10:
+
+    DATABASE_URL=sqlite:////tmp/recommend.db python -m benchmarks.recommendations
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime
+
+from models import db, StudentProfile
+from benchmarks.seed import seed
+from queries import recommended_internships
+import recommender
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark recommendations')
+    parser.add_argument('--students', type=int, default=100000)
+    parser.add_argument('--internships', type=int, default=50000)
+    parser.add_argument('--applications', type=int, default=500000)
+    parser.add_argument('--lookups', type=int, default=1000)
+    args = parser.parse_args()
+
+    from app import app
+    with app.app_context():
+        db.create_all()
+        if not db.session.query(StudentProfile.id).first():
+            print(f'Seeding {args.students} students and {args.internships} internships...')
+            seed(args.students, 5000, args.internships, args.applications)
+
+        result = recommender.compute_all()
+        print(f"Scored {result['students']} students x {result['internships']} internships, "
+              f"stored {result['recommendations']} rows in {result['elapsed']:.2f}s")
+
+        rng = random.Random(7)
+        student_ids = [row[0] for row in db.session.query(StudentProfile.id)]
+        samples = []
+        for _ in range(args.lookups):
+            student_id = rng.choice(student_ids)
+            started = time.perf_counter()
+            recommended_internships(student_id, datetime.utcnow(), 10)
+            samples.append((time.perf_counter() - started) * 1000)
+            db.session.expunge_all()
+        quantiles = statistics.quantiles(samples, n=100)
+        print(f'lookup p50 {quantiles[49]:.2f}ms  p95 {quantiles[94]:.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
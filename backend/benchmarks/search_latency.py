@@ -0,0 +1,85 @@
+"""Measure full-text search latency against a LIKE scan.
+
+Seeds 50k internships into an empty database, rebuilds the search index
+and reports p50/p95 for a handful of typical queries:
+
+    DATABASE_URL=sqlite:////tmp/search.db python -m benchmarks.search_latency
+"""
+import argparse
+import statistics
+import time
+
+from sqlalchemy import or_
+
+from models import db, CompanyProfile, Internship
+from benchmarks.seed import seed
+import search
+
+QUERIES = [
+    ('python', None, None),
+    ('backend developer', None, None),
+    ('data', 'Chennai', None),
+    ('engineer', 'Remote', 20000),
+    ('company 42', None, None),
+    # Terms that match nothing are the LIKE scan's worst case.
+    ('kubernetes', None, None),
+    ('figma prototyping', 'Pune', None),
+]
+
+
+def full_text(q, location, min_stipend, limit):
+    return search.search_internships(q, location, min_stipend, limit)
+
+
+def like_scan(q, location, min_stipend, limit):
+    query = db.session.query(Internship.id).outerjoin(
+        CompanyProfile, CompanyProfile.id == Internship.company_id
+    ).filter(
+        Internship.is_active == True
+    )
+    for term in q.split():
+        pattern = f'%{term}%'
+        query = query.filter(or_(
+            Internship.title.ilike(pattern), Internship.description.ilike(pattern),
+            Internship.requirements.ilike(pattern), CompanyProfile.company_name.ilike(pattern)
+        ))
+    if location:
+        query = query.filter(Internship.location.ilike(f'%{location}%'))
+    if min_stipend is not None:
+        query = query.filter(Internship.stipend >= min_stipend)
+    return query.limit(limit).all()
+
+
+def percentile(samples, pct):
+    return statistics.quantiles(samples, n=100)[pct - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark internship search')
+    parser.add_argument('--internships', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--limit', type=int, default=50)
+    args = parser.parse_args()
+
+    from app import app
+    with app.app_context():
+        db.create_all()
+        if not db.session.query(Internship.id).first():
+            print(f'Seeding {args.internships} internships...')
+            seed(1000, 5000, args.internships, 0)
+            started = time.perf_counter()
+            search.rebuild()
+            print(f'Indexed in {time.perf_counter() - started:.2f}s')
+
+        for name, run in (('full-text index', full_text), ('LIKE scan', like_scan)):
+            samples = []
+            for _ in range(args.repeat):
+                for q, location, min_stipend in QUERIES:
+                    started = time.perf_counter()
+                    run(q, location, min_stipend, args.limit)
+                    samples.append((time.perf_counter() - started) * 1000)
+            print(f'{name:16} p50 {percentile(samples, 50):8.2f}ms  p95 {percentile(samples, 95):8.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Bulk data seeder for benchmarks.
+
+Rows are written with batched Core inserts, so millions of rows take
+seconds rather than hours. Run from the backend directory:
+
+    DATABASE_URL=sqlite:////tmp/bench.db python -m benchmarks.seed
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from werkzeug.security import generate_password_hash
+
+from models import db, User, StudentProfile, CompanyProfile, Internship, Application
+import search
+
+MAJORS = ['Computer Science', 'Electrical Engineering', 'Mechanical Engineering',
+          'Mathematics', 'Economics', 'Design', 'Biology', 'Physics']
+CITIES = ['Bangalore', 'Chennai', 'Hyderabad', 'Pune', 'Mumbai', 'Delhi', 'Remote']
+TITLES = ['Backend Developer', 'Frontend Developer', 'Data Analyst', 'ML Engineer',
+          'Product Designer', 'QA Engineer', 'DevOps Engineer', 'Marketing Associate']
+STATUSES = ['APPLIED', 'APPLIED', 'APPLIED', 'SHORTLISTED', 'REJECTED', 'SELECTED']
+SEED_PASSWORD = 'password123'
+
+
+def _insert(model, rows, batch_size):
+    table = model.__table__
+    for start in range(0, len(rows), batch_size):
+        db.session.execute(table.insert(), rows[start:start + batch_size])
+
+
+def seed(students, companies, internships, applications, batch_size=10000, rng_seed=42):
+    """Insert the requested number of rows into an empty schema.
+
+    Students and companies get consecutive ids starting at 1, so the
+    generated foreign keys line up without reading anything back.
+    Every seeded user shares the password ``SEED_PASSWORD``.
+    """
+    if applications > students * internships:
+        raise ValueError('Not enough (student, internship) pairs for unique applications')
+
+    rng = random.Random(rng_seed)
+    now = datetime.utcnow()
+    password_hash = generate_password_hash(SEED_PASSWORD)
+
+    users = []
+    for i in range(1, students + 1):
+        users.append({'id': i, 'email': f'student{i}@seed.internport.com',
+                      'password_hash': password_hash, 'role': 'student', 'is_active': True,
+                      'created_at': now - timedelta(minutes=rng.randrange(525600))})
+    for i in range(1, companies + 1):
+        users.append({'id': students + i, 'email': f'company{i}@seed.internport.com',
+                      'password_hash': password_hash, 'role': 'company', 'is_active': True,
+                      'created_at': now - timedelta(minutes=rng.randrange(525600))})
+    _insert(User, users, batch_size)
+    del users
+
+    _insert(StudentProfile, [{
+        'id': i, 'user_id': i, 'full_name': f'Student {i}',
+        'university': f'University {i % 300}', 'major': rng.choice(MAJORS),
+        'year_of_study': f'{rng.randint(1, 4)} Year'
+    } for i in range(1, students + 1)], batch_size)
+
+    _insert(CompanyProfile, [{
+        'id': i, 'user_id': students + i, 'company_name': f'Company {i}',
+        'description': f'Seeded company {i}', 'location': rng.choice(CITIES)
+    } for i in range(1, companies + 1)], batch_size)
+
+    _insert(Internship, [{
+        'id': i, 'company_id': rng.randint(1, companies),
+        'title': f'{rng.choice(TITLES)} Intern', 'description': 'Seeded internship. ' * 20,
+        'requirements': 'Python, SQL, communication', 'location': rng.choice(CITIES),
+        'stipend': float(rng.randrange(5000, 50000, 500)),
+        'last_date': now + timedelta(days=rng.randint(-30, 90)),
+        'created_at': now - timedelta(minutes=rng.randrange(262800)),
+        'is_active': rng.random() > 0.1
+    } for i in range(1, internships + 1)], batch_size)
+    db.session.commit()
+
+    # Application i goes to student (i % students); each student's n-th
+    # application targets a different internship, keeping pairs unique.
+    for start in range(0, applications, batch_size):
+        rows = []
+        for i in range(start, min(start + batch_size, applications)):
+            student = i % students
+            internship = (student * 7 + i // students) % internships
+            rows.append({
+                'internship_id': internship + 1, 'student_id': student + 1,
+                'resume_path': f'uploads/seed_{student + 1}.pdf',
+                'cover_letter': 'I would love to join your team.',
+                'status': rng.choice(STATUSES),
+                'applied_at': now - timedelta(minutes=rng.randrange(262800))
+            })
+        db.session.execute(Application.__table__.insert(), rows)
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-seed the InternPort database')
+    parser.add_argument('--students', type=int, default=100000)
+    parser.add_argument('--companies', type=int, default=5000)
+    parser.add_argument('--internships', type=int, default=50000)
+    parser.add_argument('--applications', type=int, default=2000000)
+    parser.add_argument('--batch-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    from app import app
+    with app.app_context():
+        db.create_all()
+        started = time.perf_counter()
+        seed(args.students, args.companies, args.internships, args.applications, args.batch_size)
+        search.rebuild()
+        print(f"Seeded {args.applications} applications in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""Compare concurrent write throughput under the old and tuned engine profiles.
+
+Each writer thread runs short apply-like transactions (insert an
+application row, bump a counter on the posting, commit) against a fresh
+database file, so the only difference between runs is the engine profile:
+
+    python -m benchmarks.write_concurrency --threads 8 --seconds 10
+    python -m benchmarks.write_concurrency --url postgresql://localhost/bench
+
+"legacy" is what the app ran with before engine_profiles.py: SQLite's
+rollback journal, synchronous=FULL and pysqlite's default 5s busy wait,
+or SQLAlchemy's default Postgres pool.
+"tuned" is the default profile from config.py.
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from config import Config
+import engine_profiles
+
+SQLITE_PROFILES = {
+    'legacy': {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL', 'SQLITE_BUSY_TIMEOUT_MS': 5000},
+    'tuned': {},
+}
+POSTGRES_PROFILES = {
+    'legacy': None,
+    'tuned': {},
+}
+
+
+def profile_config(url, overrides):
+    config = {name: getattr(Config, name) for name in dir(Config) if name.isupper()}
+    config.update(overrides, SQLALCHEMY_DATABASE_URI=url)
+    return config
+
+
+def make_engine(url, overrides):
+    if overrides is None:
+        # Before engine_profiles.py: SQLAlchemy's default pool, no pre-ping,
+        # no recycling and no statement timeout.
+        return create_engine(url)
+    config = profile_config(url, overrides)
+    engine = create_engine(url, **engine_profiles.engine_options(config))
+    engine_profiles.apply_profile(engine, config)
+    return engine
+
+
+def create_schema(engine):
+    with engine.begin() as conn:
+        conn.execute(text('DROP TABLE IF EXISTS bench_applications'))
+        conn.execute(text('DROP TABLE IF EXISTS bench_internships'))
+        conn.execute(text('CREATE TABLE bench_internships '
+                          '(id INTEGER PRIMARY KEY, applications INTEGER NOT NULL)'))
+        conn.execute(text('CREATE TABLE bench_applications (id INTEGER PRIMARY KEY, '
+                          'internship_id INTEGER NOT NULL, student_id INTEGER NOT NULL, '
+                          'cover_letter TEXT, applied_at TIMESTAMP)'))
+        conn.execute(text('INSERT INTO bench_internships (id, applications) VALUES (:id, 0)'),
+                     [{'id': i} for i in range(1, 101)])
+
+
+def drive(engine, threads, seconds):
+    deadline = time.perf_counter() + seconds
+    commits = [0] * threads
+    locked = [0] * threads
+    latencies = [[] for _ in range(threads)]
+
+    def worker(slot):
+        rng = random.Random(slot)
+        while time.perf_counter() < deadline:
+            internship_id = rng.randint(1, 100)
+            started = time.perf_counter()
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(
+                        'INSERT INTO bench_applications (internship_id, student_id, cover_letter, applied_at) '
+                        'VALUES (:internship_id, :student_id, :cover_letter, CURRENT_TIMESTAMP)'
+                    ), {'internship_id': internship_id, 'student_id': slot, 'cover_letter': 'x' * 200})
+                    conn.execute(text(
+                        'UPDATE bench_internships SET applications = applications + 1 WHERE id = :id'
+                    ), {'id': internship_id})
+            except OperationalError:
+                locked[slot] += 1
+                continue
+            latencies[slot].append(time.perf_counter() - started)
+            commits[slot] += 1
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(slot,)) for slot in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    samples = sorted(latency for slot in latencies for latency in slot)
+    p95 = samples[int(len(samples) * 0.95)] * 1000 if samples else 0.0
+    return sum(commits) / elapsed, sum(locked), p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark concurrent writes per engine profile')
+    parser.add_argument('--url', help='database URL; defaults to a fresh SQLite file per profile')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+
+    postgres = args.url and not args.url.startswith('sqlite')
+    profiles = POSTGRES_PROFILES if postgres else SQLITE_PROFILES
+    print(f'{args.threads} writer threads, {args.seconds:g}s per profile')
+    for name, overrides in profiles.items():
+        with tempfile.TemporaryDirectory() as directory:
+            url = args.url or f"sqlite:///{os.path.join(directory, 'bench.db')}"
+            engine = make_engine(url, overrides)
+            create_schema(engine)
+            rate, locked, p95 = drive(engine, args.threads, args.seconds)
+            engine.dispose()
+        print(f'{name:8} {rate:9.1f} commits/s  p95 {p95:7.1f}ms  {locked} locked errors')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+import os
+import re
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import event, update
+from sqlalchemy.exc import IntegrityError
+from models import db, ResumeBlob
+from uploads import spool_upload
+
+BLOB_NAME = re.compile(r'^[0-9a-f]{64}\.[a-z0-9]+$')
+
+
+def blob_directory(name):
+    """Blobs are sharded by the first two hex digits of their hash."""
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], 'blobs', name[:2])
+
+
+def is_blob_name(name):
+    return bool(name and BLOB_NAME.match(name))
+
+
+def resume_file_path(resume_path):
+    """Disk path of a stored resume, for blob names and legacy paths alike."""
+    if is_blob_name(resume_path):
+        return os.path.join(blob_directory(resume_path), resume_path)
+    if os.path.dirname(resume_path):
+        return resume_path
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], resume_path)
+
+
+def store_resume(file, ext):
+    """Store an uploaded resume by content and take a reference to it.
+
+    Returns (blob name, sha256, created) where created is True when this
+    call registered the blob's row. The reference is taken in the current
+    session, so it is committed or rolled back with the caller's changes;
+    a file written for a new row is removed again if that rolls back.
+    """
+    temp_path, sha256, size = spool_upload(file, os.path.join(current_app.config['UPLOAD_FOLDER'], 'blobs'))
+    name = f"{sha256}.{ext}"
+    directory = blob_directory(name)
+    path = os.path.join(directory, name)
+    
+    # The row decides, not the file: collect_garbage() may be deleting an
+    # unreferenced file right now, but not once we hold the row.
+    created = False
+    if not acquire(name):
+        try:
+            with db.session.begin_nested():
+                db.session.add(ResumeBlob(name=name, sha256=sha256, size=size, ref_count=1))
+            created = True
+        except IntegrityError:
+            # Another request registered the same content concurrently.
+            acquire(name)
+    
+    if created or not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        os.replace(temp_path, path)
+        if created:
+            db.session.info.setdefault('new_blobs', []).append((path, os.stat(path).st_ino))
+    else:
+        os.remove(temp_path)
+    return name, sha256, created
+
+
+@event.listens_for(db.session, 'after_commit')
+def keep_new_blobs(session):
+    # Savepoint commits fire this too; only the outermost one counts.
+    if session.get_nested_transaction() is None:
+        session.info.pop('new_blobs', None)
+
+
+@event.listens_for(db.session, 'after_transaction_end')
+def remove_uncommitted_blobs(session, transaction):
+    if transaction.parent is not None:
+        return
+    for path, inode in session.info.pop('new_blobs', []):
+        try:
+            # A later upload of the same bytes may have replaced it.
+            if os.stat(path).st_ino == inode:
+                os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def acquire(name):
+    """Add a reference to a stored blob; False if name is not a blob."""
+    if not is_blob_name(name):
+        return False
+    result = db.session.execute(
+        update(ResumeBlob)
+        .where(ResumeBlob.name == name)
+        .values(ref_count=ResumeBlob.ref_count + 1)
+    )
+    return result.rowcount > 0
+
+
+def release(name):
+    """Drop a reference. Unreferenced blobs are removed by collect_garbage()."""
+    if is_blob_name(name):
+        db.session.execute(
+            update(ResumeBlob)
+            .where(ResumeBlob.name == name)
+            .values(ref_count=ResumeBlob.ref_count - 1)
+        )
+
+
+def collect_garbage():
+    """Delete blobs that have had no references for BLOB_GC_GRACE seconds.
+
+    Each file is removed before its row delete commits. An upload of the
+    same bytes either took a reference first, so the delete skips the
+    row, or waits on the deleted row and then registers the blob afresh
+    and writes its own file. Returns the number of blobs removed.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=current_app.config['BLOB_GC_GRACE'])
+    names = [name for name, in db.session.query(ResumeBlob.name).filter(
+        ResumeBlob.ref_count <= 0,
+        ResumeBlob.updated_at < cutoff
+    )]
+    removed = 0
+    for name in names:
+        deleted = db.session.query(ResumeBlob).filter(
+            ResumeBlob.name == name, ResumeBlob.ref_count <= 0
+        ).delete(synchronize_session=False)
+        if deleted:
+            path = os.path.join(blob_directory(name), name)
+            if os.path.exists(path):
+                os.remove(path)
+            removed += 1
+        db.session.commit()
+    return removed
@@ -0,0 +1,156 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import Response, current_app, g, request
+import redis
+
+CACHED_HEADERS = ('X-Next-Cursor',)
+
+
+class MemoryBackend:
+    """Bounded in-process TTL store, used when Redis is unavailable."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.generations = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self.lock:
+            self.entries[key] = (value, time.time() + ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def generation(self, scope):
+        with self.lock:
+            return self.generations.get(scope, 0)
+
+    def bump(self, scope):
+        with self.lock:
+            self.generations[scope] = self.generations.get(scope, 0) + 1
+
+
+class RedisBackend:
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, key):
+        return self.client.get(key)
+
+    def set(self, key, value, ttl):
+        self.client.set(key, value, ex=ttl)
+
+    def generation(self, scope):
+        return int(self.client.get(f'internport:gen:{scope}') or 0)
+
+    def bump(self, scope):
+        self.client.incr(f'internport:gen:{scope}')
+
+
+class ResponseCache:
+    """Caches GET responses per scope with write-through invalidation.
+
+    Every key embeds the scope's generation counter, so invalidating a
+    scope is a single increment and stale entries simply age out.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['response_cache'] = self
+
+    def get_backend(self):
+        if self.backend is None:
+            with self.lock:
+                if self.backend is None:
+                    self.backend = self.create_backend()
+        return self.backend
+
+    def create_backend(self):
+        config = current_app.config
+        url = config.get('CACHE_REDIS_URL')
+        if url:
+            try:
+                client = redis.Redis.from_url(url, socket_connect_timeout=0.5, socket_timeout=0.5)
+                client.ping()
+                return RedisBackend(client)
+            except redis.RedisError as e:
+                current_app.logger.warning(f"Response cache falling back to memory: {e}")
+        return MemoryBackend(config['CACHE_MEMORY_MAX_ENTRIES'])
+
+    def invalidate(self, *scopes):
+        try:
+            backend = self.get_backend()
+            for scope in scopes:
+                backend.bump(scope)
+        except redis.RedisError as e:
+            current_app.logger.error(f"Failed to invalidate cache scopes {scopes}: {e}")
+
+    def cached(self, scope):
+        """Cache a view's successful responses under scope.
+
+        Must be applied below token_required: company users see only their
+        own postings, so they get a private key while other roles share one.
+        Below etags.conditional the key also includes the ETag, so a body
+        cached before the data changed is never sent under a newer tag,
+        whether the invalidation has not reached this worker yet or the
+        body was read from a lagging replica.
+        """
+        def decorator(f):
+            @wraps(f)
+            def decorated(*args, **kwargs):
+                if not current_app.config['CACHE_ENABLED']:
+                    return f(*args, **kwargs)
+                
+                user = request.current_user
+                audience = f"company:{user['user_id']}" if user['role'] == 'company' else user['role']
+                try:
+                    backend = self.get_backend()
+                    key = (f'internport:resp:{scope}:{backend.generation(scope)}:'
+                           f'{audience}:{request.full_path}:{request.headers.get("Accept", "")}:'
+                           f'{g.get("etag", "")}')
+                    hit = backend.get(key)
+                except redis.RedisError:
+                    return f(*args, **kwargs)
+                
+                if hit is not None:
+                    entry = json.loads(hit)
+                    return Response(entry['body'], mimetype=entry['mimetype'], headers=entry['headers'])
+                
+                response = current_app.make_response(f(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    entry = {
+                        'body': response.get_data(as_text=True),
+                        'mimetype': response.mimetype,
+                        'headers': {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+                    }
+                    try:
+                        backend.set(key, json.dumps(entry), current_app.config['CACHE_TTL'])
+                    except redis.RedisError:
+                        pass
+                return response
+            return decorated
+        return decorator
+
+
+cache = ResponseCache()
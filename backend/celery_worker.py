@@ -1,9 +1,18 @@
 from celery import Celery
+from celery.utils.log import get_task_logger
 from app import app, db
-from models import Internship, Application, User, CompanyProfile
+from models import Internship, Application, User, CompanyProfile, StudentProfile, ExportJob
+from sqlalchemy import func, or_, update
+from mailer import Mailer
+from blobstore import collect_garbage, resume_file_path
+import recommender
+import replicas
+from werkzeug.utils import import_string, secure_filename
 from datetime import datetime, timedelta
-import smtplib
-from email.mime.text import MIMEText
+import os
+import tempfile
+import time
+import zipfile
 
 def make_celery(app):
     celery = Celery(
@@ -15,65 +24,269 @@ def make_celery(app):
     return celery
 
 celery = make_celery(app)
+mailer = Mailer.from_config(app.config)
+logger = get_task_logger(__name__)
+
+def unclaimed_reminder(now):
+    """Applications not yet queued for a reminder, or whose claim lapsed
+    without a delivery."""
+    stale = now - timedelta(seconds=app.config['REMINDER_CLAIM_TTL'])
+    return or_(Application.reminder_queued_at.is_(None), Application.reminder_queued_at < stale)
+
+def claim_reminders(chunk, now):
+    """Mark a chunk as queued on the primary and return the claimed rows.
+
+    Only rows still unclaimed are taken, so overlapping runs, or a scan
+    that read a lagging replica, never queue the same reminder twice.
+    """
+    with db.engine.begin() as conn:
+        claimed = set(conn.scalars(
+            update(Application)
+            .where(
+                Application.id.in_([application_id for application_id, _, _ in chunk]),
+                Application.reminder_sent_at.is_(None),
+                unclaimed_reminder(now)
+            )
+            .values(reminder_queued_at=now, updated_at=Application.updated_at)
+            .returning(Application.id)
+        ))
+    return [reminder for reminder in chunk if reminder[0] in claimed]
 
 @celery.task
 def send_deadline_reminders():
-    with app.app_context():
-        tomorrow = datetime.utcnow() + timedelta(days=1)
-        internships = Internship.query.filter(
+    with app.app_context(), replicas.reads():
+        chunk_size = app.config['REMINDER_CHUNK_SIZE']
+        now = datetime.utcnow()
+        tomorrow = now + timedelta(days=1)
+        pending = db.session.query(
+            Application.id, User.email, Internship.title
+        ).join(
+            Internship, Application.internship_id == Internship.id
+        ).join(
+            StudentProfile, Application.student_id == StudentProfile.id
+        ).join(
+            User, StudentProfile.user_id == User.id
+        ).filter(
             Internship.last_date <= tomorrow,
-            Internship.last_date > datetime.utcnow(),
-            Internship.is_active == True
-        ).all()
+            Internship.last_date > now,
+            Internship.is_active == True,
+            Application.reminder_sent_at.is_(None),
+            unclaimed_reminder(now)
+        ).execution_options(yield_per=chunk_size)
         
-        for internship in internships:
-            applications = Application.query.filter_by(
-                internship_id=internship.id
-            ).all()
-            
-            for application in applications:
-                student = User.query.get(application.student_id)
-                if student:
-                    send_email(
-                        student.email,
-                        f"Deadline Reminder: {internship.title}",
-                        f"The application deadline for {internship.title} is approaching."
-                    )
+        chunks = 0
+        chunk = []
+        for application_id, email, title in pending:
+            chunk.append((application_id, email, title))
+            if len(chunk) == chunk_size:
+                chunks += queue_reminders(chunk, now)
+                chunk = []
+        if chunk:
+            chunks += queue_reminders(chunk, now)
+        return chunks
+
+def queue_reminders(chunk, now):
+    claimed = claim_reminders(chunk, now)
+    if not claimed:
+        return 0
+    send_reminder_chunk.delay(claimed)
+    return 1
 
 @celery.task
-def send_daily_summary():
+def send_reminder_chunk(reminders):
+    """Send one chunk of (application_id, email, title) reminders and
+    record the delivered ones so later runs skip them."""
     with app.app_context():
+        started = time.perf_counter()
+        results = mailer.send_chunk([
+            (
+                email,
+                f"Deadline Reminder: {title}",
+                f"The application deadline for {title} is approaching."
+            )
+            for application_id, email, title in reminders
+        ])
+        delivered = [reminder[0] for reminder, ok in zip(reminders, results) if ok]
+        if delivered:
+            db.session.execute(
+                update(Application)
+                .where(Application.id.in_(delivered))
+                .values(reminder_sent_at=datetime.utcnow(), updated_at=Application.updated_at)
+            )
+            db.session.commit()
+        return mailer.report(
+            'deadline reminders', len(delivered), len(reminders) - len(delivered),
+            time.perf_counter() - started
+        )
+
+def daily_summary_rows(since):
+    """(owner email, new application count) per company, in one grouped query."""
+    return db.session.query(
+        User.email, func.count(Application.id)
+    ).select_from(Application).join(
+        Internship, Application.internship_id == Internship.id
+    ).join(
+        CompanyProfile, Internship.company_id == CompanyProfile.id
+    ).join(
+        User, CompanyProfile.user_id == User.id
+    ).filter(
+        Application.applied_at >= since
+    ).group_by(CompanyProfile.id, User.email)
+
+@celery.task
+def send_daily_summary():
+    with app.app_context(), replicas.reads():
         yesterday = datetime.utcnow() - timedelta(days=1)
+        rows = daily_summary_rows(yesterday).execution_options(
+            yield_per=app.config['MAIL_CHUNK_SIZE']
+        )
         
-        companies = CompanyProfile.query.all()
-        for company in companies:
-            new_applications = Application.query.join(
-                Internship
-            ).filter(
-                Internship.company_id == company.id,
-                Application.applied_at >= yesterday
-            ).count()
-            
-            if new_applications > 0:
-                user = User.query.get(company.user_id)
-                if user:
-                    send_email(
-                        user.email,
-                        "Daily Applications Summary",
-                        f"You received {new_applications} new applications yesterday."
-                    )
+        messages = (
+            (
+                email,
+                "Daily Applications Summary",
+                f"You received {new_applications} new applications yesterday."
+            )
+            for email, new_applications in rows
+        )
+        return mailer.send_batch(messages, name='daily summary')
 
-def send_email(to_email, subject, body):
-    try:
-        msg = MIMEText(body)
-        msg['Subject'] = subject
-        msg['From'] = 'noreply@internport.com'
-        msg['To'] = to_email
+@celery.task(name='internport.notify_status_change')
+def notify_status_change(application_ids, status):
+    """Tell students their application moved to ``status``.
+
+    Applications that changed again before this task ran are skipped.
+    """
+    with app.app_context():
+        rows = db.session.query(
+            User.email, Internship.title
+        ).select_from(Application).join(
+            Internship, Application.internship_id == Internship.id
+        ).join(
+            StudentProfile, Application.student_id == StudentProfile.id
+        ).join(
+            User, StudentProfile.user_id == User.id
+        ).filter(
+            Application.id.in_(application_ids),
+            Application.status == status
+        ).all()
+        
+        messages = (
+            (
+                email,
+                f"Application Update: {title}",
+                f"Your application for {title} is now {status.lower()}."
+            )
+            for email, title in rows
+        )
+        return mailer.send_batch(messages, name='status updates')
+
+@celery.task(name='internport.process_resume')
+def process_resume(path, sha256):
+    """Run the configured RESUME_PROCESSORS (virus scan, text extraction,
+    thumbnailing, ...) on a stored resume. Each processor is a dotted
+    path to a callable taking (path, sha256)."""
+    with app.app_context():
+        for processor in app.config['RESUME_PROCESSORS']:
+            try:
+                import_string(processor)(path, sha256)
+            except Exception:
+                logger.exception(f"Resume processor {processor} failed for {path}")
+
+def export_path(job_id):
+    return os.path.join(app.config['UPLOAD_FOLDER'], 'exports', f"{job_id}.zip")
+
+@celery.task(name='internport.export_resumes')
+def export_resumes(job_id):
+    """Write every applicant resume of the job's internship into one ZIP.
+
+    ZipFile.write copies each resume in small blocks, so no file is held
+    in memory; the archive is built under a temporary name and renamed
+    into place once complete.
+    """
+    with app.app_context():
+        job = db.session.get(ExportJob, job_id)
+        if not job:
+            return
+        job.status = 'RUNNING'
+        db.session.commit()
+        
+        rows = db.session.query(
+            Application.id, Application.resume_path, StudentProfile.full_name
+        ).outerjoin(
+            StudentProfile, Application.student_id == StudentProfile.id
+        ).filter(
+            Application.internship_id == job.internship_id,
+            Application.resume_path.isnot(None)
+        ).order_by(Application.id).execution_options(yield_per=500)
         
-        with smtplib.SMTP('localhost') as server:
-            server.send_message(msg)
-    except Exception as e:
-        print(f"Failed to send email: {e}")
+        target = export_path(job_id)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix='.zip')
+        os.close(fd)
+        try:
+            file_count = 0
+            # Resumes are PDF/DOCX, which are already compressed.
+            with zipfile.ZipFile(temp_path, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+                for application_id, resume_path, full_name in rows:
+                    path = resume_file_path(resume_path)
+                    if not os.path.exists(path):
+                        continue
+                    ext = path.rsplit('.', 1)[-1].lower()
+                    student = secure_filename(full_name or 'student') or 'student'
+                    archive.write(path, f"{student}_{application_id}.{ext}")
+                    file_count += 1
+            os.replace(temp_path, target)
+            job.status = 'DONE'
+            job.file_count = file_count
+        except Exception as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            job.status = 'FAILED'
+            job.error = str(e)
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+        return job.status
+
+def expire_exports():
+    """Delete export archives finished more than EXPORT_RETENTION seconds
+    ago. Their jobs are marked EXPIRED first, so a download that races
+    the delete gets a 404 rather than a missing file. Returns the number
+    of jobs expired."""
+    cutoff = datetime.utcnow() - timedelta(seconds=app.config['EXPORT_RETENTION'])
+    job_ids = [job_id for job_id, in db.session.query(ExportJob.id).filter(
+        ExportJob.status == 'DONE',
+        ExportJob.finished_at < cutoff
+    )]
+    if not job_ids:
+        return 0
+    db.session.query(ExportJob).filter(
+        ExportJob.id.in_(job_ids), ExportJob.status == 'DONE'
+    ).update({'status': 'EXPIRED'}, synchronize_session=False)
+    db.session.commit()
+    for job_id in job_ids:
+        path = export_path(job_id)
+        if os.path.exists(path):
+            os.remove(path)
+    return len(job_ids)
+
+@celery.task
+def collect_resume_blobs():
+    with app.app_context():
+        return collect_garbage()
+
+@celery.task
+def collect_resume_exports():
+    with app.app_context():
+        return expire_exports()
+
+@celery.task
+def compute_recommendations():
+    with app.app_context(), replicas.reads():
+        return recommender.compute_all()
+
+def send_email(to_email, subject, body):
+    mailer.send_batch([(to_email, subject, body)], name='single')
 
 @celery.on_after_configure.connect
 def setup_periodic_tasks(sender, **kwargs):
@@ -87,4 +300,22 @@ def setup_periodic_tasks(sender, **kwargs):
         86400.0,
         send_daily_summary.s(),
         name='send daily summary'
+    )
+    
+    sender.add_periodic_task(
+        86400.0,
+        collect_resume_blobs.s(),
+        name='collect unreferenced resume blobs'
+    )
+    
+    sender.add_periodic_task(
+        3600.0,
+        collect_resume_exports.s(),
+        name='delete expired resume exports'
+    )
+    
+    sender.add_periodic_task(
+        float(app.config['RECOMMENDATION_INTERVAL']),
+        compute_recommendations.s(),
+        name='recompute internship recommendations'
     )
\ No newline at end of file
@@ -4,8 +4,78 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'internport-secret-key-2024'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///internport.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Engine profile, see engine_profiles.py. SQLite settings apply to
+    # sqlite:// URLs, pool settings to everything else.
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE') or 'WAL'
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS') or 'NORMAL'
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS') or 5000)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE') or 10)
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW') or 20)
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT') or 10)
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE') or 1800)
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS') or 30000)
+    # Read replicas, see replicas.py. Endpoint lists are Flask endpoint
+    # names; an empty READ_REPLICA_ENDPOINTS means every GET endpoint.
+    READ_REPLICA_URLS = [url for url in (os.environ.get('READ_REPLICA_URLS') or '').split(',') if url]
+    READ_REPLICA_ENDPOINTS = [name for name in (os.environ.get('READ_REPLICA_ENDPOINTS') or '').split(',') if name]
+    PRIMARY_ENDPOINTS = ['get_resume_export', 'download_resume_export']
+    READ_YOUR_WRITES_SECONDS = int(os.environ.get('READ_YOUR_WRITES_SECONDS') or 10)
+    # asgi.py: async driver URL (derived from DATABASE_URL when unset) and
+    # threads for the routes it hands to the Flask app.
+    ASYNC_DATABASE_URL = os.environ.get('ASYNC_DATABASE_URL')
+    ASGI_WSGI_THREADS = int(os.environ.get('ASGI_WSGI_THREADS') or 10)
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key-2024'
     UPLOAD_FOLDER = 'uploads'
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024
     CELERY_BROKER_URL = 'redis://localhost:6379/0'
-    CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
\ No newline at end of file
+    CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
+    PAGE_SIZE_DEFAULT = 50
+    PAGE_SIZE_MAX = 200
+    STREAM_BATCH_SIZE = 1000
+    TOKEN_CACHE_SIZE = 10000
+    TOKEN_CACHE_TTL = 300
+    DOWNLOAD_TOKEN_TTL = 300
+    # Changing the algorithm or cost rehashes each password at its next login.
+    PASSWORD_HASH_ALGORITHM = 'pbkdf2:sha256'
+    PASSWORD_HASH_COST = 600000
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS') or 0)
+    PASSWORD_HASH_MAX_PENDING = 64
+    PASSWORD_HASH_QUEUE_TIMEOUT = 5
+    PROFILING_ENABLED = True
+    SERVER_TIMING_ENABLED = os.environ.get('SERVER_TIMING_ENABLED') == '1'
+    SLOW_REQUEST_MS = 500
+    SLOW_REQUEST_MAX_STATEMENTS = 50
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    # Without a token /metrics answers 404 unless opened up explicitly,
+    # e.g. behind a firewall that only lets the scraper through.
+    METRICS_PUBLIC = os.environ.get('METRICS_PUBLIC') == '1'
+    CACHE_ENABLED = True
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL') or 'redis://localhost:6379/1'
+    CACHE_TTL = 60
+    CACHE_MEMORY_MAX_ENTRIES = 1024
+    MAIL_SERVER = os.environ.get('MAIL_SERVER') or 'localhost'
+    MAIL_PORT = int(os.environ.get('MAIL_PORT') or 25)
+    MAIL_DEFAULT_SENDER = 'noreply@internport.com'
+    MAIL_WORKERS = 4
+    MAIL_CHUNK_SIZE = 100
+    MAIL_MAX_RETRIES = 3
+    MAIL_RETRY_BACKOFF = 1.0
+    REMINDER_CHUNK_SIZE = 500
+    # A queued reminder that was not delivered within this long is queued again.
+    REMINDER_CLAIM_TTL = 3600
+    BULK_MAX_ITEMS = 1000
+    BULK_INSERT_BATCH_SIZE = 500
+    UPLOAD_CHUNK_SIZE = 64 * 1024
+    RESUME_PROCESSORS = []
+    BLOB_GC_GRACE = 24 * 3600
+    # Finished resume export archives are deleted this long after they are built.
+    EXPORT_RETENTION = 24 * 3600
+    # None serves upload bytes from Python; 'x-accel' (nginx) or 'x-sendfile'
+    # (Apache/lighttpd) hands them to the reverse proxy instead.
+    UPLOAD_OFFLOAD = os.environ.get('UPLOAD_OFFLOAD') or None
+    UPLOAD_ACCEL_PREFIX = '/protected-uploads/'
+    USE_X_SENDFILE = UPLOAD_OFFLOAD == 'x-sendfile'
+    UPLOAD_BLOB_MAX_AGE = 365 * 24 * 3600
+    RECOMMENDATION_TOP_K = 50
+    RECOMMENDATION_BATCH_SIZE = 256
+    RECOMMENDATION_INTERVAL = 6 * 3600
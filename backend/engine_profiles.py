@@ -0,0 +1,91 @@
+"""Database engine tuning chosen by the URL's dialect and the environment.
+
+SQLite runs in WAL mode with synchronous=NORMAL, so readers no longer
+block the writer and commits skip one fsync each. A busy timeout also
+makes concurrent writers wait their turn instead of failing with
+"database is locked". Postgres gets a sized, pre-pinged, recycled
+connection pool and a server-side statement timeout. The async engine
+used by asgi.py gets the same profile through its asyncio driver.
+"""
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.engine import make_url
+
+
+def engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured database URL."""
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    backend = url.get_backend_name()
+    if backend == 'sqlite':
+        # pysqlite's timeout is SQLite's busy timeout, in seconds.
+        return {'connect_args': {'timeout': config['SQLITE_BUSY_TIMEOUT_MS'] / 1000}}
+    options = {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': True,
+    }
+    if backend == 'postgresql' and config['DB_STATEMENT_TIMEOUT_MS']:
+        options['connect_args'] = {
+            'options': f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT_MS']}"
+        }
+    return options
+
+
+ASYNC_DRIVERS = {'sqlite': 'aiosqlite', 'postgresql': 'asyncpg', 'mysql': 'aiomysql'}
+
+
+def async_url(config, url):
+    """ASYNC_DATABASE_URL, or url with its asyncio driver.
+
+    Pass the sync engine's url rather than SQLALCHEMY_DATABASE_URI:
+    Flask-SQLAlchemy resolves relative SQLite paths into the instance
+    folder.
+    """
+    if config['ASYNC_DATABASE_URL']:
+        return make_url(config['ASYNC_DATABASE_URL'])
+    return url.set(drivername=f"{url.get_backend_name()}+{ASYNC_DRIVERS[url.get_backend_name()]}")
+
+
+def create_async(config, url):
+    """An AsyncEngine for the database at the sync engine's url, with
+    the same profile."""
+    url = async_url(config, url)
+    options = engine_options(dict(config, SQLALCHEMY_DATABASE_URI=url))
+    if url.get_driver_name() == 'asyncpg' and 'connect_args' in options:
+        # asyncpg takes server settings directly rather than libpq options.
+        options['connect_args'] = {
+            'server_settings': {'statement_timeout': str(config['DB_STATEMENT_TIMEOUT_MS'])}
+        }
+    engine = create_async_engine(url, **options)
+    apply_profile(engine.sync_engine, config)
+    return engine
+
+
+def sqlite_pragmas(config):
+    journal_mode = config['SQLITE_JOURNAL_MODE']
+    synchronous = config['SQLITE_SYNCHRONOUS']
+    busy_timeout = int(config['SQLITE_BUSY_TIMEOUT_MS'])
+
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f'PRAGMA journal_mode={journal_mode}')
+        cursor.execute(f'PRAGMA synchronous={synchronous}')
+        cursor.execute(f'PRAGMA busy_timeout={busy_timeout}')
+        cursor.close()
+    return set_pragmas
+
+
+def apply_profile(engine, config):
+    """Install per-connection settings on an engine created with
+    engine_options()."""
+    if engine.dialect.name == 'sqlite':
+        event.listen(engine, 'connect', sqlite_pragmas(config))
+
+
+def init_app(app, db):
+    """Call after db.init_app(app), once the engines exist."""
+    with app.app_context():
+        for engine in db.engines.values():
+            apply_profile(engine, app.config)
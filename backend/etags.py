@@ -0,0 +1,48 @@
+import hashlib
+from functools import wraps
+from flask import Response, current_app, g, request
+
+
+def etag_for(stamp, user, full_path, accept, per_user=False):
+    """Tag for a response built from stamp.
+
+    Users of the same role that see the same data share a tag, so the
+    tag can key the shared response cache. Company users and per_user
+    views (data about the user themselves) get their own.
+    """
+    identity = user['user_id'] if per_user or user['role'] == 'company' else None
+    source = repr((stamp, user['role'], identity, full_path, accept))
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def conditional(version, per_user=False):
+    """Answer If-None-Match with 304 using a cheap version stamp.
+
+    version(*args, **kwargs) returns a value that changes whenever the
+    response would, or None to skip conditional handling. The ETag also
+    covers the full URL and Accept header, so each page, projection and
+    format gets its own tag. Must be applied below token_required.
+    The tag is left in g.etag so cache.cached, applied below this,
+    only serves a body cached under the same stamp.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            stamp = version(*args, **kwargs)
+            if stamp is None:
+                return f(*args, **kwargs)
+            
+            etag = etag_for(stamp, request.current_user, request.full_path,
+                            request.headers.get('Accept', ''), per_user)
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+                response.set_etag(etag)
+                return response
+            
+            g.etag = etag
+            response = current_app.make_response(f(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                response.set_etag(etag)
+            return response
+        return decorated
+    return decorator
@@ -0,0 +1,32 @@
+from celery import Celery
+from flask import current_app
+
+_client = None
+
+
+def get_client():
+    """Producer-only Celery client, so the web app can queue tasks without
+    importing celery_worker (which imports the app itself)."""
+    global _client
+    if _client is None:
+        config = current_app.config
+        # No result backend: producers never wait on results, and the
+        # backend's reconnect loop would stall requests when Redis is down.
+        _client = Celery(current_app.import_name, broker=config['CELERY_BROKER_URL'])
+        _client.conf.broker_connection_timeout = 1
+        _client.conf.broker_transport_options = {'max_retries': 0}
+    return _client
+
+
+def enqueue(task_name, *args):
+    """Queue a task by name and return its id, or None if the broker is down.
+
+    Jobs queued from requests are follow-up work, so a missing broker is
+    logged rather than failing the request that produced them.
+    """
+    try:
+        result = get_client().send_task(task_name, args=args, retry=False)
+        return result.id
+    except Exception as e:
+        current_app.logger.error(f"Failed to queue {task_name}: {e}")
+        return None
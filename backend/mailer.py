@@ -0,0 +1,155 @@
+import logging
+import smtplib
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from email.mime.text import MIMEText
+from itertools import islice
+
+logger = logging.getLogger(__name__)
+
+# Only connection-level failures. SMTPException is itself an OSError,
+# so catching OSError here would retry permanent refusals too.
+TRANSIENT_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, socket.timeout)
+
+
+class Mailer:
+    """Sends batches of messages over pooled, reused SMTP connections.
+
+    A batch is split into chunks; each chunk is sent over one SMTP
+    connection by one of at most ``workers`` threads. Transient failures
+    reconnect and retry with exponential backoff.
+    """
+
+    def __init__(self, host='localhost', port=25, sender='noreply@internport.com',
+                 workers=4, chunk_size=100, max_retries=3, backoff=1.0, timeout=30):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            host=config['MAIL_SERVER'],
+            port=config['MAIL_PORT'],
+            sender=config['MAIL_DEFAULT_SENDER'],
+            workers=config['MAIL_WORKERS'],
+            chunk_size=config['MAIL_CHUNK_SIZE'],
+            max_retries=config['MAIL_MAX_RETRIES'],
+            backoff=config['MAIL_RETRY_BACKOFF'],
+        )
+
+    def build_message(self, to_email, subject, body):
+        msg = MIMEText(body)
+        msg['Subject'] = subject
+        msg['From'] = self.sender
+        msg['To'] = to_email
+        return msg
+
+    def connect(self):
+        return smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+
+    def send_chunk(self, chunk):
+        """Send (to_email, subject, body) tuples over one connection.
+
+        Returns a list of booleans, one per message, True when delivered.
+        """
+        results = []
+        server = None
+        try:
+            for to_email, subject, body in chunk:
+                msg = self.build_message(to_email, subject, body)
+                for attempt in range(self.max_retries + 1):
+                    try:
+                        if server is None:
+                            server = self.connect()
+                        server.send_message(msg)
+                        results.append(True)
+                        break
+                    except smtplib.SMTPRecipientsRefused as e:
+                        # The connection is still usable; only a 4xx
+                        # refusal is worth another try.
+                        codes = [code for code, _ in e.recipients.values()]
+                        if codes and all(400 <= code < 500 for code in codes) and attempt < self.max_retries:
+                            time.sleep(self.backoff * 2 ** attempt)
+                            continue
+                        logger.error(f"Failed to send email to {to_email}: {e}")
+                        results.append(False)
+                        break
+                    except smtplib.SMTPResponseException as e:
+                        # 4xx replies (including a refused connect) are temporary.
+                        if 400 <= e.smtp_code < 500 and attempt < self.max_retries:
+                            server = self.close(server)
+                            time.sleep(self.backoff * 2 ** attempt)
+                            continue
+                        logger.error(f"Failed to send email to {to_email}: {e}")
+                        results.append(False)
+                        break
+                    except TRANSIENT_ERRORS as e:
+                        server = self.close(server)
+                        if attempt < self.max_retries:
+                            time.sleep(self.backoff * 2 ** attempt)
+                            continue
+                        logger.error(f"Failed to send email to {to_email}: {e}")
+                        results.append(False)
+                    except (smtplib.SMTPException, OSError) as e:
+                        server = self.close(server)
+                        logger.error(f"Failed to send email to {to_email}: {e}")
+                        results.append(False)
+                        break
+        finally:
+            self.close(server)
+        return results
+
+    def close(self, server):
+        if server is not None:
+            try:
+                server.quit()
+            except (smtplib.SMTPException, OSError):
+                server.close()
+        return None
+
+    def send_batch(self, messages, name='batch'):
+        """Send an iterable of (to_email, subject, body) tuples.
+
+        The iterable is consumed lazily, with at most two chunks per worker
+        in flight, so it may be a streamed query of any size. Returns a
+        report dict with sent/failed counts, elapsed seconds and rate.
+        """
+        started = time.perf_counter()
+        sent = failed = 0
+        messages = iter(messages)
+        pending = set()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while True:
+                while len(pending) < self.workers * 2:
+                    chunk = list(islice(messages, self.chunk_size))
+                    if not chunk:
+                        break
+                    pending.add(pool.submit(self.send_chunk, chunk))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results = future.result()
+                    sent += sum(results)
+                    failed += len(results) - sum(results)
+
+        return self.report(name, sent, failed, time.perf_counter() - started)
+
+    def report(self, name, sent, failed, elapsed):
+        report = {
+            'name': name,
+            'sent': sent,
+            'failed': failed,
+            'seconds': round(elapsed, 3),
+            'per_second': round(sent / elapsed, 1) if elapsed else 0.0,
+        }
+        logger.info(f"Mail {name}: {sent} sent, {failed} failed in {elapsed:.2f}s "
+                    f"({report['per_second']}/s)")
+        return report
@@ -0,0 +1,54 @@
+"""add internship search index
+
+Revision ID: c41d9e2b7a05
+Revises: 48a9b4785069
+Create Date: 2026-10-18 14:02:37.512904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41d9e2b7a05'
+down_revision = '48a9b4785069'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "CREATE TABLE internship_search ("
+            "internship_id INTEGER PRIMARY KEY REFERENCES internships (id), "
+            "document TSVECTOR NOT NULL)"
+        )
+        op.execute(
+            "CREATE INDEX ix_internship_search_document ON internship_search USING GIN (document)"
+        )
+        op.execute(
+            "INSERT INTO internship_search (internship_id, document) "
+            "SELECT i.id, "
+            "setweight(to_tsvector('english', coalesce(i.title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(c.company_name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(i.requirements, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(i.description, '')), 'C') "
+            "FROM internships i LEFT JOIN company_profiles c ON c.id = i.company_id "
+            "WHERE i.is_active"
+        )
+    else:
+        op.execute(
+            "CREATE VIRTUAL TABLE internship_search USING fts5("
+            "title, company_name, requirements, description, "
+            "tokenize = 'porter unicode61')"
+        )
+        op.execute(
+            "INSERT INTO internship_search (rowid, title, company_name, requirements, description) "
+            "SELECT i.id, i.title, c.company_name, i.requirements, i.description "
+            "FROM internships i LEFT JOIN company_profiles c ON c.id = i.company_id "
+            "WHERE i.is_active"
+        )
+
+
+def downgrade():
+    op.execute("DROP TABLE internship_search")
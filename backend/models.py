@@ -1,8 +1,9 @@
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
+from passwords import hash_password, verify_password
+from replicas import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -16,11 +17,15 @@ class User(db.Model):
     student_profile = db.relationship('StudentProfile', backref='user', uselist=False)
     company_profile = db.relationship('CompanyProfile', backref='user', uselist=False)
     
+    __table_args__ = (
+        db.Index('ix_users_created_at', 'created_at', 'id'),
+    )
+    
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
 
 class StudentProfile(db.Model):
     __tablename__ = 'student_profiles'
@@ -43,6 +48,7 @@ class CompanyProfile(db.Model):
     description = db.Column(db.Text)
     website = db.Column(db.String(200))
     location = db.Column(db.String(200))
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     internships = db.relationship('Internship', backref='company', lazy=True)
 
@@ -57,9 +63,18 @@ class Internship(db.Model):
     stipend = db.Column(db.Float)
     last_date = db.Column(db.DateTime, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
     
     applications = db.relationship('Application', backref='internship', lazy=True)
+    
+    __table_args__ = (
+        db.Index('ix_internships_active_created', 'is_active', 'created_at', 'id'),
+        db.Index('ix_internships_company_active_created', 'company_id', 'is_active', 'created_at', 'id'),
+        db.Index('ix_internships_active_last_date', 'is_active', 'last_date'),
+        db.Index('ix_internships_created_at', 'created_at', 'id'),
+        db.Index('ix_internships_updated_at', 'updated_at'),
+    )
 
 class Application(db.Model):
     __tablename__ = 'applications'
@@ -70,7 +85,46 @@ class Application(db.Model):
     cover_letter = db.Column(db.Text)
     status = db.Column(db.String(50), default='APPLIED')
     applied_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    reminder_sent_at = db.Column(db.DateTime)
+    reminder_queued_at = db.Column(db.DateTime)
     
     __table_args__ = (
         db.UniqueConstraint('internship_id', 'student_id', name='unique_application'),
+        db.Index('ix_applications_student_applied', 'student_id', 'applied_at', 'id'),
+        db.Index('ix_applications_internship_applied', 'internship_id', 'applied_at', 'id'),
+        db.Index('ix_applications_applied_at', 'applied_at', 'id'),
+        db.Index('ix_applications_resume_path', 'resume_path'),
+    )
+
+class ResumeBlob(db.Model):
+    __tablename__ = 'resume_blobs'
+    name = db.Column(db.String(80), primary_key=True)
+    sha256 = db.Column(db.String(64), nullable=False, index=True)
+    size = db.Column(db.Integer, nullable=False)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ExportJob(db.Model):
+    __tablename__ = 'export_jobs'
+    id = db.Column(db.String(32), primary_key=True)
+    company_id = db.Column(db.Integer, db.ForeignKey('company_profiles.id'), nullable=False)
+    internship_id = db.Column(db.Integer, db.ForeignKey('internships.id'), nullable=False)
+    status = db.Column(db.String(20), default='PENDING')
+    file_count = db.Column(db.Integer)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+
+class Recommendation(db.Model):
+    __tablename__ = 'recommendations'
+    student_id = db.Column(db.Integer, db.ForeignKey('student_profiles.id'), primary_key=True)
+    internship_id = db.Column(db.Integer, db.ForeignKey('internships.id'), primary_key=True)
+    score = db.Column(db.Float, nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_recommendations_student_score', 'student_id', 'score'),
+        db.Index('ix_recommendations_computed_at', 'computed_at'),
     )
\ No newline at end of file
@@ -0,0 +1,92 @@
+import base64
+from datetime import datetime
+from flask import current_app, jsonify, request
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(sort_value, row_id):
+    raw = f"{sort_value.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = base64.urlsafe_b64decode(padded).decode().split('|')
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+
+
+def requested_fields(args=None):
+    """Field names from ?fields=a,b,c, or None when every field is wanted."""
+    args = request.args if args is None else args
+    fields = args.get('fields')
+    if not fields:
+        return None
+    return {field.strip() for field in fields.split(',') if field.strip()}
+
+
+def page_query(query, sort_column, id_column, args=None):
+    """Order newest first and apply ?limit=&cursor= to a Query or select().
+
+    Returns (query, limit). Without ?limit= the page holds
+    PAGE_SIZE_DEFAULT rows, so no request reads a whole table; clients
+    follow X-Next-Cursor for more. The query fetches one extra row so
+    page_rows() can tell whether another page follows. Raises ValueError
+    for a malformed limit or cursor.
+    """
+    args = request.args if args is None else args
+    query = query.order_by(sort_column.desc(), id_column.desc())
+
+    limit = args.get('limit')
+    cursor = args.get('cursor')
+    if limit is None:
+        limit = current_app.config['PAGE_SIZE_DEFAULT']
+    else:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError('Invalid limit')
+        if limit < 1:
+            raise ValueError('Invalid limit')
+    limit = min(limit, current_app.config['PAGE_SIZE_MAX'])
+
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            sort_column < sort_value,
+            and_(sort_column == sort_value, id_column < last_id)
+        ))
+    return query.limit(limit + 1), limit
+
+
+def page_rows(rows, limit, sort_column, id_column):
+    """Trim the extra row fetched by page_query() into (rows, next_cursor)."""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+    return rows, next_cursor
+
+
+def paginate(query, sort_column, id_column):
+    """Order newest first and apply ?limit=&cursor= keyset pagination.
+
+    Returns (rows, next_cursor); raises ValueError for a malformed limit
+    or cursor.
+    """
+    query, limit = page_query(query, sort_column, id_column)
+    return page_rows(query.all(), limit, sort_column, id_column)
+
+
+def list_response(items, next_cursor=None):
+    """JSON array response honouring ?fields= with the next cursor in a header."""
+    fields = requested_fields()
+    if fields:
+        items = [{key: value for key, value in item.items() if key in fields} for item in items]
+    response = jsonify(items)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
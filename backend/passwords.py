@@ -0,0 +1,100 @@
+"""Password hashing policy.
+
+The algorithm and its cost come from config, and hashes made under an
+older policy are reported by needs_rehash() so login can upgrade them.
+With PASSWORD_HASH_WORKERS set, hashing and verification run in a
+process pool. Request threads then wait on another core instead of
+holding their own. At most PASSWORD_HASH_MAX_PENDING jobs may be queued
+or running at once. Callers that cannot get a slot within
+PASSWORD_HASH_QUEUE_TIMEOUT get PasswordHashBusy, so a login spike
+sheds load instead of piling up.
+
+Pool workers are started by a forkserver (spawn where that is not
+available) rather than forked from the server, which may already be
+running threads holding locks a forked child would inherit.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class PasswordHashBusy(Exception):
+    pass
+
+
+_pool = None
+_pool_pid = None
+_slots = None
+_lock = threading.Lock()
+
+
+def policy_method(config=None):
+    """The werkzeug method string for the configured policy, e.g.
+    ``pbkdf2:sha256:600000`` or ``scrypt:32768:8:1``."""
+    config = config or current_app.config
+    algorithm = config['PASSWORD_HASH_ALGORITHM']
+    cost = config['PASSWORD_HASH_COST']
+    if algorithm == 'scrypt':
+        return f'scrypt:{cost}:8:1'
+    return f'{algorithm}:{cost}'
+
+
+def needs_rehash(password_hash):
+    """True if the hash was made under a different algorithm or cost."""
+    return password_hash.split('$', 1)[0] != policy_method()
+
+
+def _pool_context():
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
+
+
+def get_pool():
+    """This process's hashing pool, or None to hash inline.
+
+    The pool is created lazily and again after a fork, so each server
+    worker process gets its own.
+    """
+    global _pool, _pool_pid, _slots
+    workers = current_app.config['PASSWORD_HASH_WORKERS']
+    if not workers:
+        return None
+    with _lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context())
+            _pool_pid = os.getpid()
+            _slots = threading.BoundedSemaphore(current_app.config['PASSWORD_HASH_MAX_PENDING'])
+    return _pool
+
+
+def _run(function, *args):
+    pool = get_pool()
+    if pool is None:
+        return function(*args)
+    slots = _slots
+    if not slots.acquire(timeout=current_app.config['PASSWORD_HASH_QUEUE_TIMEOUT']):
+        raise PasswordHashBusy('Password hashing is saturated')
+    try:
+        return pool.submit(function, *args).result()
+    finally:
+        slots.release()
+
+
+def hash_password(password):
+    return _run(generate_password_hash, password, policy_method())
+
+
+def verify_password(password_hash, password):
+    return _run(check_password_hash, password_hash, password)
+
+
+def shutdown():
+    global _pool
+    with _lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown()
+        _pool = None
@@ -0,0 +1,206 @@
+import heapq
+import hmac
+import threading
+import time
+from flask import Response, current_app, g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.total += 1
+        self.sum += value
+
+
+class Metrics:
+    """In-process metrics, rendered in the Prometheus text format.
+
+    Each server process keeps its own numbers; Prometheus sums them
+    across scrape targets.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = {}
+        self.durations = {}
+        self.db_durations = {}
+        self.query_counts = {}
+        self.counters = {'serialization_seconds': {}, 'response_bytes': {}, 'db_queries': {}}
+
+    def record(self, endpoint, method, status, profile, duration, size):
+        labels = (endpoint, method)
+        with self.lock:
+            key = labels + (status,)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.durations.setdefault(labels, Histogram(DURATION_BUCKETS)).observe(duration)
+            self.db_durations.setdefault(labels, Histogram(DURATION_BUCKETS)).observe(profile['db_time'])
+            self.query_counts.setdefault(labels, Histogram(QUERY_BUCKETS)).observe(profile['queries'])
+            for name, value in (('serialization_seconds', profile['serialize_time']),
+                                ('response_bytes', size or 0),
+                                ('db_queries', profile['queries'])):
+                self.counters[name][labels] = self.counters[name].get(labels, 0) + value
+
+    def render(self):
+        lines = []
+        with self.lock:
+            lines += [
+                '# HELP internport_http_requests_total Requests handled.',
+                '# TYPE internport_http_requests_total counter',
+            ]
+            for (endpoint, method, status), count in sorted(self.requests.items()):
+                lines.append(f'internport_http_requests_total{{endpoint="{endpoint}",'
+                             f'method="{method}",status="{status}"}} {count}')
+            for name, description, histograms in (
+                ('http_request_duration_seconds', 'Wall time per request.', self.durations),
+                ('db_duration_seconds', 'Time spent executing SQL per request.', self.db_durations),
+                ('db_queries_per_request', 'SQL statements per request.', self.query_counts),
+            ):
+                lines += [f'# HELP internport_{name} {description}',
+                          f'# TYPE internport_{name} histogram']
+                for (endpoint, method), histogram in sorted(histograms.items()):
+                    labels = f'endpoint="{endpoint}",method="{method}"'
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f'internport_{name}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f'internport_{name}_bucket{{{labels},le="+Inf"}} {histogram.total}')
+                    lines.append(f'internport_{name}_sum{{{labels}}} {histogram.sum}')
+                    lines.append(f'internport_{name}_count{{{labels}}} {histogram.total}')
+            for name, description in (
+                ('serialization_seconds', 'Time spent encoding JSON responses.'),
+                ('response_bytes', 'Response body bytes sent.'),
+                ('db_queries', 'SQL statements executed.'),
+            ):
+                lines += [f'# HELP internport_{name}_total {description}',
+                          f'# TYPE internport_{name}_total counter']
+                for (endpoint, method), value in sorted(self.counters[name].items()):
+                    lines.append(f'internport_{name}_total{{endpoint="{endpoint}",'
+                                 f'method="{method}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider that adds its encoding time to the request profile."""
+
+    def dumps(self, obj, **kwargs):
+        profile = g.get('profile') if has_request_context() else None
+        if profile is None:
+            return super().dumps(obj, **kwargs)
+        started = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            profile['serialize_time'] += time.perf_counter() - started
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.profile_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, 'profile_started', None)
+    if started is None:
+        return
+    # Celery tasks and CLI commands run queries outside any request.
+    profile = g.get('profile') if has_request_context() else None
+    if profile is None:
+        return
+    elapsed = time.perf_counter() - started
+    profile['queries'] += 1
+    profile['db_time'] += elapsed
+    # Min-heap of the slowest statements so far, bounded in size.
+    statements = profile['statements']
+    if len(statements) < current_app.config['SLOW_REQUEST_MAX_STATEMENTS']:
+        heapq.heappush(statements, (elapsed, statement))
+    elif statements and elapsed > statements[0][0]:
+        heapq.heapreplace(statements, (elapsed, statement))
+
+
+class RequestProfiler:
+    """Per-request SQL count, DB time, serialization time and response size.
+
+    Numbers are aggregated per endpoint and served on /metrics to holders
+    of METRICS_TOKEN, or to anyone with METRICS_PUBLIC set. With
+    SERVER_TIMING_ENABLED each response also carries them in a
+    Server-Timing header. Requests slower than SLOW_REQUEST_MS are
+    logged along with their SLOW_REQUEST_MAX_STATEMENTS slowest statements.
+    """
+
+    def __init__(self, app=None):
+        self.metrics = Metrics()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['profiler'] = self
+        if not app.config['PROFILING_ENABLED']:
+            return
+        if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        app.json = TimedJSONProvider(app)
+        app.before_request(self.start)
+        app.after_request(self.finish)
+        app.add_url_rule('/metrics', 'metrics', self.serve_metrics)
+
+    def start(self):
+        g.profile = {
+            'started': time.perf_counter(),
+            'queries': 0,
+            'db_time': 0.0,
+            'serialize_time': 0.0,
+            'statements': [],
+        }
+
+    def finish(self, response):
+        profile = g.pop('profile', None)
+        if profile is None or request.endpoint == 'metrics':
+            return response
+        duration = time.perf_counter() - profile['started']
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        size = response.content_length if response.is_streamed else response.calculate_content_length()
+        self.metrics.record(endpoint, request.method, response.status_code, profile, duration, size)
+
+        config = current_app.config
+        if config['SERVER_TIMING_ENABLED']:
+            response.headers['Server-Timing'] = ', '.join([
+                f'db;dur={profile["db_time"] * 1000:.1f};desc="{profile["queries"]} queries"',
+                f'serialize;dur={profile["serialize_time"] * 1000:.1f}',
+                f'app;dur={duration * 1000:.1f}',
+            ])
+        if duration * 1000 >= config['SLOW_REQUEST_MS']:
+            statements = '\n'.join(
+                f'  {elapsed * 1000:8.1f}ms  {" ".join(statement.split())}'
+                for elapsed, statement in sorted(profile['statements'], reverse=True)
+            )
+            current_app.logger.warning(
+                f"Slow request {request.method} {request.full_path} took {duration * 1000:.0f}ms "
+                f"({profile['queries']} queries, {profile['db_time'] * 1000:.0f}ms in SQL):\n{statements}"
+            )
+        return response
+
+    def serve_metrics(self):
+        token = current_app.config['METRICS_TOKEN']
+        if token:
+            given = request.headers.get('Authorization', '')
+            if not hmac.compare_digest(given.encode(), f'Bearer {token}'.encode()):
+                return Response('Unauthorized\n', status=401, mimetype='text/plain')
+        elif not current_app.config['METRICS_PUBLIC']:
+            return Response('Not Found\n', status=404, mimetype='text/plain')
+        return Response(self.metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
+profiler = RequestProfiler()
@@ -0,0 +1,210 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import contains_eager
+from models import db, User, StudentProfile, CompanyProfile, Internship, Application, Recommendation
+
+
+def internships_with_company():
+    """Internship query that loads the owning company in the same SELECT."""
+    return Internship.query.outerjoin(
+        CompanyProfile, Internship.company_id == CompanyProfile.id
+    ).options(contains_eager(Internship.company))
+
+
+def applications_with_internship():
+    """Application query that loads the internship and its company in the
+    same SELECT."""
+    return Application.query.outerjoin(
+        Internship, Application.internship_id == Internship.id
+    ).outerjoin(
+        CompanyProfile, Internship.company_id == CompanyProfile.id
+    ).options(contains_eager(Application.internship).contains_eager(Internship.company))
+
+
+def applications_with_student():
+    """Application query that loads the applicant's profile in the same
+    SELECT."""
+    return Application.query.outerjoin(
+        StudentProfile, Application.student_id == StudentProfile.id
+    ).options(contains_eager(Application.student))
+
+
+def application_counts_query(internship_ids):
+    return select(
+        Application.internship_id, func.count(Application.id)
+    ).where(
+        Application.internship_id.in_(internship_ids)
+    ).group_by(Application.internship_id)
+
+
+def application_counts(internship_ids):
+    """Map internship id to its number of applications with one GROUP BY."""
+    if not internship_ids:
+        return {}
+    return dict(db.session.execute(application_counts_query(internship_ids)).all())
+
+
+def admin_user_rows():
+    """User rows with the profile display name joined in, as plain tuples."""
+    return db.session.query(
+        User.id, User.email, User.role, User.is_active, User.created_at,
+        StudentProfile.full_name, CompanyProfile.company_name
+    ).outerjoin(
+        StudentProfile, StudentProfile.user_id == User.id
+    ).outerjoin(
+        CompanyProfile, CompanyProfile.user_id == User.id
+    )
+
+
+def admin_application_rows():
+    """Application rows with internship, company and student names joined in."""
+    return db.session.query(
+        Application.id, Application.status, Application.applied_at,
+        Internship.title.label('internship_title'),
+        CompanyProfile.company_name,
+        StudentProfile.full_name.label('student_name')
+    ).outerjoin(
+        Internship, Application.internship_id == Internship.id
+    ).outerjoin(
+        CompanyProfile, Internship.company_id == CompanyProfile.id
+    ).outerjoin(
+        StudentProfile, Application.student_id == StudentProfile.id
+    )
+
+
+def internship_feed_version_query(user, now):
+    """Cheap version stamp of the internship feed the user would see.
+
+    For students: the number of active postings, counted on the
+    is_active index, catches inserts, deletes and deactivations even
+    when a row commits late with an older updated_at; the newest
+    internship and company updated_at catch edits and renames; and the
+    next upcoming deadline changes when a posting closes. A company's
+    own feed is small, so it is counted with a join.
+
+    Returned as a select() so the async read path in asgi.py computes
+    the same stamp, and so the same ETag, as the Flask views.
+    """
+    if user['role'] != 'company':
+        return select(
+            select(func.count(Internship.id)).where(Internship.is_active == True).scalar_subquery(),
+            select(func.max(Internship.updated_at)).scalar_subquery(),
+            select(func.max(CompanyProfile.updated_at)).scalar_subquery(),
+            select(func.min(Internship.last_date)).where(
+                Internship.is_active == True, Internship.last_date > now
+            ).scalar_subquery()
+        )
+    return select(
+        func.count(Internship.id),
+        func.max(Internship.updated_at),
+        func.max(CompanyProfile.updated_at),
+        func.count(Internship.id).filter(Internship.last_date > now)
+    ).outerjoin(
+        CompanyProfile, Internship.company_id == CompanyProfile.id
+    ).where(
+        Internship.is_active == True, CompanyProfile.user_id == user['user_id']
+    )
+
+
+def internship_feed_version(user, now):
+    return tuple(db.session.execute(internship_feed_version_query(user, now)).one())
+
+
+def internship_version_query(internship_id, now):
+    return select(
+        Internship.updated_at,
+        Internship.is_active,
+        Internship.last_date > now,
+        CompanyProfile.updated_at
+    ).outerjoin(
+        CompanyProfile, Internship.company_id == CompanyProfile.id
+    ).where(Internship.id == internship_id)
+
+
+def internship_version(internship_id, now):
+    row = db.session.execute(internship_version_query(internship_id, now)).first()
+    return tuple(row) if row else None
+
+
+def my_applications_version_query(user_id, now):
+    return select(
+        func.count(Application.id),
+        func.max(Application.updated_at),
+        func.max(Internship.updated_at),
+        func.max(CompanyProfile.updated_at),
+        func.count(Application.id).filter(Internship.last_date > now)
+    ).join(
+        StudentProfile, Application.student_id == StudentProfile.id
+    ).outerjoin(
+        Internship, Application.internship_id == Internship.id
+    ).outerjoin(
+        CompanyProfile, Internship.company_id == CompanyProfile.id
+    ).where(StudentProfile.user_id == user_id)
+
+
+def my_applications_version(user_id, now):
+    return tuple(db.session.execute(my_applications_version_query(user_id, now)).one())
+
+
+
+def can_read_upload(user, filename, legacy_path):
+    """Whether the token payload user may download the named upload.
+
+    Students may read their own resumes, companies the resumes attached
+    to applications for their internships, and admins everything.
+    """
+    if user['role'] == 'admin':
+        return True
+    paths = (filename, legacy_path)
+    if user['role'] == 'student':
+        profile = StudentProfile.query.filter_by(user_id=user['user_id']).first()
+        if not profile:
+            return False
+        if profile.resume_path in paths:
+            return True
+        return db.session.query(Application.query.filter(
+            Application.student_id == profile.id,
+            Application.resume_path.in_(paths)
+        ).exists()).scalar()
+    if user['role'] == 'company':
+        return db.session.query(Application.query.join(
+            Internship, Application.internship_id == Internship.id
+        ).join(
+            CompanyProfile, Internship.company_id == CompanyProfile.id
+        ).filter(
+            CompanyProfile.user_id == user['user_id'],
+            Application.resume_path.in_(paths)
+        ).exists()).scalar()
+    return False
+
+
+def recommended_internships(student_id, now, limit):
+    """[(Internship, score)] from the stored recommendations, best first.
+
+    The student's stored rows are read through their (student_id, score)
+    index first, then only those postings are loaded. Postings that closed
+    or that the student applied to since the last batch run are skipped.
+    """
+    scores = db.session.query(
+        Recommendation.internship_id, Recommendation.score
+    ).filter(
+        Recommendation.student_id == student_id
+    ).order_by(Recommendation.score.desc(), Recommendation.internship_id).all()
+    if not scores:
+        return []
+    applied = db.session.query(Application.id).filter(
+        Application.internship_id == Internship.id,
+        Application.student_id == student_id
+    ).exists()
+    internships = {
+        internship.id: internship
+        for internship in internships_with_company().filter(
+            Internship.id.in_([internship_id for internship_id, _ in scores]),
+            Internship.is_active == True,
+            Internship.last_date > now,
+            ~applied
+        )
+    }
+    return [
+        (internships[internship_id], score)
+        for internship_id, score in scores if internship_id in internships
+    ][:limit]
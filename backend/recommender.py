@@ -0,0 +1,181 @@
+"""Content-based internship recommendations.
+
+Internships and students share one TF-IDF space. An internship is
+described by its title, requirements, description and company name. A
+student is described by their major, university and year of study,
+blended with the internships they have applied to. compute_all() scores
+every student against every open internship with sparse matrix products
+in batches and stores the top k, so serving is an indexed lookup.
+"""
+import re
+import time
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+from scipy import sparse
+from flask import current_app
+from sqlalchemy import and_, delete, or_, select
+
+from models import db, StudentProfile, CompanyProfile, Internship, Application, Recommendation
+
+TOKEN = re.compile(r'[a-z0-9+#]+')
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from has have in is it of on or our the this to '
+    'we will with you your intern interns internship internships'.split()
+)
+# Terms from a field count this many times; the title and requirements say
+# more about the role than the description boilerplate does.
+INTERNSHIP_FIELD_WEIGHTS = (3, 2, 1, 1)
+PROFILE_FIELD_WEIGHTS = (2, 1, 1)
+# How much of a student's vector comes from their profile vs. their history.
+PROFILE_WEIGHT = 0.4
+HISTORY_WEIGHT = 0.6
+
+
+def terms(fields, weights):
+    counts = Counter()
+    for text, weight in zip(fields, weights):
+        for token in TOKEN.findall((text or '').lower()):
+            if len(token) > 1 and token not in STOP_WORDS:
+                counts[token] += weight
+    return counts
+
+
+def normalize_rows(matrix):
+    """Scale every row to unit L2 norm, leaving empty rows empty."""
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.csr_matrix(sparse.diags((1 / norms).astype(np.float32)) @ matrix)
+
+
+class TfidfVectorizer:
+    """Sublinear TF-IDF over pre-tokenized term counts."""
+
+    def fit(self, documents):
+        df = Counter()
+        for document in documents:
+            df.update(document.keys())
+        self.vocabulary = {term: column for column, term in enumerate(sorted(df))}
+        counts = np.array([df[term] for term in sorted(df)], dtype=np.float32)
+        self.idf = np.log((1 + len(documents)) / (1 + counts)) + 1
+        return self
+
+    def transform(self, documents):
+        rows, columns, values = [], [], []
+        for row, document in enumerate(documents):
+            for term, count in document.items():
+                column = self.vocabulary.get(term)
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+                    values.append(count)
+        matrix = sparse.csr_matrix(
+            (np.array(values, dtype=np.float32), (rows, columns)),
+            shape=(len(documents), len(self.vocabulary))
+        )
+        matrix.data = (1 + np.log(matrix.data)) * self.idf[matrix.indices]
+        return normalize_rows(matrix)
+
+
+def applied_matrix(student_ids, internship_ids):
+    """Sparse students x internships matrix with a 1 for every application."""
+    student_index = {int(student_id): row for row, student_id in enumerate(student_ids)}
+    internship_index = {int(internship_id): column for column, internship_id in enumerate(internship_ids)}
+    rows, columns = [], []
+    pairs = db.session.query(Application.student_id, Application.internship_id).execution_options(
+        yield_per=current_app.config['STREAM_BATCH_SIZE']
+    )
+    for student_id, internship_id in pairs:
+        row = student_index.get(student_id)
+        column = internship_index.get(internship_id)
+        if row is not None and column is not None:
+            rows.append(row)
+            columns.append(column)
+    return sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, columns)),
+        shape=(len(student_ids), len(internship_ids))
+    )
+
+
+def compute_all(top_k=None, batch_size=None):
+    """Recompute and store the top-k open internships for every student."""
+    top_k = top_k or current_app.config['RECOMMENDATION_TOP_K']
+    batch_size = batch_size or current_app.config['RECOMMENDATION_BATCH_SIZE']
+    started = time.perf_counter()
+    now = datetime.utcnow()
+
+    # Open internships are the candidates; closed ones someone applied to
+    # still describe that student's interests.
+    is_open = and_(Internship.is_active == True, Internship.last_date > now)
+    internships = db.session.query(
+        Internship.id, is_open, Internship.title, Internship.requirements,
+        Internship.description, CompanyProfile.company_name
+    ).outerjoin(
+        CompanyProfile, CompanyProfile.id == Internship.company_id
+    ).filter(or_(
+        is_open, Internship.id.in_(select(Application.internship_id).distinct())
+    )).order_by(Internship.id).all()
+    internship_ids = np.array([row[0] for row in internships], dtype=np.int64)
+    candidates = np.flatnonzero([bool(row[1]) for row in internships])
+    documents = [terms(row[2:], INTERNSHIP_FIELD_WEIGHTS) for row in internships]
+    del internships
+
+    students = db.session.query(
+        StudentProfile.id, StudentProfile.major, StudentProfile.university,
+        StudentProfile.year_of_study
+    ).order_by(StudentProfile.id).all()
+    student_ids = np.array([row[0] for row in students], dtype=np.int64)
+
+    stored = 0
+    if len(candidates) and len(student_ids):
+        vectorizer = TfidfVectorizer().fit(documents)
+        internship_vectors = vectorizer.transform(documents)
+        profiles = vectorizer.transform([terms(row[1:], PROFILE_FIELD_WEIGHTS) for row in students])
+        del documents, students
+
+        applied = applied_matrix(student_ids, internship_ids)
+        history = normalize_rows(applied @ internship_vectors)
+        student_vectors = normalize_rows(PROFILE_WEIGHT * profiles + HISTORY_WEIGHT * history)
+        candidate_vectors_t = internship_vectors[candidates].T.tocsc()
+        applied_candidates = applied[:, candidates]
+        k = min(top_k, len(candidates))
+
+        for start in range(0, len(student_ids), batch_size):
+            end = min(start + batch_size, len(student_ids))
+            scores = (student_vectors[start:end] @ candidate_vectors_t).toarray()
+            scores[applied_candidates[start:end].nonzero()] = 0
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            rows = np.repeat(np.arange(end - start), k)
+            columns = top.ravel()
+            values = scores[rows, columns]
+            keep = values > 0
+            chunk = [{
+                'student_id': int(student_id), 'internship_id': int(internship_id),
+                'score': float(score), 'computed_at': now
+            } for student_id, internship_id, score in zip(
+                student_ids[start:end][rows[keep]], internship_ids[candidates[columns[keep]]],
+                values[keep]
+            )]
+            db.session.execute(delete(Recommendation).where(
+                Recommendation.student_id.in_(student_ids[start:end].tolist())
+            ))
+            if chunk:
+                db.session.execute(Recommendation.__table__.insert(), chunk)
+            db.session.commit()
+            stored += len(chunk)
+
+    # Drops rows for students that no longer exist, or everything when
+    # there is nothing open to recommend.
+    db.session.execute(delete(Recommendation).where(Recommendation.computed_at < now))
+    db.session.commit()
+
+    result = {
+        'students': len(student_ids),
+        'internships': len(candidates),
+        'recommendations': stored,
+        'elapsed': round(time.perf_counter() - started, 3),
+    }
+    current_app.logger.info('Recommendations computed: %s', result)
+    return result
+
@@ -0,0 +1,199 @@
+"""Read-replica routing for db.session.
+
+With READ_REPLICA_URLS set, each replica becomes a Flask-SQLAlchemy bind
+and RoutingSession sends SELECTs to one of them when the current work
+can tolerate replication lag:
+
+- GET requests to endpoints allowed by READ_REPLICA_ENDPOINTS (every GET
+  endpoint when unset) and not listed in PRIMARY_ENDPOINTS.
+- Code running inside reads(), such as the Celery reporting tasks.
+  These accept lag even on rows they wrote themselves.
+
+Everything else stays on the primary. That covers flushes, INSERT,
+UPDATE and DELETE, raw SQL other than SELECT, and every later query in
+a request once it has written. After a successful write request, the
+user is pinned to the primary for READ_YOUR_WRITES_SECONDS, so e.g. the
+my-applications list right after applying shows the new application.
+Pins are kept in Redis when the response cache uses it, so every worker
+sees them, and otherwise in a per-process store of their own. They are
+never evicted early to make room for cached responses.
+
+The async handlers in asgi.py follow the same rules through
+endpoint_may_use_replica(), on async engines for the same replicas.
+
+Cached responses can still hold data read from a replica just before it
+caught up, for up to CACHE_TTL. Keep replica lag well below that.
+
+To try it locally, copy the SQLite file and point a replica at the copy:
+
+    cp /tmp/internport.db /tmp/replica.db
+    DATABASE_URL=sqlite:////tmp/internport.db \\
+    READ_REPLICA_URLS=sqlite:////tmp/replica.db python app.py
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import redis
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.elements import TextClause
+
+from cache import cache, RedisBackend
+import engine_profiles
+
+REPLICA_BIND_PREFIX = 'replica'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_reading = ContextVar('replica_reads', default=False)
+
+
+def binds(config):
+    """SQLALCHEMY_BINDS entries for READ_REPLICA_URLS, each with the
+    engine profile for its own URL."""
+    result = {}
+    for index, url in enumerate(config['READ_REPLICA_URLS']):
+        options = engine_profiles.engine_options(dict(config, SQLALCHEMY_DATABASE_URI=url))
+        result[f'{REPLICA_BIND_PREFIX}{index}'] = dict(options, url=url)
+    return result
+
+
+@contextmanager
+def reads():
+    """Let queries outside a request read from a replica."""
+    token = _reading.set(True)
+    try:
+        yield
+    finally:
+        _reading.reset(token)
+
+
+def _pin_key(user_id):
+    return f'internport:primary:{user_id}'
+
+
+class MemoryPins:
+    """Per-process pins. Expired pins are pruned at most once per pin
+    lifetime, so the store holds roughly the users who wrote in the last
+    READ_YOUR_WRITES_SECONDS and nothing is dropped before it expires."""
+
+    def __init__(self):
+        self.expires_at = {}
+        self.next_prune = 0
+        self.lock = threading.Lock()
+
+    def pin(self, user_id, seconds):
+        now = time.time()
+        with self.lock:
+            self.expires_at[user_id] = now + seconds
+            if now >= self.next_prune:
+                self.expires_at = {key: value for key, value in self.expires_at.items() if value > now}
+                self.next_prune = now + seconds
+
+    def pinned(self, user_id):
+        with self.lock:
+            return self.expires_at.get(user_id, 0) > time.time()
+
+
+class RedisPins:
+    def __init__(self, client):
+        self.client = client
+
+    def pin(self, user_id, seconds):
+        self.client.set(_pin_key(user_id), 1, ex=seconds)
+
+    def pinned(self, user_id):
+        return self.client.exists(_pin_key(user_id)) > 0
+
+
+_pins = None
+_pins_lock = threading.Lock()
+
+
+def pins():
+    global _pins
+    if _pins is None:
+        with _pins_lock:
+            if _pins is None:
+                backend = cache.get_backend()
+                _pins = RedisPins(backend.client) if isinstance(backend, RedisBackend) else MemoryPins()
+    return _pins
+
+
+def pinned(user_id):
+    try:
+        return pins().pinned(user_id)
+    except redis.RedisError:
+        # Cannot tell, so assume the user just wrote.
+        return True
+
+
+def pin_after_write(response):
+    user = getattr(request, 'current_user', None)
+    if request.method not in SAFE_METHODS and response.status_code < 400 and user:
+        try:
+            pins().pin(user['user_id'], current_app.config['READ_YOUR_WRITES_SECONDS'])
+        except redis.RedisError as e:
+            current_app.logger.error(f"Failed to pin user {user['user_id']} to the primary: {e}")
+    return response
+
+
+def endpoint_may_use_replica(endpoint, user):
+    """Whether a read for endpoint on behalf of user may see replica lag."""
+    config = current_app.config
+    if endpoint in config['PRIMARY_ENDPOINTS']:
+        return False
+    if config['READ_REPLICA_ENDPOINTS'] and endpoint not in config['READ_REPLICA_ENDPOINTS']:
+        return False
+    return not (user and pinned(user['user_id']))
+
+
+def request_may_use_replica():
+    if request.method not in SAFE_METHODS:
+        return False
+    return endpoint_may_use_replica(request.endpoint, getattr(request, 'current_user', None))
+
+
+def may_use_replica(session):
+    if not has_request_context():
+        return _reading.get()
+    if session.info.get('wrote'):
+        return False
+    # Decided once per request; views query only after token_required
+    # has set request.current_user.
+    if 'use_replica' not in g:
+        g.use_replica = request_may_use_replica()
+    return g.use_replica
+
+
+def is_write(clause):
+    if isinstance(clause, UpdateBase):
+        return True
+    if isinstance(clause, TextClause):
+        return not clause.text.lstrip().upper().startswith('SELECT')
+    return False
+
+
+class RoutingSession(Session):
+    """Session that reads from a replica bind when may_use_replica()."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or is_write(clause):
+                self.info['wrote'] = True
+            else:
+                replicas = [key for key in self._db.engines if key and key.startswith(REPLICA_BIND_PREFIX)]
+                if replicas and may_use_replica(self):
+                    # One replica per session, so a request never mixes
+                    # replicas that lag by different amounts.
+                    key = self.info.setdefault('replica', random.choice(replicas))
+                    return self._db.engines[key]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def init_app(app):
+    if app.config['READ_REPLICA_URLS']:
+        app.after_request(pin_after_write)
@@ -0,0 +1,142 @@
+import re
+from sqlalchemy import DDL, bindparam, event, text
+from models import db, Internship
+
+SEARCH_TABLE = 'internship_search'
+
+# Title and company name matches count for more than body text.
+SQLITE_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+    title, company_name, requirements, description,
+    tokenize = 'porter unicode61'
+)
+"""
+POSTGRES_SCHEMA = [
+    f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+    f"internship_id INTEGER PRIMARY KEY REFERENCES internships (id), document TSVECTOR NOT NULL)",
+    f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document)",
+]
+POSTGRES_DOCUMENT = """
+    setweight(to_tsvector('english', coalesce(i.title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(c.company_name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(i.requirements, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(i.description, '')), 'C')
+"""
+SQLITE_BM25_WEIGHTS = '10.0, 8.0, 3.0, 1.0'
+
+event.listen(db.metadata, 'after_create', DDL(SQLITE_SCHEMA).execute_if(dialect='sqlite'))
+for statement in POSTGRES_SCHEMA:
+    event.listen(db.metadata, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+
+
+def include_in_migrations(name, type_, parent_names):
+    """Keep autogenerate from treating the search tables as removed."""
+    return not (type_ == 'table' and name.startswith(SEARCH_TABLE))
+
+
+def dialect():
+    return db.session.get_bind().dialect.name
+
+
+def index_internships(internship_ids):
+    """(Re)index the given internships in the current transaction.
+
+    Inactive internships are dropped from the index, so this is also the
+    delete path.
+    """
+    if not internship_ids:
+        return
+    params = {'ids': list(internship_ids)}
+    if dialect() == 'postgresql':
+        db.session.execute(text(
+            f"DELETE FROM {SEARCH_TABLE} WHERE internship_id = ANY(:ids)"
+        ), params)
+        db.session.execute(text(
+            f"INSERT INTO {SEARCH_TABLE} (internship_id, document) "
+            f"SELECT i.id, {POSTGRES_DOCUMENT} FROM internships i "
+            f"LEFT JOIN company_profiles c ON c.id = i.company_id "
+            f"WHERE i.id = ANY(:ids) AND i.is_active"
+        ), params)
+    else:
+        statement = text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN :ids").bindparams(
+            bindparam('ids', expanding=True))
+        db.session.execute(statement, params)
+        statement = text(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, title, company_name, requirements, description) "
+            f"SELECT i.id, i.title, c.company_name, i.requirements, i.description FROM internships i "
+            f"LEFT JOIN company_profiles c ON c.id = i.company_id "
+            f"WHERE i.id IN :ids AND i.is_active"
+        ).bindparams(bindparam('ids', expanding=True))
+        db.session.execute(statement, params)
+
+
+def index_company(company_id):
+    """Reindex a company's postings after its name changes."""
+    ids = [row[0] for row in db.session.query(Internship.id).filter(
+        Internship.company_id == company_id, Internship.is_active == True
+    )]
+    index_internships(ids)
+
+
+def rebuild():
+    """Rebuild the whole index from the internships table."""
+    if dialect() == 'postgresql':
+        db.session.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+        db.session.execute(text(
+            f"INSERT INTO {SEARCH_TABLE} (internship_id, document) "
+            f"SELECT i.id, {POSTGRES_DOCUMENT} FROM internships i "
+            f"LEFT JOIN company_profiles c ON c.id = i.company_id WHERE i.is_active"
+        ))
+    else:
+        db.session.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+        db.session.execute(text(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, title, company_name, requirements, description) "
+            f"SELECT i.id, i.title, c.company_name, i.requirements, i.description FROM internships i "
+            f"LEFT JOIN company_profiles c ON c.id = i.company_id WHERE i.is_active"
+        ))
+    db.session.commit()
+
+
+def fts5_query(q):
+    """Turn free text into an FTS5 query: every word must match, the last
+    one as a prefix so results update while the user types."""
+    terms = re.findall(r'\w+', q)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def search_internships(q, location=None, min_stipend=None, limit=50, offset=0):
+    """Return [(internship id, rank)] for active postings, best match first."""
+    filters = ['i.is_active = :active']
+    params = {'active': True, 'limit': limit, 'offset': offset}
+    if location:
+        filters.append('lower(i.location) LIKE :location')
+        params['location'] = f'%{location.lower()}%'
+    if min_stipend is not None:
+        filters.append('i.stipend >= :min_stipend')
+        params['min_stipend'] = min_stipend
+    where = ' AND '.join(filters)
+
+    if dialect() == 'postgresql':
+        params['q'] = q
+        statement = text(
+            f"SELECT s.internship_id, ts_rank(s.document, query) AS rank "
+            f"FROM {SEARCH_TABLE} s, websearch_to_tsquery('english', :q) query, internships i "
+            f"WHERE s.document @@ query AND i.id = s.internship_id AND {where} "
+            f"ORDER BY rank DESC, s.internship_id DESC LIMIT :limit OFFSET :offset"
+        )
+    else:
+        params['q'] = fts5_query(q)
+        if params['q'] is None:
+            return []
+        # bm25() is lower-is-better; negate it so rank reads like ts_rank.
+        statement = text(
+            f"SELECT s.rowid, -bm25({SEARCH_TABLE}, {SQLITE_BM25_WEIGHTS}) AS rank "
+            f"FROM {SEARCH_TABLE} s JOIN internships i ON i.id = s.rowid "
+            f"WHERE {SEARCH_TABLE} MATCH :q AND {where} "
+            f"ORDER BY rank DESC, s.rowid DESC LIMIT :limit OFFSET :offset"
+        )
+    return [(row[0], row[1]) for row in db.session.execute(statement, params)]
@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+from flask import Response, current_app, request, stream_with_context
+from pagination import requested_fields
+
+STREAM_MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+    'json': 'application/json',
+}
+
+
+def stream_format():
+    """Pick a streaming format from the Accept header or ?stream=1.
+
+    Returns None when the client wants the regular paginated response.
+    """
+    accepted = {mimetype for mimetype, quality in request.accept_mimetypes if quality}
+    if 'application/x-ndjson' in accepted:
+        return 'ndjson'
+    if 'text/csv' in accepted:
+        return 'csv'
+    if request.args.get('stream') in ('1', 'true'):
+        return 'json'
+    return None
+
+
+def stream_response(query, serialize, fieldnames, fmt):
+    """Stream every row of query without materialising the result.
+
+    Rows are fetched from the database in STREAM_BATCH_SIZE batches and
+    written out one batch per chunk, so peak memory depends on the batch
+    size rather than on the number of rows.
+    """
+    batch_size = current_app.config['STREAM_BATCH_SIZE']
+    fields = requested_fields()
+    if fields:
+        fieldnames = [name for name in fieldnames if name in fields]
+
+    def items():
+        for row in query.yield_per(batch_size):
+            item = serialize(row)
+            if fields:
+                item = {key: value for key, value in item.items() if key in fields}
+            yield item
+
+    def batches():
+        batch = []
+        for item in items():
+            batch.append(item)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def generate_ndjson():
+        for batch in batches():
+            yield ''.join(json.dumps(item) + '\n' for item in batch)
+
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        for batch in batches():
+            writer.writerows(batch)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    def generate_json():
+        separator = '['
+        for batch in batches():
+            yield separator + ','.join(json.dumps(item) for item in batch)
+            separator = ','
+        yield '[]' if separator == '[' else ']'
+
+    generators = {'ndjson': generate_ndjson, 'csv': generate_csv, 'json': generate_json}
+    return Response(stream_with_context(generators[fmt]()), mimetype=STREAM_MIMETYPES[fmt])
@@ -0,0 +1,93 @@
+"""Shared fixtures: the Flask app on a throwaway SQLite file, no Redis.
+
+The app reads its configuration and creates the uploads folder at import
+time, so the environment is set up before app is imported.
+"""
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+WORKDIR = tempfile.mkdtemp(prefix='internport-tests-')
+os.chdir(WORKDIR)
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(WORKDIR, 'test.db')}"
+
+import app as app_module  # noqa: E402
+from app import app as flask_app  # noqa: E402
+from auth import clear_token_cache, create_token  # noqa: E402
+from cache import cache  # noqa: E402
+from models import db, User, StudentProfile, CompanyProfile, Internship, Application  # noqa: E402
+
+
+# send_from_directory resolves relative folders against the app root
+# rather than the working directory.
+app_module.UPLOAD_FOLDER = os.path.join(WORKDIR, 'uploads')
+
+
+@pytest.fixture
+def app():
+    flask_app.config.update(TESTING=True, CACHE_ENABLED=False, CACHE_REDIS_URL=None,
+                            UPLOAD_FOLDER=app_module.UPLOAD_FOLDER)
+    cache.backend = None
+    clear_token_cache()
+    with flask_app.app_context():
+        db.drop_all()
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def auth_headers(user):
+    return {'Authorization': f'Bearer {create_token(user.id, user.email, user.role)}'}
+
+
+@contextmanager
+def count_queries():
+    """Collect every statement sent to the primary engine."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+
+def seed(internships, applications_each=1):
+    """Create an admin, a student and `internships` postings, each from
+    its own company, with `applications_each` applications apiece."""
+    now = datetime.utcnow()
+    admin = User(email='admin@test', role='admin', password_hash='x')
+    db.session.add(admin)
+    students = []
+    for index in range(applications_each):
+        user = User(email=f'student{index}@test', role='student', password_hash='x')
+        students.append(StudentProfile(user=user, full_name=f'Student {index}'))
+    for index in range(internships):
+        user = User(email=f'company{index}@test', role='company', password_hash='x')
+        company = CompanyProfile(user=user, company_name=f'Company {index}')
+        internship = Internship(
+            company=company, title=f'Internship {index}', description='Build things',
+            location='Remote', stipend=1000, last_date=now + timedelta(days=30),
+            created_at=now - timedelta(minutes=index)
+        )
+        db.session.add(internship)
+        for student in students:
+            db.session.add(Application(internship=internship, student=student))
+    db.session.commit()
+    return admin, students[0].user if students else None
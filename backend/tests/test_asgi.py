@@ -0,0 +1,115 @@
+"""The async read handlers answer exactly as the Flask views do."""
+import asyncio
+import json
+from urllib.parse import urlsplit
+
+import pytest
+
+from asgi import AsyncReads
+from conftest import auth_headers, seed
+from models import User, Internship
+
+
+@pytest.fixture
+def asgi_get(app):
+    """GET through the ASGI app on its own event loop; returns
+    (status, headers, body bytes)."""
+    reads = AsyncReads(app)
+    loop = asyncio.new_event_loop()
+
+    async def get(path, headers):
+        url = urlsplit(path)
+        scope = {
+            'type': 'http', 'method': 'GET', 'path': url.path,
+            'query_string': url.query.encode(), 'headers': [
+                (name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers.items()
+            ],
+        }
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        await reads(scope, receive, send)
+        start, body = messages[0], messages[1]
+        response_headers = {name.decode().lower(): value.decode() for name, value in start['headers']}
+        return start['status'], response_headers, body['body']
+
+    yield lambda path, headers={}: loop.run_until_complete(get(path, headers))
+    if reads.engine is not None:
+        loop.run_until_complete(reads.engine.dispose())
+    loop.close()
+
+
+@pytest.fixture
+def users(app):
+    admin, student = seed(3, applications_each=2)
+    company = User.query.filter_by(role='company').order_by(User.id).first()
+    return {'admin': admin, 'student': student, 'company': company}
+
+
+def both(client, asgi_get, path, headers):
+    flask = client.get(path, headers=headers)
+    status, asgi_headers, body = asgi_get(path, headers)
+    assert status == flask.status_code
+    assert asgi_headers.get('etag') == flask.headers.get('ETag')
+    assert asgi_headers.get('x-next-cursor') == flask.headers.get('X-Next-Cursor')
+    if flask.status_code != 304:
+        assert json.loads(body) == flask.get_json()
+    return flask
+
+
+@pytest.mark.parametrize('role,path', [
+    ('student', '/api/internships'),
+    ('student', '/api/internships?limit=2'),
+    ('student', '/api/internships?fields=id,title,company_name'),
+    ('company', '/api/internships'),
+    ('student', '/api/my-applications'),
+    ('student', '/api/my-applications?limit=1'),
+    ('admin', '/api/admin/users?limit=3'),
+    ('admin', '/api/admin/internships'),
+    ('admin', '/api/admin/applications?fields=id,status'),
+])
+def test_listings_match(client, asgi_get, users, role, path):
+    response = both(client, asgi_get, path, auth_headers(users[role]))
+    assert response.status_code == 200
+
+
+def test_next_page_matches(client, asgi_get, users):
+    headers = auth_headers(users['student'])
+    cursor = client.get('/api/internships?limit=2', headers=headers).headers['X-Next-Cursor']
+    both(client, asgi_get, f'/api/internships?limit=2&cursor={cursor}', headers)
+
+
+def test_detail_matches(client, asgi_get, users):
+    internship = Internship.query.order_by(Internship.id).first()
+    both(client, asgi_get, f'/api/internships/{internship.id}', auth_headers(users['student']))
+    both(client, asgi_get, '/api/internships/9999', auth_headers(users['student']))
+
+
+def test_conditional_request_matches(client, asgi_get, users):
+    headers = auth_headers(users['student'])
+    etag = client.get('/api/internships', headers=headers).headers['ETag']
+    response = both(client, asgi_get, '/api/internships', dict(headers, **{'If-None-Match': etag}))
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize('role,path', [
+    (None, '/api/internships'),
+    ('bad', '/api/internships'),
+    ('student', '/api/admin/users'),
+    ('company', '/api/my-applications'),
+    ('student', '/api/internships?cursor=garbage'),
+])
+def test_errors_match(client, asgi_get, users, role, path):
+    if role is None:
+        headers = {}
+    elif role == 'bad':
+        headers = {'Authorization': 'Bearer not-a-token'}
+    else:
+        headers = auth_headers(users[role])
+    response = both(client, asgi_get, path, headers)
+    assert response.status_code >= 400
@@ -0,0 +1,99 @@
+"""The verified-token cache never outlives a token and stays bounded."""
+import time
+
+import jwt
+import pytest
+
+import auth
+from auth import create_token, verify_token
+
+
+@pytest.fixture
+def decodes(app, monkeypatch):
+    """Calls that reached jwt.decode, i.e. cache misses."""
+    calls = []
+    decode = jwt.decode
+
+    def counting(token, *args, **kwargs):
+        calls.append(token)
+        return decode(token, *args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, 'decode', counting)
+    return calls
+
+
+def token_for(user_id, expires_in=3600):
+    payload = {'user_id': user_id, 'email': f'user{user_id}@test', 'role': 'student',
+               'exp': int(time.time()) + expires_in}
+    return jwt.encode(payload, auth.current_app.config['JWT_SECRET_KEY'], algorithm='HS256')
+
+
+def advance_clock(monkeypatch, seconds):
+    now = time.time() + seconds
+    monkeypatch.setattr(auth.time, 'time', lambda: now)
+
+
+def test_repeat_verification_is_served_from_cache(decodes):
+    token = create_token(1, 'user1@test', 'student')
+    assert verify_token(token)['user_id'] == 1
+    assert verify_token(token)['user_id'] == 1
+    assert len(decodes) == 1
+
+
+def test_expired_token_is_not_served_from_cache(decodes, monkeypatch):
+    token = token_for(1, expires_in=60)
+    assert verify_token(token)['user_id'] == 1
+
+    advance_clock(monkeypatch, 120)
+
+    # PyJWT reads its own clock, so stand in for it past the expiry.
+    def expired(*args, **kwargs):
+        raise jwt.ExpiredSignatureError()
+
+    monkeypatch.setattr(auth.jwt, 'decode', expired)
+
+    assert verify_token(token) is None
+    assert len(auth._token_cache) == 0
+
+
+def test_cached_payload_is_rechecked_after_ttl(app, decodes, monkeypatch):
+    token = token_for(1)
+    verify_token(token)
+    advance_clock(monkeypatch, app.config['TOKEN_CACHE_TTL'] + 1)
+
+    assert verify_token(token)['user_id'] == 1
+    assert len(decodes) == 2
+
+
+def test_cache_size_is_bounded_least_recently_used_first(app, decodes, monkeypatch):
+    monkeypatch.setitem(app.config, 'TOKEN_CACHE_SIZE', 3)
+    tokens = [token_for(user_id) for user_id in range(5)]
+    for token in tokens[:3]:
+        verify_token(token)
+    verify_token(tokens[0])
+    for token in tokens[3:]:
+        verify_token(token)
+
+    assert len(auth._token_cache) == 3
+    # tokens[0] was used again, so tokens[1] and tokens[2] went first.
+    del decodes[:]
+    for token in (tokens[0], tokens[3], tokens[4]):
+        verify_token(token)
+    assert decodes == []
+    verify_token(tokens[1])
+    assert decodes == [tokens[1]]
+
+
+def test_zero_size_disables_cache(app, decodes, monkeypatch):
+    monkeypatch.setitem(app.config, 'TOKEN_CACHE_SIZE', 0)
+    token = token_for(1)
+    verify_token(token)
+    verify_token(token)
+    assert len(decodes) == 2
+    assert len(auth._token_cache) == 0
+
+
+def test_invalid_token_is_not_cached(decodes):
+    assert verify_token('not-a-token') is None
+    assert verify_token('not-a-token') is None
+    assert len(decodes) == 2
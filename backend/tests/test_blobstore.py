@@ -0,0 +1,69 @@
+"""Content-addressed resume storage and its garbage collection."""
+import io
+import os
+from datetime import datetime, timedelta
+
+from werkzeug.datastructures import FileStorage
+
+from blobstore import blob_directory, collect_garbage, release, store_resume
+from models import db, ResumeBlob
+
+
+def upload(data):
+    return FileStorage(io.BytesIO(data), filename='resume.pdf')
+
+
+def blob_path(name):
+    return os.path.join(blob_directory(name), name)
+
+
+def test_same_bytes_share_one_blob(app):
+    name, _, created = store_resume(upload(b'shared resume'), 'pdf')
+    db.session.commit()
+    again, _, created_again = store_resume(upload(b'shared resume'), 'pdf')
+    db.session.commit()
+
+    assert (created, created_again) == (True, False)
+    assert again == name
+    assert db.session.get(ResumeBlob, name).ref_count == 2
+    assert os.path.exists(blob_path(name))
+
+
+def test_rollback_removes_new_file(app):
+    name, _, created = store_resume(upload(b'abandoned resume'), 'pdf')
+    assert created and os.path.exists(blob_path(name))
+    db.session.rollback()
+
+    assert db.session.get(ResumeBlob, name) is None
+    assert not os.path.exists(blob_path(name))
+
+
+def test_reference_restores_file_removed_by_collector(app):
+    name, _, _ = store_resume(upload(b'collected resume'), 'pdf')
+    db.session.commit()
+    release(name)
+    db.session.commit()
+    # The collector removed the file but its row delete has not landed.
+    os.remove(blob_path(name))
+
+    again, _, created = store_resume(upload(b'collected resume'), 'pdf')
+    db.session.commit()
+    assert (again, created) == (name, False)
+    assert os.path.exists(blob_path(name))
+
+
+def test_collect_garbage_removes_unreferenced_blobs(app):
+    kept, _, _ = store_resume(upload(b'kept resume'), 'pdf')
+    dropped, _, _ = store_resume(upload(b'dropped resume'), 'pdf')
+    db.session.commit()
+    release(dropped)
+    db.session.query(ResumeBlob).update(
+        {'updated_at': datetime.utcnow() - timedelta(seconds=app.config['BLOB_GC_GRACE'] + 1)},
+        synchronize_session=False
+    )
+    db.session.commit()
+
+    assert collect_garbage() == 1
+    assert db.session.get(ResumeBlob, dropped) is None
+    assert not os.path.exists(blob_path(dropped))
+    assert os.path.exists(blob_path(kept))
@@ -0,0 +1,79 @@
+"""Bulk application status changes are all-or-nothing and run as one
+UPDATE."""
+import pytest
+
+import app as app_module
+from conftest import auth_headers, count_queries, seed
+from models import db, Application, Internship
+
+
+@pytest.fixture
+def postings(app, monkeypatch):
+    """Two companies with three applications each, plus the notification
+    jobs that were queued."""
+    seed(2, applications_each=3)
+    notified = []
+    monkeypatch.setattr(app_module, 'enqueue', lambda name, *args: notified.append((name, *args)) or 'task')
+
+    def applications_of(title):
+        internship = Internship.query.filter_by(title=title).one()
+        return internship.company.user, sorted(application.id for application in internship.applications)
+
+    return applications_of('Internship 0'), applications_of('Internship 1'), notified
+
+
+def bulk_status(client, company, application_ids, status='SHORTLISTED'):
+    return client.put(
+        '/api/applications/status/bulk', json={'application_ids': application_ids, 'status': status},
+        headers=auth_headers(company)
+    )
+
+
+def statuses(application_ids):
+    db.session.expire_all()
+    return [db.session.get(Application, application_id).status for application_id in application_ids]
+
+
+def test_updates_in_one_statement(client, postings):
+    (company, ids), _, notified = postings
+    with count_queries() as statements:
+        response = bulk_status(client, company, ids)
+    assert response.status_code == 200
+    assert response.get_json() == {'updated': 3, 'unchanged': 0, 'notifications_queued': True}
+
+    updates = [statement for statement in statements if statement.lstrip().upper().startswith('UPDATE')]
+    assert len(updates) == 1
+    assert statuses(ids) == ['SHORTLISTED'] * 3
+    assert notified == [('internport.notify_status_change', ids, 'SHORTLISTED')]
+
+
+def test_another_companys_application_is_forbidden(client, postings):
+    (company, ids), (_, foreign_ids), notified = postings
+    response = bulk_status(client, company, ids + foreign_ids[:1])
+    assert response.status_code == 403
+    assert response.get_json()['application_ids'] == foreign_ids[:1]
+    # Nothing is applied, not even to the company's own applications.
+    assert statuses(ids + foreign_ids) == ['APPLIED'] * 6
+    assert notified == []
+
+
+def test_only_changed_rows_are_counted(client, postings):
+    (company, ids), _, notified = postings
+    db.session.get(Application, ids[0]).status = 'SHORTLISTED'
+    db.session.commit()
+
+    response = bulk_status(client, company, ids)
+    assert response.get_json() == {'updated': 2, 'unchanged': 1, 'notifications_queued': True}
+    assert notified == [('internport.notify_status_change', ids[1:], 'SHORTLISTED')]
+
+
+@pytest.mark.parametrize('body,error', [
+    ({'application_ids': [True], 'status': 'SHORTLISTED'}, 'application_ids must be a non-empty list of ids'),
+    ({'application_ids': [], 'status': 'SHORTLISTED'}, 'application_ids must be a non-empty list of ids'),
+    ({'application_ids': [1], 'status': 'HIRED'}, 'Invalid status'),
+])
+def test_invalid_requests_are_rejected(client, postings, body, error):
+    (company, _), _, _ = postings
+    response = client.put('/api/applications/status/bulk', json=body, headers=auth_headers(company))
+    assert response.status_code == 400
+    assert response.get_json()['error'] == error
@@ -0,0 +1,85 @@
+"""Response cache on the in-process fallback, without Redis."""
+from datetime import timedelta
+
+import pytest
+
+from cache import MemoryBackend, cache
+from conftest import auth_headers, count_queries, seed
+from models import db, User, Internship
+
+
+@pytest.fixture
+def cached_app(app):
+    app.config['CACHE_ENABLED'] = True
+    yield app
+    app.config['CACHE_ENABLED'] = False
+
+
+def test_falls_back_to_memory_backend(cached_app):
+    assert isinstance(cache.get_backend(), MemoryBackend)
+
+
+def test_feed_is_served_from_cache(cached_app, client):
+    _, student = seed(5)
+    headers = auth_headers(student)
+    first = client.get('/api/internships', headers=headers)
+    with count_queries() as statements:
+        second = client.get('/api/internships', headers=headers)
+    assert second.get_json() == first.get_json()
+    # Only the ETag's version query runs; the listing comes from the cache.
+    assert len(statements) == 1
+
+
+def test_update_invalidates_feed(cached_app, client):
+    _, student = seed(1)
+    company = User.query.filter_by(role='company').one()
+    internship_id = client.get('/api/internships', headers=auth_headers(student)).get_json()[0]['id']
+
+    response = client.put(f'/api/internships/{internship_id}', json={'title': 'Renamed'},
+                          headers=auth_headers(company))
+    assert response.status_code == 200
+
+    feed = client.get('/api/internships', headers=auth_headers(student)).get_json()
+    assert feed[0]['title'] == 'Renamed'
+
+
+def test_memory_backend_expires_and_evicts():
+    backend = MemoryBackend(max_entries=2)
+    backend.set('a', 1, 60)
+    backend.set('b', 2, 60)
+    backend.get('a')
+    backend.set('c', 3, 60)
+    assert backend.get('b') is None
+    assert backend.get('a') == 1
+
+    backend.set('short', 4, -1)
+    assert backend.get('short') is None
+
+
+def test_students_share_cached_feed(cached_app, client):
+    seed(5, applications_each=2)
+    first, second = User.query.filter_by(role='student').order_by(User.id).all()
+    response = client.get('/api/internships', headers=auth_headers(first))
+    with count_queries() as statements:
+        shared = client.get('/api/internships', headers=auth_headers(second))
+    assert shared.get_json() == response.get_json()
+    assert shared.headers['ETag'] == response.headers['ETag']
+    assert len(statements) == 1
+
+
+def test_late_insert_with_older_timestamp_changes_feed_etag(cached_app, client):
+    _, student = seed(3)
+    headers = auth_headers(student)
+    before = client.get('/api/internships', headers=headers)
+    existing = Internship.query.first()
+    late = Internship(
+        company_id=existing.company_id, title='Late', description='Committed late',
+        last_date=existing.last_date, created_at=existing.created_at - timedelta(days=1),
+        updated_at=existing.updated_at - timedelta(days=1)
+    )
+    db.session.add(late)
+    db.session.commit()
+
+    after = client.get('/api/internships', headers=dict(headers, **{'If-None-Match': before.headers['ETag']}))
+    assert after.status_code == 200
+    assert 'Late' in [item['title'] for item in after.get_json()]
@@ -0,0 +1,68 @@
+"""Upload downloads and the scoped ?token= links for them."""
+import os
+
+import pytest
+
+from auth import create_download_token
+from conftest import auth_headers, seed
+from models import db, User, Application, Internship
+
+
+@pytest.fixture
+def resume(app):
+    _, student = seed(2)
+    filename = 'resume-test.pdf'
+    with open(os.path.join(app.config['UPLOAD_FOLDER'], filename), 'wb') as f:
+        f.write(b'%PDF resume')
+    owner = Internship.query.order_by(Internship.id).first()
+    # Only the first company received this resume.
+    application = Application.query.filter_by(internship_id=owner.id).one()
+    application.resume_path = filename
+    db.session.commit()
+    companies = User.query.filter_by(role='company').order_by(User.id).all()
+    return student, companies, filename
+
+
+def payload(user):
+    return {'user_id': user.id, 'email': user.email, 'role': user.role}
+
+
+def test_issued_link_downloads(client, resume):
+    student, _, filename = resume
+    response = client.post('/api/download-tokens', json={'path': f'/uploads/{filename}'},
+                           headers=auth_headers(student))
+    assert response.status_code == 200
+    assert client.get(response.get_json()['url']).data == b'%PDF resume'
+
+
+@pytest.mark.parametrize('body', [{'path': 5}, {'path': None}, {}, ['/uploads/x'], {'path': '/api/profile'}])
+def test_rejects_bad_paths(client, resume, body):
+    student, _, _ = resume
+    response = client.post('/api/download-tokens', json=body, headers=auth_headers(student))
+    assert response.status_code == 400
+
+
+def test_token_is_bound_to_its_path(app, client, resume):
+    student, _, filename = resume
+    token = create_download_token(payload(student), '/uploads/other.pdf')
+    assert client.get(f'/uploads/{filename}?token={token}').status_code == 401
+
+
+def test_download_token_is_not_a_session_token(app, client, resume):
+    student, _, filename = resume
+    token = create_download_token(payload(student), f'/uploads/{filename}')
+    headers = {'Authorization': f'Bearer {token}'}
+    assert client.get('/api/profile', headers=headers).status_code == 401
+    assert client.get(f'/uploads/{filename}', headers=headers).status_code == 401
+
+
+def test_session_token_is_not_accepted_in_query(client, resume):
+    student, _, filename = resume
+    token = auth_headers(student)['Authorization'].split(' ')[1]
+    assert client.get(f'/uploads/{filename}?token={token}').status_code == 401
+
+
+def test_unrelated_company_is_denied(client, resume):
+    _, (owner, unrelated), filename = resume
+    assert client.get(f'/uploads/{filename}', headers=auth_headers(owner)).status_code == 200
+    assert client.get(f'/uploads/{filename}', headers=auth_headers(unrelated)).status_code == 403
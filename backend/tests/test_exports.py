@@ -0,0 +1,106 @@
+"""Background resume exports: queueing, status, owner-only download and
+retention."""
+import io
+import os
+import zipfile
+from datetime import datetime, timedelta
+
+import pytest
+
+import app as app_module
+import celery_worker
+from conftest import auth_headers, seed
+from models import db, User, Application, Internship, ExportJob
+
+
+@pytest.fixture
+def export(app, monkeypatch):
+    """The first company's posting with one applicant resume on disk, and
+    the ids of export jobs queued for it."""
+    seed(2)
+    with open(os.path.join(app.config['UPLOAD_FOLDER'], 'export-test.pdf'), 'wb') as f:
+        f.write(b'%PDF export')
+    internship = Internship.query.order_by(Internship.id).first()
+    Application.query.filter_by(internship_id=internship.id).one().resume_path = 'export-test.pdf'
+    db.session.commit()
+
+    queued = []
+    monkeypatch.setattr(app_module, 'enqueue', lambda name, job_id: queued.append(job_id) or 'task')
+    companies = User.query.filter_by(role='company').order_by(User.id).all()
+    return companies, internship, queued
+
+
+def start(client, company, internship):
+    return client.post(f'/api/internships/{internship.id}/resume-export', headers=auth_headers(company))
+
+
+def status(client, company, job_id):
+    return client.get(f'/api/resume-exports/{job_id}', headers=auth_headers(company))
+
+
+def run(job_id):
+    celery_worker.export_resumes(job_id)
+    db.session.expire_all()
+
+
+def test_unavailable_queue_fails_the_job(client, export, monkeypatch):
+    (owner, _), internship, _ = export
+    monkeypatch.setattr(app_module, 'enqueue', lambda name, job_id: None)
+
+    response = start(client, owner, internship)
+    assert response.status_code == 503
+    job = ExportJob.query.one()
+    assert (job.status, job.error) == ('FAILED', 'Task queue unavailable')
+
+
+def test_job_runs_from_pending_to_download(client, export):
+    (owner, _), internship, queued = export
+    response = start(client, owner, internship)
+    assert response.status_code == 202
+    job_id = response.get_json()['job_id']
+    assert queued == [job_id]
+    assert status(client, owner, job_id).get_json()['status'] == 'PENDING'
+
+    run(job_id)
+    data = status(client, owner, job_id).get_json()
+    assert (data['status'], data['file_count']) == ('DONE', 1)
+    assert data['finished_at'] is not None
+
+    download = client.get(data['download_url'])
+    assert download.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(download.data)) as archive:
+        [name] = archive.namelist()
+        assert name.startswith('Student_0_') and archive.read(name) == b'%PDF export'
+
+
+def test_other_company_cannot_see_or_download(client, export):
+    (owner, other), internship, _ = export
+    assert start(client, other, internship).status_code == 403
+
+    job_id = start(client, owner, internship).get_json()['job_id']
+    run(job_id)
+    assert status(client, other, job_id).status_code == 404
+    download = client.get(f'/api/resume-exports/{job_id}/download', headers=auth_headers(other))
+    assert download.status_code == 404
+
+
+def test_finished_exports_expire_after_retention(app, client, export):
+    (owner, _), internship, _ = export
+    old_id = start(client, owner, internship).get_json()['job_id']
+    new_id = start(client, owner, internship).get_json()['job_id']
+    run(old_id)
+    run(new_id)
+    db.session.get(ExportJob, old_id).finished_at = (
+        datetime.utcnow() - timedelta(seconds=app.config['EXPORT_RETENTION'] + 60)
+    )
+    db.session.commit()
+
+    assert celery_worker.expire_exports() == 1
+    assert not os.path.exists(celery_worker.export_path(old_id))
+    assert os.path.exists(celery_worker.export_path(new_id))
+
+    data = status(client, owner, old_id).get_json()
+    assert data['status'] == 'EXPIRED' and 'download_url' not in data
+    download = client.get(f'/api/resume-exports/{old_id}/download', headers=auth_headers(owner))
+    assert download.status_code == 404
+    assert celery_worker.expire_exports() == 0
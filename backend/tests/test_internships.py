@@ -0,0 +1,105 @@
+"""Internship updates go through the same validation as creates."""
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import auth_headers, seed
+from models import db, User, Internship
+
+
+@pytest.fixture
+def posting(app):
+    seed(1)
+    company = User.query.filter_by(role='company').one()
+    return company, Internship.query.one()
+
+
+def update(client, company, internship, data):
+    return client.put(f'/api/internships/{internship.id}', json=data, headers=auth_headers(company))
+
+
+def test_partial_update_keeps_other_fields(client, posting):
+    company, internship = posting
+    response = update(client, company, internship, {'stipend': '1500', 'location': None})
+    assert response.status_code == 200
+
+    db.session.refresh(internship)
+    assert internship.stipend == 1500.0
+    assert internship.location == ''
+    assert internship.title == 'Internship 0'
+
+
+@pytest.mark.parametrize('data,error', [
+    ({'stipend': 'lots'}, 'stipend must be a number'),
+    ({'title': ''}, 'title is required'),
+    ({'location': 5}, 'location must be a string'),
+    ({'last_date': '2000-01-01'}, 'Last date must be in the future'),
+])
+def test_invalid_update_is_rejected(client, posting, data, error):
+    company, internship = posting
+    response = update(client, company, internship, data)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == error
+
+
+def posting_data(title):
+    last_date = (datetime.utcnow() + timedelta(days=30)).strftime('%Y-%m-%d')
+    return {'title': title, 'description': 'Build things', 'last_date': last_date}
+
+
+def bulk(client, company, data=None, **kwargs):
+    return client.post('/api/internships/bulk', json=data, headers=auth_headers(company), **kwargs)
+
+
+def test_bulk_create_maps_ids_back_in_input_order(app, client, posting):
+    company, _ = posting
+    app.config['BULK_INSERT_BATCH_SIZE'] = 2
+    items = [posting_data(f'Bulk {index}') for index in range(5)]
+
+    response = bulk(client, company, items)
+    assert response.status_code == 201
+    results = response.get_json()['results']
+    assert [result['index'] for result in results] == list(range(5))
+    for item, result in zip(items, results):
+        assert result['status'] == 'created'
+        assert db.session.get(Internship, result['id']).title == item['title']
+
+
+def test_bulk_accepts_ndjson(client, posting):
+    company, internship = posting
+    lines = [posting_data('From NDJSON'), {'id': internship.id, 'stipend': 2500}]
+    body = '\n'.join(json.dumps(line) for line in lines) + '\n\n'
+
+    response = client.post(
+        '/api/internships/bulk', data=body, content_type='application/x-ndjson',
+        headers=auth_headers(company)
+    )
+    assert response.status_code == 201
+    data = response.get_json()
+    assert (data['created'], data['updated']) == (1, 1)
+    assert db.session.get(Internship, data['results'][0]['id']).title == 'From NDJSON'
+    db.session.refresh(internship)
+    assert internship.stipend == 2500.0
+
+
+def test_bulk_reports_bad_ndjson_line(client, posting):
+    company, _ = posting
+    body = json.dumps(posting_data('Fine')) + '\n{not json\n'
+    response = client.post(
+        '/api/internships/bulk', data=body, content_type='application/x-ndjson',
+        headers=auth_headers(company)
+    )
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Line 2 is not valid JSON'
+
+
+@pytest.mark.parametrize('bad_id', [True, False])
+def test_bulk_rejects_bool_id(client, posting, bad_id):
+    company, internship = posting
+    # The posting's id is 1, which True would otherwise compare equal to.
+    response = bulk(client, company, [{'id': bad_id, 'title': 'Hijacked'}])
+    assert response.status_code == 400
+    assert response.get_json()['results'][0]['error'] == 'id must be an integer'
+    db.session.refresh(internship)
+    assert internship.title == 'Internship 0'
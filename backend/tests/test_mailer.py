@@ -0,0 +1,80 @@
+"""Mailer against a local aiosmtpd server."""
+import socket
+
+import pytest
+
+aiosmtpd = pytest.importorskip('aiosmtpd.controller')
+
+from mailer import Mailer  # noqa: E402
+
+
+class Handler:
+    """Refuses bad@ for good, busy@ once with a 4xx, accepts the rest."""
+
+    def __init__(self):
+        self.attempts = {}
+        self.delivered = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        self.attempts[address] = self.attempts.get(address, 0) + 1
+        if address.startswith('bad@'):
+            return '550 No such user'
+        if address.startswith('busy@') and self.attempts[address] == 1:
+            return '451 Try again later'
+        envelope.rcpt_tos.append(address)
+        return '250 OK'
+
+    async def handle_DATA(self, server, session, envelope):
+        self.delivered.extend(envelope.rcpt_tos)
+        return '250 Message accepted'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp():
+    handler = Handler()
+    controller = aiosmtpd.Controller(handler, hostname='127.0.0.1', port=free_port())
+    controller.start()
+    yield handler, controller
+    controller.stop()
+
+
+def make_mailer(controller, **kwargs):
+    return Mailer(host=controller.hostname, port=controller.port, backoff=0, timeout=5, **kwargs)
+
+
+def test_batch_reuses_connections_and_reports(smtp):
+    handler, controller = smtp
+    messages = [(f'student{i}@test', 'Reminder', 'Deadline soon') for i in range(25)]
+    report = make_mailer(controller, workers=2, chunk_size=10).send_batch(messages, name='test')
+    assert report['sent'] == 25
+    assert report['failed'] == 0
+    assert sorted(handler.delivered) == sorted(to for to, _, _ in messages)
+
+
+def test_permanent_refusal_is_not_retried(smtp):
+    handler, controller = smtp
+    results = make_mailer(controller).send_chunk([
+        ('bad@test', 'Reminder', 'Deadline soon'),
+        ('ok@test', 'Reminder', 'Deadline soon'),
+    ])
+    assert results == [False, True]
+    assert handler.attempts['bad@test'] == 1
+    assert handler.delivered == ['ok@test']
+
+
+def test_temporary_refusal_is_retried(smtp):
+    handler, controller = smtp
+    results = make_mailer(controller).send_chunk([('busy@test', 'Reminder', 'Deadline soon')])
+    assert results == [True]
+    assert handler.attempts['busy@test'] == 2
+
+
+def test_unreachable_server_gives_up_after_retries():
+    mailer = Mailer(host='127.0.0.1', port=free_port(), backoff=0, timeout=1, max_retries=2)
+    assert mailer.send_chunk([('ok@test', 'Reminder', 'Deadline soon')]) == [False]
@@ -0,0 +1,17 @@
+"""List endpoints page by default and hand out a cursor for the rest."""
+from conftest import auth_headers, seed
+
+
+def test_feed_defaults_to_one_page(app, client):
+    _, student = seed(app.config['PAGE_SIZE_DEFAULT'] + 10)
+    headers = auth_headers(student)
+
+    first = client.get('/api/internships', headers=headers)
+    assert len(first.get_json()) == app.config['PAGE_SIZE_DEFAULT']
+    cursor = first.headers['X-Next-Cursor']
+
+    second = client.get(f'/api/internships?cursor={cursor}', headers=headers)
+    assert len(second.get_json()) == 10
+    assert 'X-Next-Cursor' not in second.headers
+    ids = [item['id'] for item in first.get_json() + second.get_json()]
+    assert len(set(ids)) == len(ids)
@@ -0,0 +1,25 @@
+"""Password hashing inline and in the process pool."""
+import passwords
+
+
+def test_pool_hashes_and_verifies(app):
+    workers = app.config['PASSWORD_HASH_WORKERS']
+    app.config['PASSWORD_HASH_WORKERS'] = 2
+    try:
+        password_hash = passwords.hash_password('secret')
+        assert passwords.verify_password(password_hash, 'secret')
+        assert not passwords.verify_password(password_hash, 'wrong')
+        assert passwords.get_pool()._mp_context.get_start_method() != 'fork'
+    finally:
+        passwords.shutdown()
+        app.config['PASSWORD_HASH_WORKERS'] = workers
+
+
+def test_needs_rehash_after_policy_change(app):
+    password_hash = passwords.hash_password('secret')
+    assert not passwords.needs_rehash(password_hash)
+    app.config['PASSWORD_HASH_COST'] += 1
+    try:
+        assert passwords.needs_rehash(password_hash)
+    finally:
+        app.config['PASSWORD_HASH_COST'] -= 1
@@ -0,0 +1,46 @@
+"""Per-request SQL profiling."""
+import time
+from types import SimpleNamespace
+
+from flask import g
+
+import profiling
+
+
+def run_statement(name, elapsed):
+    context = SimpleNamespace(profile_started=time.perf_counter() - elapsed)
+    profiling._after_cursor_execute(None, None, name, None, context, False)
+
+
+def test_keeps_the_slowest_statements(app):
+    limit = app.config['SLOW_REQUEST_MAX_STATEMENTS']
+    app.config['SLOW_REQUEST_MAX_STATEMENTS'] = 3
+    try:
+        with app.test_request_context('/'):
+            profiling.profiler.start()
+            for index, elapsed in enumerate([0.001, 0.5, 0.002, 0.3, 0.003, 0.9, 0.004]):
+                run_statement(f'SELECT {index}', elapsed)
+            kept = sorted(g.profile['statements'], reverse=True)
+            assert [statement for _, statement in kept] == ['SELECT 5', 'SELECT 1', 'SELECT 3']
+            assert g.profile['queries'] == 7
+    finally:
+        app.config['SLOW_REQUEST_MAX_STATEMENTS'] = limit
+
+
+def test_metrics_are_off_without_a_token(app, client):
+    assert client.get('/metrics').status_code == 404
+
+
+def test_metrics_require_the_token(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, 'METRICS_TOKEN', 'scrape-secret')
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+
+    response = client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'})
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+
+
+def test_metrics_can_be_made_public(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, 'METRICS_PUBLIC', True)
+    assert client.get('/metrics').status_code == 200
@@ -0,0 +1,56 @@
+"""The list endpoints must not issue a query per row."""
+import pytest
+
+from conftest import auth_headers, count_queries, seed
+
+ENDPOINTS = [
+    ('student', '/api/internships?limit=100'),
+    ('student', '/api/my-applications?limit=100'),
+    ('admin', '/api/admin/users?limit=100'),
+    ('admin', '/api/admin/internships?limit=100'),
+    ('admin', '/api/admin/applications?limit=100'),
+]
+
+
+def statements_for(client, role, path, rows):
+    admin, student = seed(rows)
+    user = admin if role == 'admin' else student
+    headers = auth_headers(user)
+    with count_queries() as statements:
+        response = client.get(path, headers=headers)
+    assert response.status_code == 200
+    assert len(response.get_json()) >= rows
+    return len(statements)
+
+
+@pytest.mark.parametrize('role,path', ENDPOINTS)
+def test_query_count_does_not_grow_with_rows(app, client, role, path):
+    from models import db
+
+    few = statements_for(client, role, path, 2)
+    db.drop_all()
+    db.create_all()
+    many = statements_for(client, role, path, 20)
+    assert many == few
+
+
+def company_applications_statements(client, applicants):
+    from models import User, Internship
+
+    seed(1, applications_each=applicants)
+    company = User.query.filter_by(role='company').one()
+    internship = Internship.query.one()
+    with count_queries() as statements:
+        response = client.get(f'/api/applications/{internship.id}?limit=100', headers=auth_headers(company))
+    assert response.status_code == 200
+    assert len(response.get_json()) == applicants
+    return len(statements)
+
+
+def test_company_applications_query_count_does_not_grow(app, client):
+    from models import db
+
+    few = company_applications_statements(client, 2)
+    db.drop_all()
+    db.create_all()
+    assert company_applications_statements(client, 20) == few
@@ -0,0 +1,115 @@
+"""TF-IDF weighting and the stored ranking on small hand-checked data."""
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+import recommender
+from conftest import auth_headers
+from models import db, User, StudentProfile, CompanyProfile, Internship, Application, Recommendation
+
+
+def test_terms_weight_fields_and_drop_stop_words():
+    counts = recommender.terms(['Python intern', 'python and SQL', None], (3, 2, 1))
+    assert counts == {'python': 5, 'sql': 2}
+
+
+def test_tfidf_is_sublinear_and_unit_length():
+    documents = [{'python': 3, 'django': 1}, {'python': 1}]
+    vectorizer = recommender.TfidfVectorizer().fit(documents)
+    assert vectorizer.vocabulary == {'django': 0, 'python': 1}
+
+    vectors = vectorizer.transform(documents).toarray()
+    # idf = ln((1 + n) / (1 + df)) + 1, tf = 1 + ln(count)
+    django = math.log(3 / 2) + 1
+    python = 1 + math.log(3)
+    norm = math.hypot(django, python)
+    assert np.allclose(vectors[0], [django / norm, python / norm])
+    assert np.allclose(vectors[1], [0, 1])
+
+
+@pytest.fixture
+def postings(app):
+    """One company's open and closed postings, keyed by a short name."""
+    now = datetime.utcnow()
+    company = CompanyProfile(
+        user=User(email='company@test', role='company', password_hash='x'), company_name='Acme'
+    )
+    specs = {
+        'python': ('Python developer', 'python django', 30),
+        'java': ('Java engineer', 'java spring', 30),
+        'data': ('Data analyst', 'python pandas sql', 30),
+        'closed': ('Python backend', 'python django', -1),
+    }
+    postings = {}
+    for name, (title, requirements, days) in specs.items():
+        postings[name] = Internship(
+            company=company, title=title, requirements=requirements, description='',
+            last_date=now + timedelta(days=days)
+        )
+        db.session.add(postings[name])
+    db.session.commit()
+    return postings
+
+
+def add_student(major, applied_to=()):
+    user = User(email=f'{major.lower()}@test', role='student', password_hash='x')
+    student = StudentProfile(user=user, full_name=major, major=major)
+    db.session.add(student)
+    for internship in applied_to:
+        db.session.add(Application(internship=internship, student=student))
+    db.session.commit()
+    return student
+
+
+def stored(student):
+    return [
+        (row.internship_id, row.score) for row in Recommendation.query.filter_by(
+            student_id=student.id
+        ).order_by(Recommendation.score.desc())
+    ]
+
+
+def test_profile_only_score_is_cosine_similarity(postings):
+    student = add_student('Java')
+    recommender.compute_all()
+
+    # Nobody applied, so only the three open postings are fitted. The Java
+    # posting counts java 3 + 2, engineer 3, spring 2 and acme 1; the
+    # student's vector is the java term alone.
+    def idf(df):
+        return math.log((1 + 3) / (1 + df)) + 1
+
+    java = (1 + math.log(5)) * idf(1)
+    engineer = (1 + math.log(3)) * idf(1)
+    spring = (1 + math.log(2)) * idf(1)
+    acme = 1 * idf(3)
+    expected = java / math.sqrt(java ** 2 + engineer ** 2 + spring ** 2 + acme ** 2)
+
+    [(internship_id, score)] = stored(student)
+    assert internship_id == postings['java'].id
+    assert score == pytest.approx(expected, rel=1e-5)
+
+
+def test_history_ranks_similar_postings_and_skips_applied(client, postings):
+    student = add_student('Statistics', applied_to=[postings['python']])
+    recommender.compute_all()
+
+    ranked = [internship_id for internship_id, _ in stored(student)]
+    # Data shares python with the application; Java only shares the
+    # company. The applied and closed postings are never recommended.
+    assert ranked == [postings['data'].id, postings['java'].id]
+
+    response = client.get('/api/recommendations', headers=auth_headers(student.user))
+    assert [item['id'] for item in response.get_json()] == ranked
+
+
+def test_recompute_replaces_previous_rows(postings):
+    student = add_student('Java')
+    recommender.compute_all()
+    postings['java'].is_active = False
+    db.session.commit()
+
+    recommender.compute_all()
+    assert stored(student) == []
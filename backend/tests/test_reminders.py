@@ -0,0 +1,42 @@
+"""Deadline reminders are queued once per application."""
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip('celery')
+
+import celery_worker  # noqa: E402
+from conftest import seed  # noqa: E402
+from models import db, Application, Internship  # noqa: E402
+
+
+@pytest.fixture
+def queued(app, monkeypatch):
+    chunks = []
+    monkeypatch.setattr(celery_worker.send_reminder_chunk, 'delay', chunks.append)
+    seed(3, applications_each=2)
+    db.session.query(Internship).update({'last_date': datetime.utcnow() + timedelta(hours=12)})
+    db.session.commit()
+    return chunks
+
+
+def test_second_run_does_not_queue_again(queued):
+    assert celery_worker.send_deadline_reminders() == 1
+    assert celery_worker.send_deadline_reminders() == 0
+    assert len(queued) == 1
+    assert len(queued[0]) == 6
+
+
+def test_claimed_rows_are_skipped_by_a_concurrent_scan(app, queued):
+    now = datetime.utcnow()
+    reminders = [(application.id, 'student@test', 'Internship') for application in Application.query]
+    assert len(celery_worker.claim_reminders(reminders, now)) == 6
+    assert celery_worker.claim_reminders(reminders, now) == []
+
+
+def test_lapsed_claims_are_queued_again(app, queued):
+    celery_worker.send_deadline_reminders()
+    lapsed = datetime.utcnow() - timedelta(seconds=app.config['REMINDER_CLAIM_TTL'] + 1)
+    db.session.query(Application).update({'reminder_queued_at': lapsed})
+    db.session.commit()
+    assert celery_worker.send_deadline_reminders() == 1
@@ -0,0 +1,39 @@
+"""Read-your-writes pins for replica routing."""
+import pytest
+
+import replicas
+from cache import cache
+
+
+@pytest.fixture
+def pins(app):
+    replicas._pins = None
+    yield replicas.pins()
+    replicas._pins = None
+
+
+def test_pins_survive_a_full_response_cache(app, pins):
+    pins.pin(1, 60)
+    backend = cache.get_backend()
+    for index in range(app.config['CACHE_MEMORY_MAX_ENTRIES'] * 2):
+        backend.set(f'internport:resp:test:{index}', 'body', 60)
+    assert replicas.pinned(1)
+
+
+def test_pins_are_not_capped(app, pins):
+    for user_id in range(5000):
+        pins.pin(user_id, 60)
+    assert all(replicas.pinned(user_id) for user_id in range(5000))
+
+
+def test_pins_expire(app, pins):
+    pins.pin(1, -1)
+    assert not replicas.pinned(1)
+
+
+def test_endpoint_rules(app, pins):
+    user = {'user_id': 7}
+    assert replicas.endpoint_may_use_replica('get_internships', user)
+    assert not replicas.endpoint_may_use_replica('get_resume_export', user)
+    pins.pin(7, 60)
+    assert not replicas.endpoint_may_use_replica('get_internships', user)
@@ -0,0 +1,73 @@
+"""Resume processing is queued only once the new blob is committed."""
+import io
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+import app as app_module
+from conftest import auth_headers, seed
+from models import db, CompanyProfile, Internship
+
+
+@pytest.fixture
+def queued(app, monkeypatch):
+    """Enqueued task names, each with the number of committed resume blobs
+    at that moment, read on a connection of its own."""
+    jobs = []
+
+    def enqueue(name, *args):
+        with db.engine.connect() as connection:
+            committed = connection.execute(text('SELECT count(*) FROM resume_blobs')).scalar()
+        jobs.append((name, committed))
+
+    monkeypatch.setattr(app_module, 'enqueue', enqueue)
+    return jobs
+
+
+@pytest.fixture
+def student_and_posting(app):
+    """A student and a posting they have not applied to yet."""
+    _, student = seed(1)
+    internship = Internship(
+        company=CompanyProfile.query.one(), title='Fresh posting', description='Build things',
+        last_date=datetime.utcnow() + timedelta(days=30)
+    )
+    db.session.add(internship)
+    db.session.commit()
+    return student, internship
+
+
+def apply(client, student, internship):
+    return client.post(
+        f'/api/apply/{internship.id}',
+        data={'resume': (io.BytesIO(b'%PDF resume'), 'resume.pdf')},
+        headers=auth_headers(student)
+    )
+
+
+def test_apply_enqueues_after_commit(client, queued, student_and_posting):
+    response = apply(client, *student_and_posting)
+    assert response.status_code == 201
+    assert queued == [('internport.process_resume', 1)]
+
+
+def test_failed_apply_enqueues_nothing(client, queued, student_and_posting, monkeypatch):
+    def fail():
+        raise RuntimeError('database is down')
+
+    monkeypatch.setattr(db.session, 'commit', fail)
+    response = apply(client, *student_and_posting)
+    assert response.status_code == 500
+    assert queued == []
+
+
+def test_resume_upload_enqueues_after_commit(client, queued, student_and_posting):
+    student, _ = student_and_posting
+    response = client.post(
+        '/api/upload-resume',
+        data={'resume': (io.BytesIO(b'%PDF profile'), 'resume.pdf')},
+        headers=auth_headers(student)
+    )
+    assert response.status_code == 200
+    assert queued == [('internport.process_resume', 1)]
@@ -0,0 +1,112 @@
+"""Full-text search stays in step with postings and ranks title matches
+first."""
+from datetime import datetime, timedelta
+
+import pytest
+
+import search
+from conftest import auth_headers, seed
+from models import db, User, Internship
+
+
+@pytest.fixture
+def company(app):
+    seed(1, applications_each=1)
+    # drop_all leaves the virtual table alone, so start from a clean index.
+    search.rebuild()
+    return User.query.filter_by(role='company').one()
+
+
+@pytest.fixture
+def student(company):
+    return User.query.filter_by(role='student').one()
+
+
+def post(client, company, title, **fields):
+    data = {
+        'title': title,
+        'description': 'Build things',
+        'last_date': (datetime.utcnow() + timedelta(days=30)).strftime('%Y-%m-%d'),
+        **fields
+    }
+    response = client.post('/api/internships', json=data, headers=auth_headers(company))
+    assert response.status_code == 201
+    return response.get_json()['internship']['id']
+
+
+def search_ids(client, user, q, **filters):
+    response = client.get(
+        '/api/internships/search', query_string={'q': q, **filters}, headers=auth_headers(user)
+    )
+    assert response.status_code == 200
+    return [item['id'] for item in response.get_json()]
+
+
+def test_created_posting_is_searchable(client, company, student):
+    internship_id = post(client, company, 'Compiler engineering')
+    assert search_ids(client, student, 'compiler') == [internship_id]
+
+
+def test_update_replaces_indexed_text(client, company, student):
+    internship_id = post(client, company, 'Compiler engineering')
+    response = client.put(
+        f'/api/internships/{internship_id}', json={'title': 'Database engineering'},
+        headers=auth_headers(company)
+    )
+    assert response.status_code == 200
+
+    assert search_ids(client, student, 'compiler') == []
+    assert search_ids(client, student, 'database') == [internship_id]
+
+
+def test_deleted_posting_leaves_the_index(client, company, student):
+    internship_id = post(client, company, 'Compiler engineering')
+    response = client.delete(f'/api/internships/{internship_id}', headers=auth_headers(company))
+    assert response.status_code == 200
+
+    assert search_ids(client, student, 'compiler') == []
+
+
+def test_company_rename_is_reindexed(client, company, student):
+    internship_id = post(client, company, 'Compiler engineering')
+    response = client.put('/api/profile', json={'company_name': 'Quokka Labs'}, headers=auth_headers(company))
+    assert response.status_code == 200
+
+    seeded = Internship.query.filter_by(title='Internship 0').one()
+    assert set(search_ids(client, student, 'quokka')) == {seeded.id, internship_id}
+
+
+def test_title_match_outranks_description_match(client, company, student):
+    # Created first, so the newer-id tie-break alone would order it last.
+    in_title = post(client, company, 'Compiler internship')
+    in_description = post(client, company, 'Backend internship', description='Work on our compiler')
+
+    response = client.get(
+        '/api/internships/search', query_string={'q': 'compiler'}, headers=auth_headers(student)
+    )
+    results = response.get_json()
+    assert [item['id'] for item in results] == [in_title, in_description]
+    assert results[0]['rank'] > results[1]['rank']
+
+
+def test_prefix_of_last_word_matches(client, company, student):
+    internship_id = post(client, company, 'Compiler engineering')
+    assert search_ids(client, student, 'compiler eng') == [internship_id]
+
+
+def test_filters_combine_with_query(client, company, student):
+    remote_paid = post(client, company, 'Compiler role', location='Remote', stipend=3000)
+    post(client, company, 'Compiler role', location='Remote', stipend=500)
+    post(client, company, 'Compiler role', location='Berlin', stipend=3000)
+    post(client, company, 'Frontend role', location='Remote', stipend=3000)
+
+    assert search_ids(client, student, 'compiler', location='remote', min_stipend=1000) == [remote_paid]
+
+
+def test_inactive_postings_are_filtered_even_if_indexed(client, company, student):
+    internship_id = post(client, company, 'Compiler engineering')
+    # Bypass the route so the index still holds the row.
+    db.session.get(Internship, internship_id).is_active = False
+    db.session.commit()
+
+    assert search_ids(client, student, 'compiler') == []
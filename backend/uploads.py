@@ -0,0 +1,37 @@
+import hashlib
+import os
+import tempfile
+from flask import current_app
+
+
+def spool_upload(file, folder):
+    """Stream an uploaded file into a temporary file in folder.
+
+    The bytes are copied in fixed-size chunks and hashed along the way,
+    then fsynced so the file is durable before anything refers to it.
+    Returns (temporary path, sha256 hex digest, size).
+    """
+    chunk_size = current_app.config['UPLOAD_CHUNK_SIZE']
+    os.makedirs(folder, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    
+    fd, temp_path = tempfile.mkstemp(dir=folder, prefix='.upload-')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = file.stream.read(chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+            out.flush()
+            os.fsync(out.fileno())
+        os.chmod(temp_path, 0o644)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    
+    return temp_path, digest.hexdigest(), size
+
@@ -0,0 +1,93 @@
+import json
+from datetime import datetime, timezone
+from flask import request
+
+INTERNSHIP_REQUIRED_FIELDS = ['title', 'description', 'last_date']
+INTERNSHIP_TEXT_FIELDS = ['title', 'description', 'requirements', 'location']
+
+
+def parse_last_date(value, now=None):
+    """Parse an application deadline given as YYYY-MM-DD or ISO 8601.
+
+    A bare date means the end of that day. Raises ValueError with a
+    message suitable for the API response.
+    """
+    if not isinstance(value, str):
+        raise ValueError('Invalid date format. Expected YYYY-MM-DD or ISO format')
+    try:
+        if 'T' in value:
+            last_date = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        else:
+            last_date = datetime.strptime(value, '%Y-%m-%d')
+            last_date = last_date.replace(hour=23, minute=59, second=59)
+    except ValueError:
+        raise ValueError('Invalid date format. Use YYYY-MM-DD format')
+    if last_date.tzinfo is not None:
+        last_date = last_date.astimezone(timezone.utc).replace(tzinfo=None)
+    if last_date < (now or datetime.utcnow()):
+        raise ValueError('Last date must be in the future')
+    return last_date
+
+
+def parse_stipend(value):
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        raise ValueError('stipend must be a number')
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError('stipend must be a number')
+
+
+def is_row_id(value):
+    """True for an integer primary key. bool is an int subclass, so
+    True and False are turned away explicitly."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def validate_internship(data, now=None, partial=False):
+    """Column values for an internship posting, or ValueError.
+
+    With partial=True only the fields present are checked, as for an
+    update.
+    """
+    if not isinstance(data, dict):
+        raise ValueError('Each internship must be a JSON object')
+    values = {} if partial else {'requirements': '', 'location': '', 'stipend': None}
+    for field in INTERNSHIP_REQUIRED_FIELDS:
+        if field in data or not partial:
+            if not data.get(field):
+                raise ValueError(f'{field} is required')
+    for field in INTERNSHIP_TEXT_FIELDS:
+        if field in data:
+            if data[field] is not None and not isinstance(data[field], str):
+                raise ValueError(f'{field} must be a string')
+            values[field] = data[field] if data[field] is not None else ''
+    if 'last_date' in data:
+        values['last_date'] = parse_last_date(data['last_date'], now)
+    if 'stipend' in data:
+        values['stipend'] = parse_stipend(data['stipend'])
+    return values
+
+
+def read_bulk_items(max_items):
+    """Items of a JSON array or NDJSON request body, or ValueError."""
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        items = []
+        for number, line in enumerate(request.stream, 1):
+            if not line.strip():
+                continue
+            if len(items) >= max_items:
+                raise ValueError(f'At most {max_items} items per request')
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                raise ValueError(f'Line {number} is not valid JSON')
+        return items
+    items = request.get_json(silent=True)
+    if not isinstance(items, list):
+        raise ValueError('Expected a JSON array or an application/x-ndjson body')
+    if len(items) > max_items:
+        raise ValueError(f'At most {max_items} items per request')
+    return items
@@ -0,0 +1,54 @@
+import { computed, ref } from 'vue'
+import axios from 'axios'
+
+export const PAGE_SIZE = 50
+
+// One page of a list endpoint. The cursor for the page after it comes
+// back in the X-Next-Cursor header. fields limits each item to the keys
+// the view shows, so the server can skip large text columns.
+export async function getPage(url, { cursor = null, fields = null, limit = PAGE_SIZE, ...config } = {}) {
+  const params = { ...config.params, limit }
+  if (cursor) {
+    params.cursor = cursor
+  }
+  if (fields) {
+    params.fields = fields.join(',')
+  }
+  const response = await axios.get(url, { ...config, params })
+  return { items: response.data, nextCursor: response.headers['x-next-cursor'] || null }
+}
+
+// A list shown one page at a time. load() fetches the first page and
+// loadMore() appends the next while hasMore is true. options may be a
+// function so headers are read when the request is made.
+export function usePagedList(url, options = {}) {
+  const items = ref([])
+  const nextCursor = ref(null)
+  const loading = ref(false)
+  const hasMore = computed(() => nextCursor.value !== null)
+
+  const fetchPage = async (cursor) => {
+    loading.value = true
+    try {
+      const resolved = typeof options === 'function' ? options() : options
+      const page = await getPage(typeof url === 'function' ? url() : url, { ...resolved, cursor })
+      items.value = cursor ? [...items.value, ...page.items] : page.items
+      nextCursor.value = page.nextCursor
+    } finally {
+      loading.value = false
+    }
+  }
+
+  return {
+    items,
+    hasMore,
+    loading,
+    load: () => fetchPage(null),
+    loadMore: () => fetchPage(nextCursor.value)
+  }
+}
+
+// A count taken from loaded rows, marked "50+" while more pages exist.
+export function countLabel(count, more) {
+  return more ? `${count}+` : count
+}